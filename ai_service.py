@@ -6,6 +6,7 @@ Google Gemini API integration with codebase understanding capabilities
 import os
 import json
 import time
+import hashlib
 from pathlib import Path
 from typing import Dict, Any, List, Optional, Union
 from dataclasses import dataclass, asdict
@@ -30,6 +31,10 @@ except ImportError as e:
     print(f"Warning: Could not import workflow components: {e}")
 
 
+# Seconds a successful key validation is trusted before hitting the API again
+VALIDATION_CACHE_TTL = 6 * 60 * 60
+
+
 class AIProvider(Enum):
     """Supported AI providers."""
     GEMINI = "gemini"
@@ -85,10 +90,12 @@ class AIResponse:
 class OpenRouterService:
     """OpenRouter API service implementation."""
     
-    def __init__(self, config: AIConfig):
+    def __init__(self, config: AIConfig, session: Optional["aiohttp.ClientSession"] = None):
         self.config = config
         self.base_url = "https://openrouter.ai/api/v1"
-        self.session: Optional[aiohttp.ClientSession] = None
+        # A session passed in is shared (see AIServiceManager) and left open on exit
+        self.session: Optional[aiohttp.ClientSession] = session
+        self._owns_session = session is None
         self.context_manager = None
         self.chat_manager = None
         
@@ -104,14 +111,15 @@ class OpenRouterService:
         """Async context manager entry."""
         if not ASYNC_AVAILABLE:
             raise RuntimeError("aiohttp not available. Please install: pip install aiohttp")
-        self.session = aiohttp.ClientSession(
-            timeout=aiohttp.ClientTimeout(total=self.config.timeout)
-        )
+        if self.session is None:
+            self.session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=self.config.timeout)
+            )
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Async context manager exit."""
-        if self.session:
+        if self.session and self._owns_session:
             await self.session.close()
     
     def _get_model_endpoint(self) -> str:
@@ -163,7 +171,8 @@ class OpenRouterService:
                 async with self.session.post(
                     url, 
                     json=data, 
-                    headers=headers
+                    headers=headers,
+                    timeout=aiohttp.ClientTimeout(total=self.config.timeout)
                 ) as response:
                     if response.status == 200:
                         return await response.json()
@@ -265,10 +274,12 @@ class OpenRouterService:
 class GeminiService:
     """Google Gemini API service implementation."""
     
-    def __init__(self, config: AIConfig):
+    def __init__(self, config: AIConfig, session: Optional["aiohttp.ClientSession"] = None):
         self.config = config
         self.base_url = "https://generativelanguage.googleapis.com/v1/models"
-        self.session: Optional[aiohttp.ClientSession] = None
+        # A session passed in is shared (see AIServiceManager) and left open on exit
+        self.session: Optional[aiohttp.ClientSession] = session
+        self._owns_session = session is None
         self.context_manager = None
         self.chat_manager = None
         
@@ -284,14 +295,15 @@ class GeminiService:
         """Async context manager entry."""
         if not ASYNC_AVAILABLE:
             raise RuntimeError("aiohttp not available. Please install: pip install aiohttp")
-        self.session = aiohttp.ClientSession(
-            timeout=aiohttp.ClientTimeout(total=self.config.timeout)
-        )
+        if self.session is None:
+            self.session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=self.config.timeout)
+            )
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Async context manager exit."""
-        if self.session:
+        if self.session and self._owns_session:
             await self.session.close()
     
     def _get_model_endpoint(self, model: AIModelType) -> str:
@@ -364,7 +376,8 @@ class GeminiService:
                     url, 
                     json=data, 
                     headers=headers,
-                    params=params
+                    params=params,
+                    timeout=aiohttp.ClientTimeout(total=self.config.timeout)
                 ) as response:
                     if response.status == 200:
                         return await response.json()
@@ -470,8 +483,12 @@ class AIServiceManager:
     def __init__(self):
         self.project_root = Path(os.getcwd())
         self.config_file = self.project_root / ".terminal_data" / "ai_config.json"
+        self.validation_cache_file = self.config_file.parent / "ai_validation_cache.json"
         self.config: Optional[AIConfig] = None
         self.service: Optional[Union[GeminiService, OpenRouterService]] = None
+        # Keep-alive HTTP session shared by chat/validation on one event loop
+        self._http: Optional["aiohttp.ClientSession"] = None
+        self._http_loop = None
         
         # Ensure config directory exists
         self.config_file.parent.mkdir(parents=True, exist_ok=True)
@@ -479,6 +496,25 @@ class AIServiceManager:
         # Load configuration
         self.load_config()
     
+    async def _get_http_session(self) -> "aiohttp.ClientSession":
+        """Return the shared HTTP session, creating it for the running event loop."""
+        loop = asyncio.get_running_loop()
+        if self._http is None or self._http.closed or self._http_loop is not loop:
+            # Release the previous loop's session and its pooled connections before replacing it
+            await self.close()
+            self._http = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=100, ttl_dns_cache=300, keepalive_timeout=75)
+            )
+            self._http_loop = loop
+        return self._http
+    
+    async def close(self) -> None:
+        """Close the shared HTTP session, if one was opened."""
+        if self._http is not None and not self._http.closed:
+            await self._http.close()
+        self._http = None
+        self._http_loop = None
+    
     async def fetch_openrouter_models(self) -> Dict[str, List[Dict[str, Any]]]:
         """Fetch available models from OpenRouter API in real-time."""
         if not ASYNC_AVAILABLE:
@@ -607,14 +643,58 @@ class AIServiceManager:
         """Check if AI service is properly configured."""
         return self.config is not None and bool(self.config.api_key)
     
-    async def validate_api_key(self, api_key: str, model: str = "gemini-1.5-flash", provider: AIProvider = AIProvider.GEMINI) -> tuple[bool, str]:
-        """Validate API key by making a test request."""
+    def _load_validation_cache(self) -> Dict[str, Any]:
+        """Load cached key validations (keyed by key hash, never the key itself)."""
+        try:
+            with open(self.validation_cache_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+    
+    def _save_validation_cache(self, cache: Dict[str, Any]) -> None:
+        """Save cached key validations, dropping expired entries."""
+        now = time.time()
+        cache = {k: v for k, v in cache.items() if now - v.get('ts', 0) < VALIDATION_CACHE_TTL}
+        try:
+            tmp = self.validation_cache_file.with_suffix('.tmp')
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(cache, f, indent=2)
+            os.replace(tmp, self.validation_cache_file)
+        except OSError as e:
+            print(f"Warning: Could not save AI validation cache: {e}")
+    
+    async def validate_api_key(self, api_key: str, model: str = "gemini-1.5-flash", provider: AIProvider = AIProvider.GEMINI,
+                               shared_session: bool = True) -> tuple[bool, str]:
+        """Validate API key, reusing a recent successful result for the same key/model/provider.
+        
+        Pass shared_session=False when running on a throwaway event loop (e.g. a
+        worker thread) so the request uses its own short-lived session.
+        """
         if not ASYNC_AVAILABLE:
             return False, "aiohttp not available. Please install: pip install aiohttp"
         
         if not api_key.strip():
             return False, "API key cannot be empty"
         
+        cache_key = f"{provider.value}:{model}:{hashlib.sha256(api_key.encode('utf-8')).hexdigest()}"
+        cache = self._load_validation_cache()
+        entry = cache.get(cache_key)
+        if entry and time.time() - entry.get('ts', 0) < VALIDATION_CACHE_TTL:
+            return True, entry.get('message', "API key is valid")
+        
+        is_valid, message = await self._check_api_key(api_key, model, provider, shared_session)
+        if is_valid:
+            cache[cache_key] = {'valid': True, 'message': message, 'ts': time.time()}
+            self._save_validation_cache(cache)
+        elif entry is not None:
+            # Only successes are cached; a failed check retires the stale entry
+            del cache[cache_key]
+            self._save_validation_cache(cache)
+        return is_valid, message
+    
+    async def _check_api_key(self, api_key: str, model: str, provider: AIProvider,
+                             shared_session: bool) -> tuple[bool, str]:
+        """Validate API key by making a test request."""
         # Create temporary config for validation
         # For OpenRouter, we allow any model string
         if provider == AIProvider.OPENROUTER:
@@ -638,10 +718,11 @@ class AIServiceManager:
         
         try:
             # Create appropriate service instance based on provider
+            session = await self._get_http_session() if shared_session else None
             if provider == AIProvider.OPENROUTER:
-                service = OpenRouterService(temp_config)
+                service = OpenRouterService(temp_config, session=session)
             else:  # Default to Gemini
-                service = GeminiService(temp_config)
+                service = GeminiService(temp_config, session=session)
             
             async with service as service_instance:
                 messages = [{"role": "user", "content": "Hello"}]
@@ -701,10 +782,11 @@ class AIServiceManager:
         
         try:
             # Create appropriate service instance based on provider
+            session = await self._get_http_session()
             if self.config.provider == AIProvider.OPENROUTER:
-                service = OpenRouterService(self.config)
+                service = OpenRouterService(self.config, session=session)
             else:  # Default to Gemini
-                service = GeminiService(self.config)
+                service = GeminiService(self.config, session=session)
             
             async with service as service_instance:
                 # Build codebase-aware prompt if requested
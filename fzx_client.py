@@ -0,0 +1,56 @@
+"""
+FZX Daemon Client
+Forward one command to a `terminal_interface.py --daemon` running in this directory
+
+Usage: python fzx_client.py <command...>
+Kept to the standard library so scripted calls skip the full terminal startup.
+"""
+
+import os
+import sys
+import zlib
+from pathlib import Path
+
+
+def daemon_address() -> str:
+    """Unix socket (or Windows named pipe) of the daemon serving the current directory."""
+    root = os.getcwd()
+    if os.name == 'nt':
+        return rf"\\.\pipe\fzx-terminal-{zlib.crc32(root.encode('utf-8')):08x}"
+    return os.path.join(root, ".terminal_data", "daemon.sock")
+
+
+def daemon_key_file() -> Path:
+    """Owner-only file holding the secret clients must present to the daemon."""
+    return Path(os.getcwd()) / ".terminal_data" / "daemon.key"
+
+
+def join_argv(argv) -> str:
+    """Rebuild a command line from argv, re-quoting words so the daemon sees what was typed."""
+    if os.name == 'nt':
+        from subprocess import list2cmdline
+        return list2cmdline(argv)
+    import shlex
+    return shlex.join(argv)
+
+
+def send_command(command: str, timeout: float = 300.0) -> int:
+    """Send one command line to the daemon and print its output (waiting at most timeout seconds)."""
+    from multiprocessing.connection import Client
+    try:
+        with Client(daemon_address(), authkey=daemon_key_file().read_bytes()) as conn:
+            conn.send_bytes(command.encode('utf-8'))
+            if not conn.poll(timeout):
+                print(f"FZX daemon did not answer within {timeout:.0f}s", file=sys.stderr)
+                return 1
+            output = conn.recv_bytes()
+    except (OSError, EOFError) as e:
+        print(f"No FZX daemon reachable for this directory: {e}", file=sys.stderr)
+        return 1
+    sys.stdout.buffer.write(output)
+    sys.stdout.flush()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(send_command(join_argv(sys.argv[1:])))
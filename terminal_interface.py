@@ -4,25 +4,54 @@ Comprehensive interactive terminal with advanced features
 """
 
 import os
+import re
+import copy
 import sys
+import csv
+import io
 import json
+import heapq
+import mmap
+import stat
 import time
-import uuid
+import secrets
+import selectors
 import shutil
+import signal
 import subprocess
+import textwrap
 import threading
+import atexit
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, Any, List, Optional, Tuple
-from dataclasses import dataclass, asdict
+from functools import lru_cache
+from concurrent.futures import Future
+from collections import Counter, deque, defaultdict
+from operator import attrgetter, itemgetter
+from itertools import islice
+from dataclasses import dataclass, asdict, is_dataclass, fields, MISSING
 from enum import Enum
+import xml.etree.ElementTree as ET
+from contextlib import redirect_stdout, suppress
+
+import fzx_client
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
 
 try:
     from terminal_persistence import get_terminal_engine
     from session_bridge import SessionBridge
     from context_manager import ContextManager, get_context_manager
     from chat_manager import get_chat_manager
-    from ai_service import get_ai_manager
     # Import our new simple AI manager
     from simple_ai_manager import get_simple_ai_manager
     # Import building agents
@@ -34,12 +63,20 @@ except ImportError as e:
     print(f"Warning: Could not import workflow components: {e}")
     print("Some features may be limited.")
     ProjectInferenceEngine = None
-    get_ai_manager = None
     get_simple_ai_manager = None
     get_building_agent = None
     get_advanced_building_agent = None
     get_enhanced_ai_provider = None
 
+@lru_cache(maxsize=1)
+def _ai_service():
+    """Import ai_service on first use; None when it is unavailable."""
+    try:
+        import ai_service
+    except ImportError:
+        return None
+    return ai_service
+
 class Colors:
     RESET = '\033[0m'
     BOLD = '\033[1m'
@@ -126,12 +163,195 @@ class Colors:
             result += f'{Colors.rgb(r, g, b)}{char}'
         return result + Colors.RESET
 
+_ANSI_RE = re.compile(r'\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])')
+
+@lru_cache(maxsize=512)
 def get_display_length(text: str) -> int:
     """Calculate the actual display length of text without ANSI color codes."""
-    import re
-    ansi_escape = re.compile(r'\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])')
-    clean_text = ansi_escape.sub('', text)
-    return len(clean_text)
+    length = len(text)
+    if '\x1b' not in text:
+        return length
+    for match in _ANSI_RE.finditer(text):
+        length -= match.end() - match.start()
+    return length
+
+def _configure_stdout() -> None:
+    """Block-buffer stdout when it is redirected; keep line buffering on a terminal."""
+    try:
+        if not sys.stdout.isatty():
+            sys.stdout.reconfigure(line_buffering=False, write_through=False)
+            atexit.register(sys.stdout.flush)
+    except (AttributeError, ValueError):
+        pass
+    if os.name == 'nt':
+        # Let the Windows console interpret ANSI sequences (colors, _clear_screen)
+        try:
+            import ctypes
+            kernel32 = ctypes.windll.kernel32
+            handle = kernel32.GetStdHandle(-11)
+            mode = ctypes.c_uint32()
+            if kernel32.GetConsoleMode(handle, ctypes.byref(mode)):
+                kernel32.SetConsoleMode(handle, mode.value | 0x0004)
+        except Exception:
+            pass
+
+# Home, erase display, erase scrollback -- what `clear` itself emits
+_CLEAR_SCREEN = '\033[H\033[2J\033[3J'
+
+def _clear_screen() -> None:
+    """Clear the terminal without spawning a cls/clear process."""
+    sys.stdout.write(_CLEAR_SCREEN)
+    sys.stdout.flush()
+
+def _unlink_files(directory: Path, suffix: str = "", ignore_errors: bool = False) -> None:
+    """Delete the regular files directly inside directory (optionally only *suffix); a missing directory is a no-op."""
+    try:
+        with os.scandir(directory) as it:
+            for entry in it:
+                if entry.name.endswith(suffix) and entry.is_file(follow_symlinks=False):
+                    try:
+                        os.unlink(entry.path)
+                    except OSError:
+                        if not ignore_errors:
+                            raise
+    except FileNotFoundError:
+        pass
+
+def _format_model_line(model: Dict[str, Any]) -> str:
+    """Render one OpenRouter model as 'id (price) - description' for the setup picker."""
+    model_id = model.get('id', 'unknown')
+    description = model.get('description', model_id)
+    pricing = model.get('pricing', {})
+    try:
+        prompt_cost = float(pricing.get('prompt', 0)) if pricing.get('prompt') else 0
+        completion_cost = float(pricing.get('completion', 0)) if pricing.get('completion') else 0
+        if prompt_cost > 0 or completion_cost > 0:
+            price_info = f" (${pricing.get('prompt', '0')}/prompt, ${pricing.get('completion', '0')}/completion)"
+        else:
+            price_info = " (Free)"
+    except (ValueError, TypeError):
+        # If we can't parse the pricing, consider it free
+        price_info = " (Free)"
+    return f"{model_id}{price_info} - {description[:100]}{'...' if len(description) > 100 else ''}"
+
+def _new_event_loop():
+    """Create an event loop, backed by uvloop when it is installed.
+    
+    On Python 3.12+ tasks start eagerly, so coroutines that finish without
+    suspending (e.g. a cached key validation) skip a trip through the loop.
+    """
+    import asyncio
+    try:
+        import uvloop
+    except ImportError:
+        loop = asyncio.new_event_loop()
+    else:
+        loop = uvloop.new_event_loop()
+    if hasattr(asyncio, 'eager_task_factory'):
+        loop.set_task_factory(asyncio.eager_task_factory)
+    return loop
+
+def _run_in_background(func, *args) -> Future:
+    """Call func(*args) on a daemon thread; the Future carries its result or exception."""
+    future = Future()
+    def runner():
+        try:
+            future.set_result(func(*args))
+        except BaseException as e:
+            future.set_exception(e)
+    threading.Thread(target=runner, daemon=True).start()
+    return future
+
+class _ThreadStdout(io.TextIOBase):
+    """sys.stdout stand-in that captures one thread's output and passes other threads' through."""
+    
+    def __init__(self, capture, passthrough):
+        self._capture = capture
+        self._passthrough = passthrough
+        self._owner = threading.get_ident()
+    
+    def _target(self):
+        return self._capture if threading.get_ident() == self._owner else self._passthrough
+    
+    def write(self, text: str) -> int:
+        return self._target().write(text)
+    
+    def flush(self) -> None:
+        self._target().flush()
+
+class _PromptDeclined(EOFError):
+    """A daemon command asked for input; process_command lets it reach _run_captured."""
+
+class _NoStdin(io.TextIOBase):
+    """sys.stdin stand-in for daemon commands: any prompt is answered with EOF."""
+    
+    def readable(self) -> bool:
+        return True
+    
+    def readline(self, size: int = -1) -> str:
+        raise _PromptDeclined("interactive input is not available in daemon mode; run this command in the terminal")
+
+@lru_cache(maxsize=1)
+def _ts_filename(sec: int) -> str:
+    """Format a whole-second epoch timestamp for use in export/backup file names."""
+    return datetime.fromtimestamp(sec).strftime('%Y%m%d_%H%M%S')
+
+def _json_default(obj: Any) -> Any:
+    """Encode dataclasses and enums the way orjson does natively."""
+    if is_dataclass(obj) and not isinstance(obj, type):
+        return asdict(obj)
+    if isinstance(obj, Enum):
+        return obj.value
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+# Shared encoders; every JSON file written here is UTF-8
+_JSON_PRETTY = json.JSONEncoder(indent=2, ensure_ascii=False, default=_json_default)
+_JSON_COMPACT = json.JSONEncoder(separators=(',', ':'), ensure_ascii=False, default=_json_default)
+
+def _json_bytes(data: Any, pretty: bool = True) -> bytes:
+    """Serialise data (dataclasses included) to UTF-8 JSON, using orjson when installed."""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if pretty else 0)
+        return orjson.dumps(data, option=option)
+    return (_JSON_PRETTY if pretty else _JSON_COMPACT).encode(data).encode('utf-8')
+
+def _write_json_streamed(f, data: Dict[str, Any]) -> None:
+    """Write data as indented JSON to a binary file, encoding iterator values one item at a time."""
+    f.write(b"{")
+    for index, (key, value) in enumerate(data.items()):
+        f.write(b",\n  " if index else b"\n  ")
+        f.write(_json_bytes(key) + b": ")
+        if hasattr(value, '__next__'):
+            f.write(b"[")
+            count = 0
+            for item in value:
+                f.write(b",\n    " if count else b"\n    ")
+                f.write(_json_bytes(item).replace(b"\n", b"\n    "))
+                count += 1
+            f.write(b"\n  ]" if count else b"]")
+        else:
+            f.write(_json_bytes(value).replace(b"\n", b"\n  "))
+    f.write(b"\n}" if data else b"}")
+
+_MMAP_JSON_THRESHOLD = 1 << 20
+
+def _load_json_file(path: Path) -> Any:
+    """Load a JSON file, mapping it into memory when it is larger than 1MiB."""
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size <= _MMAP_JSON_THRESHOLD:
+            return orjson.loads(f.read()) if orjson is not None else json.load(f)
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if orjson is not None:
+                with memoryview(mm) as view:
+                    return orjson.loads(view)
+            return json.loads(mm[:])
+
+def _load_json_optional(path: Path) -> Any:
+    """Like _load_json_file, but None when the file does not exist."""
+    try:
+        return _load_json_file(path)
+    except FileNotFoundError:
+        return None
 
 class TaskStatus(Enum):
     PENDING = "pending"
@@ -178,10 +398,295 @@ class Project:
     created_at: str
     last_accessed: str
     settings: Dict[str, Any] = None
+    _rev = 0
     
     def __post_init__(self):
         if self.settings is None:
             self.settings = {}
+    
+    def __setattr__(self, name, value):
+        object.__setattr__(self, name, value)
+        if name != '_rev':
+            # Revision counter used to memoise asdict(); not a dataclass field
+            object.__setattr__(self, '_rev', self.__dict__.get('_rev', 0) + 1)
+
+_FIELD_SPECS: Dict[type, Tuple[Dict[str, Any], frozenset, frozenset]] = {}
+
+def _from_dict(cls, data: Dict[str, Any]):
+    """Rebuild a dataclass from its asdict() form without the kwargs __init__ path."""
+    spec = _FIELD_SPECS.get(cls)
+    if spec is None:
+        defaults = {f.name: f.default for f in fields(cls) if f.default is not MISSING}
+        names = frozenset(f.name for f in fields(cls))
+        spec = _FIELD_SPECS[cls] = (defaults, names, names - defaults.keys())
+    defaults, names, required = spec
+    keys = data.keys()
+    if not (keys >= required and keys <= names):
+        # Let __init__ raise its usual TypeError for missing/unknown fields
+        return cls(**data)
+    obj = cls.__new__(cls)
+    state = obj.__dict__
+    state.update(defaults)
+    state.update(data)
+    obj.__post_init__()
+    return obj
+
+def _clone_project(proj: Project) -> Project:
+    """Shallow-copy a project, giving the copy its own settings dict."""
+    clone = copy.copy(proj)
+    clone.settings = dict(proj.settings)
+    return clone
+
+def _clone_task(task: Task) -> Task:
+    """Shallow-copy a task, giving the copy its own tags list."""
+    clone = copy.copy(task)
+    clone.tags = list(task.tags)
+    return clone
+
+_TRUE = frozenset({'true', '1', 'yes', 'on'})
+_FALSE = frozenset({'false', '0', 'no', 'off'})
+
+def _parse_bool(value: str) -> Optional[bool]:
+    """Parse an on/off style config value; None when it is neither."""
+    lowered = value.lower()
+    if lowered in _TRUE:
+        return True
+    if lowered in _FALSE:
+        return False
+    return None
+
+# config key -> (attribute, label used in the enabled/disabled message)
+_BOOL_KEYS = {
+    'show_timestamps': ('show_timestamps', 'Timestamps'),
+    'auto_save': ('auto_save', 'Auto-save'),
+    'auto_perform_on_start': ('auto_perform_on_start', 'Auto-perform on start'),
+    'verbose': ('verbose', 'Verbose logging'),
+    'assume_yes': ('assume_yes', 'Assume-yes'),
+}
+
+_THEME_NAMES = ('dark', 'light', 'blue', 'green', 'matrix', 'ocean', 'default')
+_THEMES = frozenset(_THEME_NAMES)
+_THEMES_STR = ', '.join(_THEME_NAMES)
+_THEMES_USAGE = f"Usage: theme <{'|'.join(_THEME_NAMES)}>"
+# Background, foreground and cursor OSC color sequences per theme, pre-joined
+_THEME_OSC = {
+    name: f"\033]11;{bg}\007\033]10;{fg}\007\033]12;{cursor}\007"
+    for name, (bg, fg, cursor) in {
+        'dark': ('#1e1e1e', '#d4d4d4', '#ffffff'),
+        'light': ('#ffffff', '#000000', '#000000'),
+        'blue': ('#0f1419', '#bfbdb6', '#00d4ff'),
+        'green': ('#0d1117', '#c9d1d9', '#00ff00'),
+        'matrix': ('#000000', '#00ff00', '#00ff00'),
+        'ocean': ('#001122', '#88ccff', '#00aaff'),
+        'default': ('#000000', '#ffffff', '#ffffff'),
+    }.items()
+}
+_EXPORT_FORMATS = frozenset(('json', 'xml', 'txt', 'csv'))
+_MESSAGE_EXPORT_FORMATS = frozenset(('json', 'xml', 'txt'))
+
+class _STYLED:
+    """Pre-composed color wrappers for one-line status messages."""
+    OK = f"{Colors.GREEN}{{}}{Colors.RESET}"
+    FAIL = f"{Colors.RED}{{}}{Colors.RESET}"
+    WARN = f"{Colors.YELLOW}{{}}{Colors.RESET}"
+
+class _BOX:
+    """Pre-composed frame pieces for the boxed AI/response panels (77 columns inside)."""
+    TOP = f"{Colors.CYAN}╔{'═' * 77}╗{Colors.RESET}"
+    MID = f"{Colors.CYAN}╠{'═' * 77}╣{Colors.RESET}"
+    BOT = f"{Colors.CYAN}╚{'═' * 77}╝{Colors.RESET}"
+    TITLE = f"{Colors.CYAN}║{Colors.RESET} {Colors.BOLD}{Colors.GREEN}{{}}{Colors.RESET} {Colors.DIM}{{}}║{Colors.RESET}"
+    ROW = f"{Colors.CYAN}║{Colors.RESET} {{:<75}} {Colors.CYAN}║{Colors.RESET}"
+    META = f"{Colors.CYAN}║{Colors.RESET} {Colors.DIM}{{:<75}} {Colors.CYAN}║{Colors.RESET}"
+
+_BOX_WRAP = textwrap.TextWrapper(width=75, break_on_hyphens=False).wrap
+
+def _box_rows(out: List[str], content: str) -> None:
+    """Append content to out as boxed rows, word-wrapping lines longer than 75 columns."""
+    row = _BOX.ROW.format
+    for line in content.split('\n'):
+        if len(line) > 75:
+            out.extend(map(row, _BOX_WRAP(line)))
+        else:
+            out.append(row(line))
+
+class _RUN_LOG:
+    """Message templates for the run command's log entries."""
+    OK = "System command executed successfully: {} (exit: {})"
+    FAIL = "System command failed: {} (exit: {})"
+    OUTPUT = "Command output: {}..."
+    ERROR = "Command error: {}..."
+    TIMEOUT = "System command timeout: {}"
+    EXCEPTION = "System command exception: {} - {}"
+
+# Shell commands forwarded verbatim to 'run' (plus anything starting with 'cd')
+_SHELL_PASSTHROUGH = frozenset({'ls', 'dir', 'pwd'})
+
+# Leading words that mark remembered text as a command rather than chat
+_KNOWN_COMMAND_PREFIXES = (
+    'project', 'task', 'message', 'session', 'chat', 'run', 'status', 'config',
+    'backup', 'performance', 'theme', 'clear', 'back', 'ls', 'dir', 'pwd', 'cd', '@'
+)
+
+# Rough in-memory footprint per record, for the 'performance' data size estimate
+_APPROX_PROJECT_BYTES = 512
+_APPROX_TASK_BYTES = 384
+_APPROX_MESSAGE_BYTES = 256
+
+# Message types that are always persisted by log_message
+_PERSISTED_MESSAGE_TYPES = frozenset(("ai_message", "user_to_ai", "error"))
+
+# Lookup tables for task and message listings
+_STATUS_COLORS = {
+    "pending": Colors.YELLOW,
+    "in_progress": Colors.BLUE,
+    "completed": Colors.GREEN,
+    "blocked": Colors.RED
+}
+
+_MESSAGE_TYPE_ICONS = {
+    "user_to_ai": ">",
+    "ai_response": "<",
+    "info": "i",
+    "warning": "!",
+    "error": "X"
+}
+
+# Horizontal rules shared by the boxed panels
+_H100 = '═' * 100
+_H120 = '═' * 120
+
+# Pre-rendered frame pieces for the workspace-status panel
+_ROW_PREFIX = f"{Colors.PRIMARY_GRADIENT_MID}║{Colors.RESET}"
+_ROW_TOP = f"{Colors.PRIMARY_GRADIENT_MID}╔{_H100}╗{Colors.RESET}"
+_ROW_DIVIDER = f"{Colors.PRIMARY_GRADIENT_MID}╠{_H100}╣{Colors.RESET}"
+_ROW_BOTTOM = f"{Colors.PRIMARY_GRADIENT_MID}╚{_H100}╝{Colors.RESET}"
+_ROW_BLANK = f"{_ROW_PREFIX} {' '*98}"
+
+def _status_pair(label: str) -> Tuple[str, str]:
+    """Return the (off, on) indicator strings for a workspace feature."""
+    return (
+        f"{Colors.RED}○{Colors.RESET} {Colors.DIM}{label}{Colors.RESET}",
+        f"{Colors.GREEN}●{Colors.RESET} {Colors.ACCENT_GOLD}{label}{Colors.RESET}",
+    )
+
+# Indexed by the feature's presence flag: _GIT[has_git]
+_GIT = _status_pair("Git")
+_VENV = _status_pair("VEnv")
+_REQ = _status_pair("Requirements")
+
+# Static help content; built once at import instead of on every `help` call
+_HELP_SECTIONS = (
+    ("🚀 Project Management", (
+        ("project list", "List all projects", "📋"),
+        ("project create <name>", "Create new project", "➕"),
+        ("project switch <id/name>", "Switch to project", "🔄"),
+        ("project info", "Show current project info", "ℹ️"),
+        ("project delete <id/name>", "Delete project", "🗑️"),
+        ("project rename <id/name> <new_name>", "Rename project", "✏️"),
+        ("project settings", "Show project settings", "⚙️"),
+        ("project export [format]", "Export projects (json/xml/txt/csv)", "📤"),
+        ("project clear exports", "Clear all exported files", "🧹")
+    )),
+    ("🤖 AI Integration", (
+        ("ai config setup", "Interactive setup with latest models and real-time validation", "🔧"),
+        ("ai config show", "Show current AI configuration with masked key", "👁️"),
+        ("ai config test", "Test AI connection with current configuration", "🧪"),
+        ("ai config add-key", "Add or replace API key with validation", "🔑"),
+        ("ai config edit-key", "Edit current API key with validation", "✏️"),
+        ("ai config delete-key", "Remove API key and configuration completely", "🗑️"),
+        ("ai chat <message>", "Chat with AI using project context", "💬"),
+        ("ai status", "Show detailed AI service and integration status", "📊"),
+        ("ai help", "Show comprehensive AI commands help", "❓")
+    )),
+    ("🧠 Chat & Memory", (
+        ("chat add <user|assistant|system> <text>", "Append a chat message to durable log", "➕"),
+        ("chat prompt", "Build token-aware prompt from recent turns", "🧪"),
+        ("chat export", "Export universal memory JSONL for AI editors", "📤"),
+        ("chat snapshot", "Append daily long-term memory snapshot", "🧷"),
+        ("chat clear", "Clear durable chat transcript (.terminal_data/messages/chat.jsonl)", "🧹"),
+        ("remember <text>", "Save instruction; also export to exports/remember_last.txt", "📌"),
+        ("remember", "Perform all saved remembered entries sequentially", "⚡"),
+        ("remember list", "List saved remembered entries with indexes", "📜"),
+        ("remember remove <n>", "Remove a remembered entry by index", "🗑️"),
+        ("remember purge executed", "Remove all executed remembered entries", "🧹"),
+        ("remember clear", "Clear all remembered entries", "🧹"),
+        ("perform", "Auto-execute last remembered entry or push to chat", "🚀"),
+        ("perform <n>", "Execute the nth remembered entry directly", "🎯"),
+        ("perform range <a> <b>", "Execute a range of remembered entries", "📐"),
+        ("perform clear", "Clear only the last remembered entry", "🧹")
+    )),
+    ("✅ Task Management", (
+        ("task list", "List all tasks", "📝"),
+        ("task create <title>", "Create new task", "➕"),
+        ("task update <id> <status>", "Update task status", "🔄"),
+        ("task delete <id>", "Delete task", "❌"),
+        ("task priority <id> <1-5>", "Set task priority", "⭐"),
+        ("task clear", "Clear all tasks", "🧹")
+    )),
+    ("💬 Messaging System", (
+        ("message send <content>", "Send message to AI editor", "📨"),
+        ("message history", "Show message history", "📜"),
+        ("message export <format>", "Export messages (json/xml/txt)", "📤"),
+        ("message clear", "Clear message history", "🧹")
+    )),
+    ("🔄 Session Management", (
+        ("session save [--force]", "Save current session", "💾"),
+        ("session restore <id>", "Restore session", "🔄"),
+        ("session list", "List saved sessions", "📋"),
+        ("session export", "Export session data", "📤"),
+        ("session clear", "Clear all sessions", "🧹")
+    )),
+    ("💻 Terminal Operations", (
+        ("run <command>", "Execute shell command", "⚡"),
+        ("cd <path>", "Change directory", "📁"),
+        ("ls / dir", "List directory contents", "📂"),
+        ("pwd", "Show current directory", "📍"),
+        ("clear", "Clear screen", "🧹"),
+        ("clear all", "Clear ALL data - comprehensive system reset", "🗥️")
+    )),
+    ("📁 File Operations", (
+        ("@path/to/file", "Direct file access and preview", "📄"),
+        ("@./filename", "Access file in current directory", "📝"),
+        ("@/absolute/path", "Access file with absolute path", "🗂️"),
+        ("@directory/", "List directory contents", "📂")
+    )),
+    ("⚙️ Interface & Settings", (
+        ("theme <name>", "Change color theme", "🎨"),
+        ("config show", "Show all configuration", "👁️"),
+        ("config set <key> <value>", "Set configuration value", "🔧"),
+        ("config set auto_perform_on_start <on|off>", "Run remembered entries on startup", "🚀"),
+        ("config set verbose <on|off>", "Enable verbose logging", "🗒️"),
+        ("config set assume_yes <on|off>", "Skip confirmations for batch actions", "✅"),
+        ("config set max_batch_perform <n>", "Limit batch size for perform operations", "📦"),
+        ("config set auto_save <on/off>", "Toggle auto-save feature", "💾"),
+        ("config reset [project]", "Reset to defaults", "🔄"),
+        ("config export [format] [--pretty]", "Export config (json/xml/txt/csv)", "📤"),
+        ("config import <file>", "Import configuration", "📥"),
+        ("config backup [--pretty]", "Create config backup", "💾"),
+        ("config restore <file>", "Restore from backup", "🔄"),
+        ("status", "Show system status", "📊"),
+        ("performance", "Show performance metrics", "⚡"),
+        ("backup create/restore/list/clear", "Backup operations", "🔙"),
+        ("back [number]", "Go back to previous state", "⬅️"),
+        ("back restore <number>", "Restore specific state", "🔄"),
+        ("back clear", "Clear state history", "🧹"),
+        ("memory status", "Show memory counters and last entry preview", "🧮"),
+        ("memory clear", "Wipe remembered entries, snapshots and context store", "🧹")
+    )),
+)
+
+_HELP_TIPS = (
+    ("⌨️", "Use Tab for command completion"),
+    ("⛔", "Press Ctrl+C to interrupt running commands"),
+    ("📁", "Use @path/to/file for instant file operations"),
+    ("🎯", "Interface now uses horizontal layouts for better space efficiency"),
+    ("🔍", "Type 'help <command>' for detailed command info")
+)
+
+_HELP_SEP = {title: '─' * (91 - len(title)) for title, _ in _HELP_SECTIONS}
+_HELP_RULE = '─' * 100
+_HELP_TIPS_SEP = '─' * 76
 
 class RobustTerminalInterface:
     """Advanced terminal interface with comprehensive features."""
@@ -195,10 +700,14 @@ class RobustTerminalInterface:
         self.running = True
         self.current_project = None
         self.current_session_id = None
-        self.command_history = []
-        self.message_history = []
+        self.max_command_history = 100
+        self.command_history = deque(maxlen=self.max_command_history)
+        self.max_message_history = 1000
+        self.message_history = deque(maxlen=self.max_message_history)
         self.tasks = {}
         self.projects = {}
+        self._name_index = {}
+        self._proj_serialized = {}
         self.sessions = {}
         
         self.theme = "default"
@@ -211,8 +720,8 @@ class RobustTerminalInterface:
         self.assume_yes = False
         self.max_batch_perform = 20
         
-        self.state_history = []
         self.max_history_size = 10
+        self.state_history = deque(maxlen=self.max_history_size)
         
         # Remembered instructions persistence
         self.memory_dir = self.data_dir / "memory"
@@ -223,16 +732,99 @@ class RobustTerminalInterface:
         self.editor_events_file = self.exports_dir / "editor_events.jsonl"
         self._editor_signal_version = 0
         
-        # Minimal command registry (hook for future full refactor)
+        # Top-level command -> handler, built by _register_commands; process_command's only router
         self.command_registry = {}
         
-        # AI service integration
-        self.ai_manager = None
-        if get_ai_manager:
-            try:
-                self.ai_manager = get_ai_manager()
-            except Exception as e:
-                self.log_message(f"Warning: AI service initialization failed: {e}", "warning")
+        # Subcommand dispatch tables for project/task/message/config/session handlers
+        self._project_subcmds = {
+            'list': self._project_list,
+            'create': self._project_create,
+            'add': self._project_create,
+            'switch': self._project_switch,
+            'info': self._project_info,
+            'delete': self._project_delete,
+            'rename': self._project_rename,
+            'settings': self._project_settings,
+            'export': self._project_export,
+            'clear': self._project_clear,
+        }
+        self._task_subcmds = {
+            'list': self._task_list,
+            'create': self._task_create,
+            'add': self._task_create,
+            'update': self._task_update,
+            'clear': self._task_clear,
+        }
+        self._message_subcmds = {
+            'send': self._message_send,
+            'history': self._message_show_history,
+            'clear': self._message_clear,
+            'export': self._message_export,
+        }
+        self._config_subcmds = {
+            'show': self._config_show,
+            'set': self._config_set,
+            'reset': self._config_reset,
+            'export': self._config_export,
+            'import': self._config_import,
+            'backup': self._config_backup,
+            'restore': self._config_restore,
+        }
+        self._session_subcmds = {
+            'save': self._session_save,
+            'list': self._session_list,
+            'restore': self._session_restore,
+            'clear': self._session_clear,
+        }
+        # Commands handle_run_command serves in-process instead of via the shell
+        self._run_builtins = {
+            'cd': self._builtin_cd,
+            'ls': self._builtin_ls,
+            'dir': self._builtin_ls,
+            'pwd': self._builtin_pwd,
+            'clear': self._builtin_clear,
+        }
+        
+        # Rendered help screen, rebuilt after a theme change
+        self._help_cache = None
+        # Rendered REPL prompt box (before, after input), rebuilt after a theme change
+        self._prompt_banner = None
+        # Set while auto-perform runs so spawned commands cannot consume typed-ahead input
+        self._stdin_detached = False
+        # Event loop shared by AI/build coroutines (see _run_async)
+        self._async_loop = None
+        
+        # Workspace scan memo shared by header repaints
+        self._workspace_stats = None
+        self._workspace_scanned_at = 0.0
+        
+        # Saved session name -> st_mtime_ns, filled lazily by _get_session_index
+        self._session_index = None
+        # State signature of the last session write; unchanged state skips the save
+        self._session_saved_sig = None
+        
+        # Append-only descriptor for editor_events.jsonl, opened on first event
+        self._editor_events_fd = None
+        # Signals buffered during a batch perform; None when emitting directly
+        self._pending_signals = None
+        # Text last written to remember_last.txt; unchanged text skips the rewrite
+        self._remember_exported = None
+        # (mtime_ns, size, data) of remembered.json as last read or written
+        self._remembered_cache = None
+        
+        # Coalesced persistence (see _mark_dirty / flush_pending_saves)
+        # path -> (payload, mtime_ns, size) last written by _write_json_if_changed
+        self._persisted_payloads = {}
+        self._dirty_sections = set()
+        atexit.register(self.flush_pending_saves)
+        
+        # Prime psutil's CPU sampler so 'performance' can read it without blocking
+        if psutil is not None:
+            psutil.cpu_percent(interval=None)
+        
+        # AI service integration, created on first access (see ai_manager)
+        self._ai_manager = None
+        self._ai_manager_loaded = False
         
         # Simple AI manager integration (new)
         self.simple_ai_manager = None
@@ -258,8 +850,8 @@ class RobustTerminalInterface:
                 self.log_message(f"Warning: Advanced building agent initialization failed: {e}", "warning")
         
         # Initialize state history
-        self.state_history = []
         self.max_history_size = 10
+        self.state_history = deque(maxlen=self.max_history_size)
         
         # Remembered instructions persistence
         self.memory_dir = self.data_dir / "memory"
@@ -270,16 +862,12 @@ class RobustTerminalInterface:
         self.editor_events_file = self.exports_dir / "editor_events.jsonl"
         self._editor_signal_version = 0
         
-        # Minimal command registry (hook for future full refactor)
+        # Top-level command -> handler, built by _register_commands; process_command's only router
         self.command_registry = {}
         
-        # AI service integration
-        self.ai_manager = None
-        if get_ai_manager:
-            try:
-                self.ai_manager = get_ai_manager()
-            except Exception as e:
-                self.log_message(f"Warning: AI service initialization failed: {e}", "warning")
+        # AI service integration, created on first access (see ai_manager)
+        self._ai_manager = None
+        self._ai_manager_loaded = False
         
         # Simple AI manager integration (new)
         self.simple_ai_manager = None
@@ -304,8 +892,8 @@ class RobustTerminalInterface:
             except Exception as e:
                 self.log_message(f"Warning: Advanced building agent initialization failed: {e}", "warning")
         
-        self.state_history = []
         self.max_history_size = 10
+        self.state_history = deque(maxlen=self.max_history_size)
         
         # Remembered instructions persistence
         self.memory_dir = self.data_dir / "memory"
@@ -316,16 +904,12 @@ class RobustTerminalInterface:
         self.editor_events_file = self.exports_dir / "editor_events.jsonl"
         self._editor_signal_version = 0
         
-        # Minimal command registry (hook for future full refactor)
+        # Top-level command -> handler, built by _register_commands; process_command's only router
         self.command_registry = {}
         
-        # AI service integration
-        self.ai_manager = None
-        if get_ai_manager:
-            try:
-                self.ai_manager = get_ai_manager()
-            except Exception as e:
-                self.log_message(f"Warning: AI service initialization failed: {e}", "warning")
+        # AI service integration, created on first access (see ai_manager)
+        self._ai_manager = None
+        self._ai_manager_loaded = False
         
         # Simple AI manager integration (new)
         self.simple_ai_manager = None
@@ -350,12 +934,12 @@ class RobustTerminalInterface:
             except Exception as e:
                 self.log_message(f"Warning: Advanced building agent initialization failed: {e}", "warning")
         
-        self.state_history = []
         self.max_history_size = 10
+        self.state_history = deque(maxlen=self.max_history_size)
 
         
-        self.state_history = []
         self.max_history_size = 10
+        self.state_history = deque(maxlen=self.max_history_size)
         
         # Remembered instructions persistence
         self.memory_dir = self.data_dir / "memory"
@@ -366,16 +950,12 @@ class RobustTerminalInterface:
         self.editor_events_file = self.exports_dir / "editor_events.jsonl"
         self._editor_signal_version = 0
         
-        # Minimal command registry (hook for future full refactor)
+        # Top-level command -> handler, built by _register_commands; process_command's only router
         self.command_registry = {}
         
-        # AI service integration
-        self.ai_manager = None
-        if get_ai_manager:
-            try:
-                self.ai_manager = get_ai_manager()
-            except Exception as e:
-                self.log_message(f"Warning: AI service initialization failed: {e}", "warning")
+        # AI service integration, created on first access (see ai_manager)
+        self._ai_manager = None
+        self._ai_manager_loaded = False
         
         # Simple AI manager integration (new)
         self.simple_ai_manager = None
@@ -400,8 +980,8 @@ class RobustTerminalInterface:
             except Exception as e:
                 self.log_message(f"Warning: Advanced building agent initialization failed: {e}", "warning")
         
-        self.state_history = []
         self.max_history_size = 10
+        self.state_history = deque(maxlen=self.max_history_size)
         
         # Remembered instructions persistence
         self.memory_dir = self.data_dir / "memory"
@@ -412,16 +992,12 @@ class RobustTerminalInterface:
         self.editor_events_file = self.exports_dir / "editor_events.jsonl"
         self._editor_signal_version = 0
         
-        # Minimal command registry (hook for future full refactor)
+        # Top-level command -> handler, built by _register_commands; process_command's only router
         self.command_registry = {}
         
-        # AI service integration
-        self.ai_manager = None
-        if get_ai_manager:
-            try:
-                self.ai_manager = get_ai_manager()
-            except Exception as e:
-                self.log_message(f"Warning: AI service initialization failed: {e}", "warning")
+        # AI service integration, created on first access (see ai_manager)
+        self._ai_manager = None
+        self._ai_manager_loaded = False
         
         # Simple AI manager integration (new)
         self.simple_ai_manager = None
@@ -446,8 +1022,8 @@ class RobustTerminalInterface:
             except Exception as e:
                 self.log_message(f"Warning: Advanced building agent initialization failed: {e}", "warning")
         
-        self.state_history = []
         self.max_history_size = 10
+        self.state_history = deque(maxlen=self.max_history_size)
         
         # Remembered instructions persistence
         self.memory_dir = self.data_dir / "memory"
@@ -458,16 +1034,12 @@ class RobustTerminalInterface:
         self.editor_events_file = self.exports_dir / "editor_events.jsonl"
         self._editor_signal_version = 0
         
-        # Minimal command registry (hook for future full refactor)
+        # Top-level command -> handler, built by _register_commands; process_command's only router
         self.command_registry = {}
         
-        # AI service integration
-        self.ai_manager = None
-        if get_ai_manager:
-            try:
-                self.ai_manager = get_ai_manager()
-            except Exception as e:
-                self.log_message(f"Warning: AI service initialization failed: {e}", "warning")
+        # AI service integration, created on first access (see ai_manager)
+        self._ai_manager = None
+        self._ai_manager_loaded = False
         
         # Simple AI manager integration (new)
         self.simple_ai_manager = None
@@ -492,8 +1064,8 @@ class RobustTerminalInterface:
             except Exception as e:
                 self.log_message(f"Warning: Advanced building agent initialization failed: {e}", "warning")
         
-        self.state_history = []
         self.max_history_size = 10
+        self.state_history = deque(maxlen=self.max_history_size)
         
         # Remembered instructions persistence
         self.memory_dir = self.data_dir / "memory"
@@ -504,16 +1076,12 @@ class RobustTerminalInterface:
         self.editor_events_file = self.exports_dir / "editor_events.jsonl"
         self._editor_signal_version = 0
         
-        # Minimal command registry (hook for future full refactor)
+        # Top-level command -> handler, built by _register_commands; process_command's only router
         self.command_registry = {}
         
-        # AI service integration
-        self.ai_manager = None
-        if get_ai_manager:
-            try:
-                self.ai_manager = get_ai_manager()
-            except Exception as e:
-                self.log_message(f"Warning: AI service initialization failed: {e}", "warning")
+        # AI service integration, created on first access (see ai_manager)
+        self._ai_manager = None
+        self._ai_manager_loaded = False
         
         # Simple AI manager integration (new)
         self.simple_ai_manager = None
@@ -538,8 +1106,8 @@ class RobustTerminalInterface:
             except Exception as e:
                 self.log_message(f"Warning: Advanced building agent initialization failed: {e}", "warning")
         
-        self.state_history = []
         self.max_history_size = 10
+        self.state_history = deque(maxlen=self.max_history_size)
         
         # Remembered instructions persistence
         self.memory_dir = self.data_dir / "memory"
@@ -550,16 +1118,12 @@ class RobustTerminalInterface:
         self.editor_events_file = self.exports_dir / "editor_events.jsonl"
         self._editor_signal_version = 0
         
-        # Minimal command registry (hook for future full refactor)
+        # Top-level command -> handler, built by _register_commands; process_command's only router
         self.command_registry = {}
         
-        # AI service integration
-        self.ai_manager = None
-        if get_ai_manager:
-            try:
-                self.ai_manager = get_ai_manager()
-            except Exception as e:
-                self.log_message(f"Warning: AI service initialization failed: {e}", "warning")
+        # AI service integration, created on first access (see ai_manager)
+        self._ai_manager = None
+        self._ai_manager_loaded = False
         
         # Simple AI manager integration (new)
         self.simple_ai_manager = None
@@ -584,8 +1148,8 @@ class RobustTerminalInterface:
             except Exception as e:
                 self.log_message(f"Warning: Advanced building agent initialization failed: {e}", "warning")
         
-        self.state_history = []
         self.max_history_size = 10
+        self.state_history = deque(maxlen=self.max_history_size)
         
         # Remembered instructions persistence
         self.memory_dir = self.data_dir / "memory"
@@ -596,16 +1160,12 @@ class RobustTerminalInterface:
         self.editor_events_file = self.exports_dir / "editor_events.jsonl"
         self._editor_signal_version = 0
         
-        # Minimal command registry (hook for future full refactor)
+        # Top-level command -> handler, built by _register_commands; process_command's only router
         self.command_registry = {}
         
-        # AI service integration
-        self.ai_manager = None
-        if get_ai_manager:
-            try:
-                self.ai_manager = get_ai_manager()
-            except Exception as e:
-                self.log_message(f"Warning: AI service initialization failed: {e}", "warning")
+        # AI service integration, created on first access (see ai_manager)
+        self._ai_manager = None
+        self._ai_manager_loaded = False
         
         # Simple AI manager integration (new)
         self.simple_ai_manager = None
@@ -631,8 +1191,8 @@ class RobustTerminalInterface:
                 self.log_message(f"Warning: Advanced building agent initialization failed: {e}", "warning")
         
         # Initialize state history
-        self.state_history = []
         self.max_history_size = 10
+        self.state_history = deque(maxlen=self.max_history_size)
         
         # Remembered instructions persistence
         self.memory_dir = self.data_dir / "memory"
@@ -643,16 +1203,12 @@ class RobustTerminalInterface:
         self.editor_events_file = self.exports_dir / "editor_events.jsonl"
         self._editor_signal_version = 0
         
-        # Minimal command registry (hook for future full refactor)
+        # Top-level command -> handler, built by _register_commands; process_command's only router
         self.command_registry = {}
         
-        # AI service integration
-        self.ai_manager = None
-        if get_ai_manager:
-            try:
-                self.ai_manager = get_ai_manager()
-            except Exception as e:
-                self.log_message(f"Warning: AI service initialization failed: {e}", "warning")
+        # AI service integration, created on first access (see ai_manager)
+        self._ai_manager = None
+        self._ai_manager_loaded = False
         
         # Simple AI manager integration (new)
         self.simple_ai_manager = None
@@ -678,8 +1234,8 @@ class RobustTerminalInterface:
                 self.log_message(f"Warning: Advanced building agent initialization failed: {e}", "warning")
         
         # Initialize state history
-        self.state_history = []
         self.max_history_size = 10
+        self.state_history = deque(maxlen=self.max_history_size)
         
         # Remembered instructions persistence
         self.memory_dir = self.data_dir / "memory"
@@ -690,16 +1246,12 @@ class RobustTerminalInterface:
         self.editor_events_file = self.exports_dir / "editor_events.jsonl"
         self._editor_signal_version = 0
         
-        # Minimal command registry (hook for future full refactor)
+        # Top-level command -> handler, built by _register_commands; process_command's only router
         self.command_registry = {}
         
-        # AI service integration
-        self.ai_manager = None
-        if get_ai_manager:
-            try:
-                self.ai_manager = get_ai_manager()
-            except Exception as e:
-                self.log_message(f"Warning: AI service initialization failed: {e}", "warning")
+        # AI service integration, created on first access (see ai_manager)
+        self._ai_manager = None
+        self._ai_manager_loaded = False
         
         # Simple AI manager integration (new)
         self.simple_ai_manager = None
@@ -734,16 +1286,12 @@ class RobustTerminalInterface:
         self.editor_events_file = self.exports_dir / "editor_events.jsonl"
         self._editor_signal_version = 0
         
-        # Minimal command registry (hook for future full refactor)
+        # Top-level command -> handler, built by _register_commands; process_command's only router
         self.command_registry = {}
         
-        # AI service integration
-        self.ai_manager = None
-        if get_ai_manager:
-            try:
-                self.ai_manager = get_ai_manager()
-            except Exception as e:
-                self.log_message(f"Warning: AI service initialization failed: {e}", "warning")
+        # AI service integration, created on first access (see ai_manager)
+        self._ai_manager = None
+        self._ai_manager_loaded = False
         
         # Simple AI manager integration (new)
         self.simple_ai_manager = None
@@ -768,8 +1316,8 @@ class RobustTerminalInterface:
             except Exception as e:
                 self.log_message(f"Warning: Advanced building agent initialization failed: {e}", "warning")
         
-        self.state_history = []
         self.max_history_size = 10
+        self.state_history = deque(maxlen=self.max_history_size)
         
         # Remembered instructions persistence
         self.memory_dir = self.data_dir / "memory"
@@ -780,16 +1328,12 @@ class RobustTerminalInterface:
         self.editor_events_file = self.exports_dir / "editor_events.jsonl"
         self._editor_signal_version = 0
         
-        # Minimal command registry (hook for future full refactor)
+        # Top-level command -> handler, built by _register_commands; process_command's only router
         self.command_registry = {}
         
-        # AI service integration
-        self.ai_manager = None
-        if get_ai_manager:
-            try:
-                self.ai_manager = get_ai_manager()
-            except Exception as e:
-                self.log_message(f"Warning: AI service initialization failed: {e}", "warning")
+        # AI service integration, created on first access (see ai_manager)
+        self._ai_manager = None
+        self._ai_manager_loaded = False
         
         # Simple AI manager integration (new)
         self.simple_ai_manager = None
@@ -814,8 +1358,8 @@ class RobustTerminalInterface:
             except Exception as e:
                 self.log_message(f"Warning: Advanced building agent initialization failed: {e}", "warning")
         
-        self.state_history = []
         self.max_history_size = 10
+        self.state_history = deque(maxlen=self.max_history_size)
         
         # Remembered instructions persistence
         self.memory_dir = self.data_dir / "memory"
@@ -826,16 +1370,12 @@ class RobustTerminalInterface:
         self.editor_events_file = self.exports_dir / "editor_events.jsonl"
         self._editor_signal_version = 0
         
-        # Minimal command registry (hook for future full refactor)
+        # Top-level command -> handler, built by _register_commands; process_command's only router
         self.command_registry = {}
         
-        # AI service integration
-        self.ai_manager = None
-        if get_ai_manager:
-            try:
-                self.ai_manager = get_ai_manager()
-            except Exception as e:
-                self.log_message(f"Warning: AI service initialization failed: {e}", "warning")
+        # AI service integration, created on first access (see ai_manager)
+        self._ai_manager = None
+        self._ai_manager_loaded = False
         
         # Simple AI manager integration (new)
         self.simple_ai_manager = None
@@ -860,8 +1400,8 @@ class RobustTerminalInterface:
             except Exception as e:
                 self.log_message(f"Warning: Advanced building agent initialization failed: {e}", "warning")
         
-        self.state_history = []
         self.max_history_size = 10
+        self.state_history = deque(maxlen=self.max_history_size)
         
         # Remembered instructions persistence
         self.memory_dir = self.data_dir / "memory"
@@ -872,16 +1412,12 @@ class RobustTerminalInterface:
         self.editor_events_file = self.exports_dir / "editor_events.jsonl"
         self._editor_signal_version = 0
         
-        # Minimal command registry (hook for future full refactor)
+        # Top-level command -> handler, built by _register_commands; process_command's only router
         self.command_registry = {}
         
-        # AI service integration
-        self.ai_manager = None
-        if get_ai_manager:
-            try:
-                self.ai_manager = get_ai_manager()
-            except Exception as e:
-                self.log_message(f"Warning: AI service initialization failed: {e}", "warning")
+        # AI service integration, created on first access (see ai_manager)
+        self._ai_manager = None
+        self._ai_manager_loaded = False
         
         # Simple AI manager integration (new)
         self.simple_ai_manager = None
@@ -906,8 +1442,8 @@ class RobustTerminalInterface:
             except Exception as e:
                 self.log_message(f"Warning: Advanced building agent initialization failed: {e}", "warning")
         
-        self.state_history = []
         self.max_history_size = 10
+        self.state_history = deque(maxlen=self.max_history_size)
         
         # Remembered instructions persistence
         self.memory_dir = self.data_dir / "memory"
@@ -918,16 +1454,12 @@ class RobustTerminalInterface:
         self.editor_events_file = self.exports_dir / "editor_events.jsonl"
         self._editor_signal_version = 0
         
-        # Minimal command registry (hook for future full refactor)
+        # Top-level command -> handler, built by _register_commands; process_command's only router
         self.command_registry = {}
         
-        # AI service integration
-        self.ai_manager = None
-        if get_ai_manager:
-            try:
-                self.ai_manager = get_ai_manager()
-            except Exception as e:
-                self.log_message(f"Warning: AI service initialization failed: {e}", "warning")
+        # AI service integration, created on first access (see ai_manager)
+        self._ai_manager = None
+        self._ai_manager_loaded = False
         
         # Simple AI manager integration (new)
         self.simple_ai_manager = None
@@ -952,8 +1484,8 @@ class RobustTerminalInterface:
             except Exception as e:
                 self.log_message(f"Warning: Advanced building agent initialization failed: {e}", "warning")
         
-        self.state_history = []
         self.max_history_size = 10
+        self.state_history = deque(maxlen=self.max_history_size)
         
         # Remembered instructions persistence
         self.memory_dir = self.data_dir / "memory"
@@ -964,16 +1496,12 @@ class RobustTerminalInterface:
         self.editor_events_file = self.exports_dir / "editor_events.jsonl"
         self._editor_signal_version = 0
         
-        # Minimal command registry (hook for future full refactor)
+        # Top-level command -> handler, built by _register_commands; process_command's only router
         self.command_registry = {}
         
-        # AI service integration
-        self.ai_manager = None
-        if get_ai_manager:
-            try:
-                self.ai_manager = get_ai_manager()
-            except Exception as e:
-                self.log_message(f"Warning: AI service initialization failed: {e}", "warning")
+        # AI service integration, created on first access (see ai_manager)
+        self._ai_manager = None
+        self._ai_manager_loaded = False
         
         # Simple AI manager integration (new)
         self.simple_ai_manager = None
@@ -998,8 +1526,8 @@ class RobustTerminalInterface:
             except Exception as e:
                 self.log_message(f"Warning: Advanced building agent initialization failed: {e}", "warning")
         
-        self.state_history = []
         self.max_history_size = 10
+        self.state_history = deque(maxlen=self.max_history_size)
         
         # Remembered instructions persistence
         self.memory_dir = self.data_dir / "memory"
@@ -1010,16 +1538,12 @@ class RobustTerminalInterface:
         self.editor_events_file = self.exports_dir / "editor_events.jsonl"
         self._editor_signal_version = 0
         
-        # Minimal command registry (hook for future full refactor)
+        # Top-level command -> handler, built by _register_commands; process_command's only router
         self.command_registry = {}
         
-        # AI service integration
-        self.ai_manager = None
-        if get_ai_manager:
-            try:
-                self.ai_manager = get_ai_manager()
-            except Exception as e:
-                self.log_message(f"Warning: AI service initialization failed: {e}", "warning")
+        # AI service integration, created on first access (see ai_manager)
+        self._ai_manager = None
+        self._ai_manager_loaded = False
         
         # Simple AI manager integration (new)
         self.simple_ai_manager = None
@@ -1044,8 +1568,8 @@ class RobustTerminalInterface:
             except Exception as e:
                 self.log_message(f"Warning: Advanced building agent initialization failed: {e}", "warning")
         
-        self.state_history = []
         self.max_history_size = 10
+        self.state_history = deque(maxlen=self.max_history_size)
         
         # Remembered instructions persistence
         self.memory_dir = self.data_dir / "memory"
@@ -1056,16 +1580,12 @@ class RobustTerminalInterface:
         self.editor_events_file = self.exports_dir / "editor_events.jsonl"
         self._editor_signal_version = 0
         
-        # Minimal command registry (hook for future full refactor)
+        # Top-level command -> handler, built by _register_commands; process_command's only router
         self.command_registry = {}
         
-        # AI service integration
-        self.ai_manager = None
-        if get_ai_manager:
-            try:
-                self.ai_manager = get_ai_manager()
-            except Exception as e:
-                self.log_message(f"Warning: AI service initialization failed: {e}", "warning")
+        # AI service integration, created on first access (see ai_manager)
+        self._ai_manager = None
+        self._ai_manager_loaded = False
         
         # Simple AI manager integration (new)
         self.simple_ai_manager = None
@@ -1090,8 +1610,8 @@ class RobustTerminalInterface:
             except Exception as e:
                 self.log_message(f"Warning: Advanced building agent initialization failed: {e}", "warning")
         
-        self.state_history = []
         self.max_history_size = 10
+        self.state_history = deque(maxlen=self.max_history_size)
         
         # Remembered instructions persistence
         self.memory_dir = self.data_dir / "memory"
@@ -1102,16 +1622,12 @@ class RobustTerminalInterface:
         self.editor_events_file = self.exports_dir / "editor_events.jsonl"
         self._editor_signal_version = 0
         
-        # Minimal command registry (hook for future full refactor)
+        # Top-level command -> handler, built by _register_commands; process_command's only router
         self.command_registry = {}
         
-        # AI service integration
-        self.ai_manager = None
-        if get_ai_manager:
-            try:
-                self.ai_manager = get_ai_manager()
-            except Exception as e:
-                self.log_message(f"Warning: AI service initialization failed: {e}", "warning")
+        # AI service integration, created on first access (see ai_manager)
+        self._ai_manager = None
+        self._ai_manager_loaded = False
         
         # Simple AI manager integration (new)
         self.simple_ai_manager = None
@@ -1136,8 +1652,8 @@ class RobustTerminalInterface:
             except Exception as e:
                 self.log_message(f"Warning: Advanced building agent initialization failed: {e}", "warning")
         
-        self.state_history = []
         self.max_history_size = 10
+        self.state_history = deque(maxlen=self.max_history_size)
         
         # Remembered instructions persistence
         self.memory_dir = self.data_dir / "memory"
@@ -1148,16 +1664,12 @@ class RobustTerminalInterface:
         self.editor_events_file = self.exports_dir / "editor_events.jsonl"
         self._editor_signal_version = 0
         
-        # Minimal command registry (hook for future full refactor)
+        # Top-level command -> handler, built by _register_commands; process_command's only router
         self.command_registry = {}
         
-        # AI service integration
-        self.ai_manager = None
-        if get_ai_manager:
-            try:
-                self.ai_manager = get_ai_manager()
-            except Exception as e:
-                self.log_message(f"Warning: AI service initialization failed: {e}", "warning")
+        # AI service integration, created on first access (see ai_manager)
+        self._ai_manager = None
+        self._ai_manager_loaded = False
         
         # Simple AI manager integration (new)
         self.simple_ai_manager = None
@@ -1182,8 +1694,8 @@ class RobustTerminalInterface:
             except Exception as e:
                 self.log_message(f"Warning: Advanced building agent initialization failed: {e}", "warning")
         
-        self.state_history = []
         self.max_history_size = 10
+        self.state_history = deque(maxlen=self.max_history_size)
         
         # Remembered instructions persistence
         self.memory_dir = self.data_dir / "memory"
@@ -1194,16 +1706,12 @@ class RobustTerminalInterface:
         self.editor_events_file = self.exports_dir / "editor_events.jsonl"
         self._editor_signal_version = 0
         
-        # Minimal command registry (hook for future full refactor)
+        # Top-level command -> handler, built by _register_commands; process_command's only router
         self.command_registry = {}
         
-        # AI service integration
-        self.ai_manager = None
-        if get_ai_manager:
-            try:
-                self.ai_manager = get_ai_manager()
-            except Exception as e:
-                self.log_message(f"Warning: AI service initialization failed: {e}", "warning")
+        # AI service integration, created on first access (see ai_manager)
+        self._ai_manager = None
+        self._ai_manager_loaded = False
         
         # Simple AI manager integration (new)
         self.simple_ai_manager = None
@@ -1228,8 +1736,8 @@ class RobustTerminalInterface:
             except Exception as e:
                 self.log_message(f"Warning: Advanced building agent initialization failed: {e}", "warning")
         
-        self.state_history = []
         self.max_history_size = 10
+        self.state_history = deque(maxlen=self.max_history_size)
         
         # Remembered instructions persistence
         self.memory_dir = self.data_dir / "memory"
@@ -1240,16 +1748,12 @@ class RobustTerminalInterface:
         self.editor_events_file = self.exports_dir / "editor_events.jsonl"
         self._editor_signal_version = 0
         
-        # Minimal command registry (hook for future full refactor)
+        # Top-level command -> handler, built by _register_commands; process_command's only router
         self.command_registry = {}
         
-        # AI service integration
-        self.ai_manager = None
-        if get_ai_manager:
-            try:
-                self.ai_manager = get_ai_manager()
-            except Exception as e:
-                self.log_message(f"Warning: AI service initialization failed: {e}", "warning")
+        # AI service integration, created on first access (see ai_manager)
+        self._ai_manager = None
+        self._ai_manager_loaded = False
         
         # Simple AI manager integration (new)
         self.simple_ai_manager = None
@@ -1274,8 +1778,8 @@ class RobustTerminalInterface:
             except Exception as e:
                 self.log_message(f"Warning: Advanced building agent initialization failed: {e}", "warning")
         
-        self.state_history = []
         self.max_history_size = 10
+        self.state_history = deque(maxlen=self.max_history_size)
         
         # Remembered instructions persistence
         self.memory_dir = self.data_dir / "memory"
@@ -1286,16 +1790,12 @@ class RobustTerminalInterface:
         self.editor_events_file = self.exports_dir / "editor_events.jsonl"
         self._editor_signal_version = 0
         
-        # Minimal command registry (hook for future full refactor)
+        # Top-level command -> handler, built by _register_commands; process_command's only router
         self.command_registry = {}
         
-        # AI service integration
-        self.ai_manager = None
-        if get_ai_manager:
-            try:
-                self.ai_manager = get_ai_manager()
-            except Exception as e:
-                self.log_message(f"Warning: AI service initialization failed: {e}", "warning")
+        # AI service integration, created on first access (see ai_manager)
+        self._ai_manager = None
+        self._ai_manager_loaded = False
         
         # Simple AI manager integration (new)
         self.simple_ai_manager = None
@@ -1320,8 +1820,8 @@ class RobustTerminalInterface:
             except Exception as e:
                 self.log_message(f"Warning: Advanced building agent initialization failed: {e}", "warning")
         
-        self.state_history = []
         self.max_history_size = 10
+        self.state_history = deque(maxlen=self.max_history_size)
         
         # Remembered instructions persistence
         self.memory_dir = self.data_dir / "memory"
@@ -1332,16 +1832,12 @@ class RobustTerminalInterface:
         self.editor_events_file = self.exports_dir / "editor_events.jsonl"
         self._editor_signal_version = 0
         
-        # Minimal command registry (hook for future full refactor)
+        # Top-level command -> handler, built by _register_commands; process_command's only router
         self.command_registry = {}
         
-        # AI service integration
-        self.ai_manager = None
-        if get_ai_manager:
-            try:
-                self.ai_manager = get_ai_manager()
-            except Exception as e:
-                self.log_message(f"Warning: AI service initialization failed: {e}", "warning")
+        # AI service integration, created on first access (see ai_manager)
+        self._ai_manager = None
+        self._ai_manager_loaded = False
         
         # Simple AI manager integration (new)
         self.simple_ai_manager = None
@@ -1366,8 +1862,8 @@ class RobustTerminalInterface:
             except Exception as e:
                 self.log_message(f"Warning: Advanced building agent initialization failed: {e}", "warning")
         
-        self.state_history = []
         self.max_history_size = 10
+        self.state_history = deque(maxlen=self.max_history_size)
         
         # Remembered instructions persistence
         self.memory_dir = self.data_dir / "memory"
@@ -1378,16 +1874,12 @@ class RobustTerminalInterface:
         self.editor_events_file = self.exports_dir / "editor_events.jsonl"
         self._editor_signal_version = 0
         
-        # Minimal command registry (hook for future full refactor)
+        # Top-level command -> handler, built by _register_commands; process_command's only router
         self.command_registry = {}
         
-        # AI service integration
-        self.ai_manager = None
-        if get_ai_manager:
-            try:
-                self.ai_manager = get_ai_manager()
-            except Exception as e:
-                self.log_message(f"Warning: AI service initialization failed: {e}", "warning")
+        # AI service integration, created on first access (see ai_manager)
+        self._ai_manager = None
+        self._ai_manager_loaded = False
         
         # Simple AI manager integration (new)
         self.simple_ai_manager = None
@@ -1412,8 +1904,8 @@ class RobustTerminalInterface:
             except Exception as e:
                 self.log_message(f"Warning: Advanced building agent initialization failed: {e}", "warning")
         
-        self.state_history = []
         self.max_history_size = 10
+        self.state_history = deque(maxlen=self.max_history_size)
         
         # Remembered instructions persistence
         self.memory_dir = self.data_dir / "memory"
@@ -1424,16 +1916,12 @@ class RobustTerminalInterface:
         self.editor_events_file = self.exports_dir / "editor_events.jsonl"
         self._editor_signal_version = 0
         
-        # Minimal command registry (hook for future full refactor)
+        # Top-level command -> handler, built by _register_commands; process_command's only router
         self.command_registry = {}
         
-        # AI service integration
-        self.ai_manager = None
-        if get_ai_manager:
-            try:
-                self.ai_manager = get_ai_manager()
-            except Exception as e:
-                self.log_message(f"Warning: AI service initialization failed: {e}", "warning")
+        # AI service integration, created on first access (see ai_manager)
+        self._ai_manager = None
+        self._ai_manager_loaded = False
         
         # Simple AI manager integration (new)
         self.simple_ai_manager = None
@@ -1458,8 +1946,8 @@ class RobustTerminalInterface:
             except Exception as e:
                 self.log_message(f"Warning: Advanced building agent initialization failed: {e}", "warning")
         
-        self.state_history = []
         self.max_history_size = 10
+        self.state_history = deque(maxlen=self.max_history_size)
         
         # Remembered instructions persistence
         self.memory_dir = self.data_dir / "memory"
@@ -1470,16 +1958,12 @@ class RobustTerminalInterface:
         self.editor_events_file = self.exports_dir / "editor_events.jsonl"
         self._editor_signal_version = 0
         
-        # Minimal command registry (hook for future full refactor)
+        # Top-level command -> handler, built by _register_commands; process_command's only router
         self.command_registry = {}
         
-        # AI service integration
-        self.ai_manager = None
-        if get_ai_manager:
-            try:
-                self.ai_manager = get_ai_manager()
-            except Exception as e:
-                self.log_message(f"Warning: AI service initialization failed: {e}", "warning")
+        # AI service integration, created on first access (see ai_manager)
+        self._ai_manager = None
+        self._ai_manager_loaded = False
         
         # Simple AI manager integration (new)
         self.simple_ai_manager = None
@@ -1504,8 +1988,8 @@ class RobustTerminalInterface:
             except Exception as e:
                 self.log_message(f"Warning: Advanced building agent initialization failed: {e}", "warning")
         
-        self.state_history = []
         self.max_history_size = 10
+        self.state_history = deque(maxlen=self.max_history_size)
         
         # Remembered instructions persistence
         self.memory_dir = self.data_dir / "memory"
@@ -1516,16 +2000,12 @@ class RobustTerminalInterface:
         self.editor_events_file = self.exports_dir / "editor_events.jsonl"
         self._editor_signal_version = 0
         
-        # Minimal command registry (hook for future full refactor)
+        # Top-level command -> handler, built by _register_commands; process_command's only router
         self.command_registry = {}
         
-        # AI service integration
-        self.ai_manager = None
-        if get_ai_manager:
-            try:
-                self.ai_manager = get_ai_manager()
-            except Exception as e:
-                self.log_message(f"Warning: AI service initialization failed: {e}", "warning")
+        # AI service integration, created on first access (see ai_manager)
+        self._ai_manager = None
+        self._ai_manager_loaded = False
         
         # Simple AI manager integration (new)
         self.simple_ai_manager = None
@@ -1550,8 +2030,8 @@ class RobustTerminalInterface:
             except Exception as e:
                 self.log_message(f"Warning: Advanced building agent initialization failed: {e}", "warning")
         
-        self.state_history = []
         self.max_history_size = 10
+        self.state_history = deque(maxlen=self.max_history_size)
         
         # Remembered instructions persistence
         self.memory_dir = self.data_dir / "memory"
@@ -1562,16 +2042,12 @@ class RobustTerminalInterface:
         self.editor_events_file = self.exports_dir / "editor_events.jsonl"
         self._editor_signal_version = 0
         
-        # Minimal command registry (hook for future full refactor)
+        # Top-level command -> handler, built by _register_commands; process_command's only router
         self.command_registry = {}
         
-        # AI service integration
-        self.ai_manager = None
-        if get_ai_manager:
-            try:
-                self.ai_manager = get_ai_manager()
-            except Exception as e:
-                self.log_message(f"Warning: AI service initialization failed: {e}", "warning")
+        # AI service integration, created on first access (see ai_manager)
+        self._ai_manager = None
+        self._ai_manager_loaded = False
         
         # Simple AI manager integration (new)
         self.simple_ai_manager = None
@@ -1596,8 +2072,8 @@ class RobustTerminalInterface:
             except Exception as e:
                 self.log_message(f"Warning: Advanced building agent initialization failed: {e}", "warning")
         
-        self.state_history = []
         self.max_history_size = 10
+        self.state_history = deque(maxlen=self.max_history_size)
         
         # Remembered instructions persistence
         self.memory_dir = self.data_dir / "memory"
@@ -1608,16 +2084,12 @@ class RobustTerminalInterface:
         self.editor_events_file = self.exports_dir / "editor_events.jsonl"
         self._editor_signal_version = 0
         
-        # Minimal command registry (hook for future full refactor)
+        # Top-level command -> handler, built by _register_commands; process_command's only router
         self.command_registry = {}
         
-        # AI service integration
-        self.ai_manager = None
-        if get_ai_manager:
-            try:
-                self.ai_manager = get_ai_manager()
-            except Exception as e:
-                self.log_message(f"Warning: AI service initialization failed: {e}", "warning")
+        # AI service integration, created on first access (see ai_manager)
+        self._ai_manager = None
+        self._ai_manager_loaded = False
         
         # Simple AI manager integration (new)
         self.simple_ai_manager = None
@@ -1642,8 +2114,8 @@ class RobustTerminalInterface:
             except Exception as e:
                 self.log_message(f"Warning: Advanced building agent initialization failed: {e}", "warning")
         
-        self.state_history = []
         self.max_history_size = 10
+        self.state_history = deque(maxlen=self.max_history_size)
         
         # Remembered instructions persistence
         self.memory_dir = self.data_dir / "memory"
@@ -1654,16 +2126,12 @@ class RobustTerminalInterface:
         self.editor_events_file = self.exports_dir / "editor_events.jsonl"
         self._editor_signal_version = 0
         
-        # Minimal command registry (hook for future full refactor)
+        # Top-level command -> handler, built by _register_commands; process_command's only router
         self.command_registry = {}
         
-        # AI service integration
-        self.ai_manager = None
-        if get_ai_manager:
-            try:
-                self.ai_manager = get_ai_manager()
-            except Exception as e:
-                self.log_message(f"Warning: AI service initialization failed: {e}", "warning")
+        # AI service integration, created on first access (see ai_manager)
+        self._ai_manager = None
+        self._ai_manager_loaded = False
         
         # Simple AI manager integration (new)
         self.simple_ai_manager = None
@@ -1688,8 +2156,8 @@ class RobustTerminalInterface:
             except Exception as e:
                 self.log_message(f"Warning: Advanced building agent initialization failed: {e}", "warning")
         
-        self.state_history = []
         self.max_history_size = 10
+        self.state_history = deque(maxlen=self.max_history_size)
         
         # Remembered instructions persistence
         self.memory_dir = self.data_dir / "memory"
@@ -1700,16 +2168,12 @@ class RobustTerminalInterface:
         self.editor_events_file = self.exports_dir / "editor_events.jsonl"
         self._editor_signal_version = 0
         
-        # Minimal command registry (hook for future full refactor)
+        # Top-level command -> handler, built by _register_commands; process_command's only router
         self.command_registry = {}
         
-        # AI service integration
-        self.ai_manager = None
-        if get_ai_manager:
-            try:
-                self.ai_manager = get_ai_manager()
-            except Exception as e:
-                self.log_message(f"Warning: AI service initialization failed: {e}", "warning")
+        # AI service integration, created on first access (see ai_manager)
+        self._ai_manager = None
+        self._ai_manager_loaded = False
         
         # Simple AI manager integration (new)
         self.simple_ai_manager = None
@@ -1734,8 +2198,8 @@ class RobustTerminalInterface:
             except Exception as e:
                 self.log_message(f"Warning: Advanced building agent initialization failed: {e}", "warning")
         
-        self.state_history = []
         self.max_history_size = 10
+        self.state_history = deque(maxlen=self.max_history_size)
         
         # Remembered instructions persistence
         self.memory_dir = self.data_dir / "memory"
@@ -1746,16 +2210,12 @@ class RobustTerminalInterface:
         self.editor_events_file = self.exports_dir / "editor_events.jsonl"
         self._editor_signal_version = 0
         
-        # Minimal command registry (hook for future full refactor)
+        # Top-level command -> handler, built by _register_commands; process_command's only router
         self.command_registry = {}
         
-        # AI service integration
-        self.ai_manager = None
-        if get_ai_manager:
-            try:
-                self.ai_manager = get_ai_manager()
-            except Exception as e:
-                self.log_message(f"Warning: AI service initialization failed: {e}", "warning")
+        # AI service integration, created on first access (see ai_manager)
+        self._ai_manager = None
+        self._ai_manager_loaded = False
         
         # Simple AI manager integration (new)
         self.simple_ai_manager = None
@@ -1780,8 +2240,8 @@ class RobustTerminalInterface:
             except Exception as e:
                 self.log_message(f"Warning: Advanced building agent initialization failed: {e}", "warning")
         
-        self.state_history = []
         self.max_history_size = 10
+        self.state_history = deque(maxlen=self.max_history_size)
         
         # Remembered instructions persistence
         self.memory_dir = self.data_dir / "memory"
@@ -1792,16 +2252,12 @@ class RobustTerminalInterface:
         self.editor_events_file = self.exports_dir / "editor_events.jsonl"
         self._editor_signal_version = 0
         
-        # Minimal command registry (hook for future full refactor)
+        # Top-level command -> handler, built by _register_commands; process_command's only router
         self.command_registry = {}
         
-        # AI service integration
-        self.ai_manager = None
-        if get_ai_manager:
-            try:
-                self.ai_manager = get_ai_manager()
-            except Exception as e:
-                self.log_message(f"Warning: AI service initialization failed: {e}", "warning")
+        # AI service integration, created on first access (see ai_manager)
+        self._ai_manager = None
+        self._ai_manager_loaded = False
         
         # Simple AI manager integration (new)
         self.simple_ai_manager = None
@@ -1826,8 +2282,8 @@ class RobustTerminalInterface:
             except Exception as e:
                 self.log_message(f"Warning: Advanced building agent initialization failed: {e}", "warning")
         
-        self.state_history = []
         self.max_history_size = 10
+        self.state_history = deque(maxlen=self.max_history_size)
         
         # Remembered instructions persistence
         self.memory_dir = self.data_dir / "memory"
@@ -1838,16 +2294,12 @@ class RobustTerminalInterface:
         self.editor_events_file = self.exports_dir / "editor_events.jsonl"
         self._editor_signal_version = 0
         
-        # Minimal command registry (hook for future full refactor)
+        # Top-level command -> handler, built by _register_commands; process_command's only router
         self.command_registry = {}
         
-        # AI service integration
-        self.ai_manager = None
-        if get_ai_manager:
-            try:
-                self.ai_manager = get_ai_manager()
-            except Exception as e:
-                self.log_message(f"Warning: AI service initialization failed: {e}", "warning")
+        # AI service integration, created on first access (see ai_manager)
+        self._ai_manager = None
+        self._ai_manager_loaded = False
         
         # Simple AI manager integration (new)
         self.simple_ai_manager = None
@@ -1872,8 +2324,8 @@ class RobustTerminalInterface:
             except Exception as e:
                 self.log_message(f"Warning: Advanced building agent initialization failed: {e}", "warning")
         
-        self.state_history = []
         self.max_history_size = 10
+        self.state_history = deque(maxlen=self.max_history_size)
         
         # Remembered instructions persistence
         self.memory_dir = self.data_dir / "memory"
@@ -1884,16 +2336,12 @@ class RobustTerminalInterface:
         self.editor_events_file = self.exports_dir / "editor_events.jsonl"
         self._editor_signal_version = 0
         
-        # Minimal command registry (hook for future full refactor)
+        # Top-level command -> handler, built by _register_commands; process_command's only router
         self.command_registry = {}
         
-        # AI service integration
-        self.ai_manager = None
-        if get_ai_manager:
-            try:
-                self.ai_manager = get_ai_manager()
-            except Exception as e:
-                self.log_message(f"Warning: AI service initialization failed: {e}", "warning")
+        # AI service integration, created on first access (see ai_manager)
+        self._ai_manager = None
+        self._ai_manager_loaded = False
         
         # Simple AI manager integration (new)
         self.simple_ai_manager = None
@@ -1918,8 +2366,8 @@ class RobustTerminalInterface:
             except Exception as e:
                 self.log_message(f"Warning: Advanced building agent initialization failed: {e}", "warning")
         
-        self.state_history = []
         self.max_history_size = 10
+        self.state_history = deque(maxlen=self.max_history_size)
         
         # Remembered instructions persistence
         self.memory_dir = self.data_dir / "memory"
@@ -1930,16 +2378,12 @@ class RobustTerminalInterface:
         self.editor_events_file = self.exports_dir / "editor_events.jsonl"
         self._editor_signal_version = 0
         
-        # Minimal command registry (hook for future full refactor)
+        # Top-level command -> handler, built by _register_commands; process_command's only router
         self.command_registry = {}
         
-        # AI service integration
-        self.ai_manager = None
-        if get_ai_manager:
-            try:
-                self.ai_manager = get_ai_manager()
-            except Exception as e:
-                self.log_message(f"Warning: AI service initialization failed: {e}", "warning")
+        # AI service integration, created on first access (see ai_manager)
+        self._ai_manager = None
+        self._ai_manager_loaded = False
         
         # Simple AI manager integration (new)
         self.simple_ai_manager = None
@@ -1964,8 +2408,8 @@ class RobustTerminalInterface:
             except Exception as e:
                 self.log_message(f"Warning: Advanced building agent initialization failed: {e}", "warning")
         
-        self.state_history = []
         self.max_history_size = 10
+        self.state_history = deque(maxlen=self.max_history_size)
         
         # Remembered instructions persistence
         self.memory_dir = self.data_dir / "memory"
@@ -1976,16 +2420,12 @@ class RobustTerminalInterface:
         self.editor_events_file = self.exports_dir / "editor_events.jsonl"
         self._editor_signal_version = 0
         
-        # Minimal command registry (hook for future full refactor)
+        # Top-level command -> handler, built by _register_commands; process_command's only router
         self.command_registry = {}
         
-        # AI service integration
-        self.ai_manager = None
-        if get_ai_manager:
-            try:
-                self.ai_manager = get_ai_manager()
-            except Exception as e:
-                self.log_message(f"Warning: AI service initialization failed: {e}", "warning")
+        # AI service integration, created on first access (see ai_manager)
+        self._ai_manager = None
+        self._ai_manager_loaded = False
         
         # Simple AI manager integration (new)
         self.simple_ai_manager = None
@@ -2010,8 +2450,8 @@ class RobustTerminalInterface:
             except Exception as e:
                 self.log_message(f"Warning: Advanced building agent initialization failed: {e}", "warning")
         
-        self.state_history = []
         self.max_history_size = 10
+        self.state_history = deque(maxlen=self.max_history_size)
         
         # Remembered instructions persistence
         self.memory_dir = self.data_dir / "memory"
@@ -2022,16 +2462,12 @@ class RobustTerminalInterface:
         self.editor_events_file = self.exports_dir / "editor_events.jsonl"
         self._editor_signal_version = 0
         
-        # Minimal command registry (hook for future full refactor)
+        # Top-level command -> handler, built by _register_commands; process_command's only router
         self.command_registry = {}
         
-        # AI service integration
-        self.ai_manager = None
-        if get_ai_manager:
-            try:
-                self.ai_manager = get_ai_manager()
-            except Exception as e:
-                self.log_message(f"Warning: AI service initialization failed: {e}", "warning")
+        # AI service integration, created on first access (see ai_manager)
+        self._ai_manager = None
+        self._ai_manager_loaded = False
         
         # Simple AI manager integration (new)
         self.simple_ai_manager = None
@@ -2056,8 +2492,8 @@ class RobustTerminalInterface:
             except Exception as e:
                 self.log_message(f"Warning: Advanced building agent initialization failed: {e}", "warning")
         
-        self.state_history = []
         self.max_history_size = 10
+        self.state_history = deque(maxlen=self.max_history_size)
         
         # Remembered instructions persistence
         self.memory_dir = self.data_dir / "memory"
@@ -2068,16 +2504,12 @@ class RobustTerminalInterface:
         self.editor_events_file = self.exports_dir / "editor_events.jsonl"
         self._editor_signal_version = 0
         
-        # Minimal command registry (hook for future full refactor)
+        # Top-level command -> handler, built by _register_commands; process_command's only router
         self.command_registry = {}
         
-        # AI service integration
-        self.ai_manager = None
-        if get_ai_manager:
-            try:
-                self.ai_manager = get_ai_manager()
-            except Exception as e:
-                self.log_message(f"Warning: AI service initialization failed: {e}", "warning")
+        # AI service integration, created on first access (see ai_manager)
+        self._ai_manager = None
+        self._ai_manager_loaded = False
         
         # Simple AI manager integration (new)
         self.simple_ai_manager = None
@@ -2102,8 +2534,8 @@ class RobustTerminalInterface:
             except Exception as e:
                 self.log_message(f"Warning: Advanced building agent initialization failed: {e}", "warning")
         
-        self.state_history = []
         self.max_history_size = 10
+        self.state_history = deque(maxlen=self.max_history_size)
         
         # Remembered instructions persistence
         self.memory_dir = self.data_dir / "memory"
@@ -2114,16 +2546,12 @@ class RobustTerminalInterface:
         self.editor_events_file = self.exports_dir / "editor_events.jsonl"
         self._editor_signal_version = 0
         
-        # Minimal command registry (hook for future full refactor)
+        # Top-level command -> handler, built by _register_commands; process_command's only router
         self.command_registry = {}
         
-        # AI service integration
-        self.ai_manager = None
-        if get_ai_manager:
-            try:
-                self.ai_manager = get_ai_manager()
-            except Exception as e:
-                self.log_message(f"Warning: AI service initialization failed: {e}", "warning")
+        # AI service integration, created on first access (see ai_manager)
+        self._ai_manager = None
+        self._ai_manager_loaded = False
         
         # Simple AI manager integration (new)
         self.simple_ai_manager = None
@@ -2148,8 +2576,8 @@ class RobustTerminalInterface:
             except Exception as e:
                 self.log_message(f"Warning: Advanced building agent initialization failed: {e}", "warning")
         
-        self.state_history = []
         self.max_history_size = 10
+        self.state_history = deque(maxlen=self.max_history_size)
         
         # Remembered instructions persistence
         self.memory_dir = self.data_dir / "memory"
@@ -2160,16 +2588,12 @@ class RobustTerminalInterface:
         self.editor_events_file = self.exports_dir / "editor_events.jsonl"
         self._editor_signal_version = 0
         
-        # Minimal command registry (hook for future full refactor)
+        # Top-level command -> handler, built by _register_commands; process_command's only router
         self.command_registry = {}
         
-        # AI service integration
-        self.ai_manager = None
-        if get_ai_manager:
-            try:
-                self.ai_manager = get_ai_manager()
-            except Exception as e:
-                self.log_message(f"Warning: AI service initialization failed: {e}", "warning")
+        # AI service integration, created on first access (see ai_manager)
+        self._ai_manager = None
+        self._ai_manager_loaded = False
         
         # Simple AI manager integration (new)
         self.simple_ai_manager = None
@@ -2194,8 +2618,8 @@ class RobustTerminalInterface:
             except Exception as e:
                 self.log_message(f"Warning: Advanced building agent initialization failed: {e}", "warning")
         
-        self.state_history = []
         self.max_history_size = 10
+        self.state_history = deque(maxlen=self.max_history_size)
         
         # Remembered instructions persistence
         self.memory_dir = self.data_dir / "memory"
@@ -2206,16 +2630,12 @@ class RobustTerminalInterface:
         self.editor_events_file = self.exports_dir / "editor_events.jsonl"
         self._editor_signal_version = 0
         
-        # Minimal command registry (hook for future full refactor)
+        # Top-level command -> handler, built by _register_commands; process_command's only router
         self.command_registry = {}
         
-        # AI service integration
-        self.ai_manager = None
-        if get_ai_manager:
-            try:
-                self.ai_manager = get_ai_manager()
-            except Exception as e:
-                self.log_message(f"Warning: AI service initialization failed: {e}", "warning")
+        # AI service integration, created on first access (see ai_manager)
+        self._ai_manager = None
+        self._ai_manager_loaded = False
         
         # Simple AI manager integration (new)
         self.simple_ai_manager = None
@@ -2240,8 +2660,8 @@ class RobustTerminalInterface:
             except Exception as e:
                 self.log_message(f"Warning: Advanced building agent initialization failed: {e}", "warning")
         
-        self.state_history = []
         self.max_history_size = 10
+        self.state_history = deque(maxlen=self.max_history_size)
         
         # Remembered instructions persistence
         self.memory_dir = self.data_dir / "memory"
@@ -2252,16 +2672,12 @@ class RobustTerminalInterface:
         self.editor_events_file = self.exports_dir / "editor_events.jsonl"
         self._editor_signal_version = 0
         
-        # Minimal command registry (hook for future full refactor)
+        # Top-level command -> handler, built by _register_commands; process_command's only router
         self.command_registry = {}
         
-        # AI service integration
-        self.ai_manager = None
-        if get_ai_manager:
-            try:
-                self.ai_manager = get_ai_manager()
-            except Exception as e:
-                self.log_message(f"Warning: AI service initialization failed: {e}", "warning")
+        # AI service integration, created on first access (see ai_manager)
+        self._ai_manager = None
+        self._ai_manager_loaded = False
         
         # Simple AI manager integration (new)
         self.simple_ai_manager = None
@@ -2286,8 +2702,8 @@ class RobustTerminalInterface:
             except Exception as e:
                 self.log_message(f"Warning: Advanced building agent initialization failed: {e}", "warning")
         
-        self.state_history = []
         self.max_history_size = 10
+        self.state_history = deque(maxlen=self.max_history_size)
         
         # Remembered instructions persistence
         self.memory_dir = self.data_dir / "memory"
@@ -2298,16 +2714,12 @@ class RobustTerminalInterface:
         self.editor_events_file = self.exports_dir / "editor_events.jsonl"
         self._editor_signal_version = 0
         
-        # Minimal command registry (hook for future full refactor)
+        # Top-level command -> handler, built by _register_commands; process_command's only router
         self.command_registry = {}
         
-        # AI service integration
-        self.ai_manager = None
-        if get_ai_manager:
-            try:
-                self.ai_manager = get_ai_manager()
-            except Exception as e:
-                self.log_message(f"Warning: AI service initialization failed: {e}", "warning")
+        # AI service integration, created on first access (see ai_manager)
+        self._ai_manager = None
+        self._ai_manager_loaded = False
         
         # Simple AI manager integration (new)
         self.simple_ai_manager = None
@@ -2332,8 +2744,8 @@ class RobustTerminalInterface:
             except Exception as e:
                 self.log_message(f"Warning: Advanced building agent initialization failed: {e}", "warning")
         
-        self.state_history = []
         self.max_history_size = 10
+        self.state_history = deque(maxlen=self.max_history_size)
         
         # Remembered instructions persistence
         self.memory_dir = self.data_dir / "memory"
@@ -2344,16 +2756,12 @@ class RobustTerminalInterface:
         self.editor_events_file = self.exports_dir / "editor_events.jsonl"
         self._editor_signal_version = 0
         
-        # Minimal command registry (hook for future full refactor)
+        # Top-level command -> handler, built by _register_commands; process_command's only router
         self.command_registry = {}
         
-        # AI service integration
-        self.ai_manager = None
-        if get_ai_manager:
-            try:
-                self.ai_manager = get_ai_manager()
-            except Exception as e:
-                self.log_message(f"Warning: AI service initialization failed: {e}", "warning")
+        # AI service integration, created on first access (see ai_manager)
+        self._ai_manager = None
+        self._ai_manager_loaded = False
         
         # Simple AI manager integration (new)
         self.simple_ai_manager = None
@@ -2378,8 +2786,8 @@ class RobustTerminalInterface:
             except Exception as e:
                 self.log_message(f"Warning: Advanced building agent initialization failed: {e}", "warning")
         
-        self.state_history = []
         self.max_history_size = 10
+        self.state_history = deque(maxlen=self.max_history_size)
         
         # Remembered instructions persistence
         self.memory_dir = self.data_dir / "memory"
@@ -2390,16 +2798,12 @@ class RobustTerminalInterface:
         self.editor_events_file = self.exports_dir / "editor_events.jsonl"
         self._editor_signal_version = 0
         
-        # Minimal command registry (hook for future full refactor)
+        # Top-level command -> handler, built by _register_commands; process_command's only router
         self.command_registry = {}
         
-        # AI service integration
-        self.ai_manager = None
-        if get_ai_manager:
-            try:
-                self.ai_manager = get_ai_manager()
-            except Exception as e:
-                self.log_message(f"Warning: AI service initialization failed: {e}", "warning")
+        # AI service integration, created on first access (see ai_manager)
+        self._ai_manager = None
+        self._ai_manager_loaded = False
         
         # Simple AI manager integration (new)
         self.simple_ai_manager = None
@@ -2424,8 +2828,8 @@ class RobustTerminalInterface:
             except Exception as e:
                 self.log_message(f"Warning: Advanced building agent initialization failed: {e}", "warning")
         
-        self.state_history = []
         self.max_history_size = 10
+        self.state_history = deque(maxlen=self.max_history_size)
         
         # Remembered instructions persistence
         self.memory_dir = self.data_dir / "memory"
@@ -2436,16 +2840,12 @@ class RobustTerminalInterface:
         self.editor_events_file = self.exports_dir / "editor_events.jsonl"
         self._editor_signal_version = 0
         
-        # Minimal command registry (hook for future full refactor)
+        # Top-level command -> handler, built by _register_commands; process_command's only router
         self.command_registry = {}
         
-        # AI service integration
-        self.ai_manager = None
-        if get_ai_manager:
-            try:
-                self.ai_manager = get_ai_manager()
-            except Exception as e:
-                self.log_message(f"Warning: AI service initialization failed: {e}", "warning")
+        # AI service integration, created on first access (see ai_manager)
+        self._ai_manager = None
+        self._ai_manager_loaded = False
         
         # Simple AI manager integration (new)
         self.simple_ai_manager = None
@@ -2480,7 +2880,7 @@ class RobustTerminalInterface:
             (self.data_dir / "memory").mkdir(exist_ok=True)
             (self.data_dir / "exports").mkdir(exist_ok=True)
             
-            self.current_session_id = f"session_{uuid.uuid4().hex[:8]}_{int(time.time())}"
+            self.current_session_id = f"session_{secrets.token_hex(4)}_{int(time.time())}"
             
             try:
                 self.session_bridge = SessionBridge()
@@ -2496,26 +2896,21 @@ class RobustTerminalInterface:
     def load_persistent_data(self) -> None:
         """Load all persistent data from storage."""
         try:
-            projects_file = self.data_dir / "projects" / "projects.json"
-            if projects_file.exists():
-                with open(projects_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    self.projects = {pid: Project(**pdata) for pid, pdata in data.items()}
-            
-            tasks_file = self.data_dir / "tasks.json"
-            if tasks_file.exists():
-                with open(tasks_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    for tid, tdata in data.items():
-                        if 'status' in tdata and isinstance(tdata['status'], str):
-                            tdata['status'] = TaskStatus(tdata['status'])
-                        self.tasks[tid] = Task(**tdata)
-            
-            messages_file = self.data_dir / "messages" / "history.json"
-            if messages_file.exists():
-                with open(messages_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    self.message_history = [Message(**mdata) for mdata in data]
+            data = _load_json_optional(self.data_dir / "projects" / "projects.json")
+            if data is not None:
+                self.projects = {pid: _from_dict(Project, pdata) for pid, pdata in data.items()}
+                self._reindex_projects()
+            
+            data = _load_json_optional(self.data_dir / "tasks.json")
+            if data is not None:
+                for tid, tdata in data.items():
+                    if 'status' in tdata and isinstance(tdata['status'], str):
+                        tdata['status'] = TaskStatus(tdata['status'])
+                    self.tasks[tid] = _from_dict(Task, tdata)
+            
+            data = _load_json_optional(self.data_dir / "messages" / "history.json")
+            if data is not None:
+                self.message_history = deque((_from_dict(Message, mdata) for mdata in data), maxlen=self.max_message_history)
             
             self.detect_current_project()
             
@@ -2525,32 +2920,72 @@ class RobustTerminalInterface:
     def save_persistent_data(self) -> None:
         """Save all data to persistent storage."""
         try:
+            self._dirty_sections.clear()
+            
             projects_file = self.data_dir / "projects" / "projects.json"
-            with open(projects_file, 'w', encoding='utf-8') as f:
-                json.dump({pid: asdict(proj) for pid, proj in self.projects.items()}, f, indent=2)
+            self._write_json_if_changed(projects_file, self._project_dicts())
             
             tasks_file = self.data_dir / "tasks.json"
-            with open(tasks_file, 'w', encoding='utf-8') as f:
-                tasks_data = {}
-                for tid, task in self.tasks.items():
-                    task_dict = asdict(task)
-                    task_dict['status'] = task.status.value
-                    tasks_data[tid] = task_dict
-                json.dump(tasks_data, f, indent=2)
+            tasks_data = {}
+            for tid, task in self.tasks.items():
+                task_dict = asdict(task)
+                task_dict['status'] = task.status.value
+                tasks_data[tid] = task_dict
+            self._write_json_if_changed(tasks_file, tasks_data)
             
             messages_file = self.data_dir / "messages" / "history.json"
-            with open(messages_file, 'w', encoding='utf-8') as f:
-                json.dump([asdict(msg) for msg in self.message_history], f, indent=2)
+            self._write_json_if_changed(messages_file, list(self.message_history))
             
             self.save_session()
             
         except Exception as e:
             self.log_message(f"Data saving error: {e}", "error")
     
+    def _write_json_atomic(self, path: Path, data: Any, pretty: bool = True) -> None:
+        """Write JSON to a temp file beside path, then swap it into place."""
+        self._write_bytes_atomic(path, _json_bytes(data, pretty))
+    
+    def _write_json_if_changed(self, path: Path, data: Any) -> None:
+        """Like _write_json_atomic, but skip the write when path still holds this exact payload."""
+        payload = _json_bytes(data)
+        last = self._persisted_payloads.get(path)
+        if last is not None and last[0] == payload:
+            try:
+                st = os.stat(path)
+                if st.st_mtime_ns == last[1] and st.st_size == last[2]:
+                    return
+            except OSError:
+                pass
+        self._write_bytes_atomic(path, payload)
+        st = os.stat(path)
+        self._persisted_payloads[path] = (payload, st.st_mtime_ns, st.st_size)
+    
+    def _write_bytes_atomic(self, path: Path, payload: bytes) -> None:
+        """Write payload to a temp file beside path, then swap it into place."""
+        tmp_path = path.with_name(path.name + ".tmp")
+        try:
+            with open(tmp_path, 'wb', buffering=1 << 17) as f:
+                f.write(payload)
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                tmp_path.unlink()
+            except OSError:
+                pass
+            raise
+    
+    def _mark_dirty(self, section: str = "data") -> None:
+        """Queue a save_persistent_data() call; bursts within one command coalesce into one save."""
+        self._dirty_sections.add(section)
+    
+    def flush_pending_saves(self) -> None:
+        """Write out any changes queued by _mark_dirty (called on the main thread between commands)."""
+        if self._dirty_sections:
+            self.save_persistent_data()
+    
     def detect_current_project(self) -> None:
         """Detect or create current project based on working directory."""
         project_name = self.project_root.name
-        project_id = f"proj_{uuid.uuid4().hex[:8]}"
         
         for pid, proj in self.projects.items():
             if Path(proj.path) == self.project_root:
@@ -2558,22 +2993,56 @@ class RobustTerminalInterface:
                 proj.last_accessed = datetime.now().isoformat()
                 return
         
+        project_id = f"proj_{secrets.token_hex(4)}"
+        now_iso = datetime.now().isoformat()
         new_project = Project(
             id=project_id,
             name=project_name,
             description=f"Auto-detected project in {self.project_root}",
             path=str(self.project_root),
-            created_at=datetime.now().isoformat(),
-            last_accessed=datetime.now().isoformat()
+            created_at=now_iso,
+            last_accessed=now_iso
         )
         
         self.projects[project_id] = new_project
+        self._name_index.setdefault(project_name.lower(), project_id)
         self.current_project = project_id
     
+    def _reindex_projects(self) -> None:
+        """Rebuild the lowercase name -> project id lookup."""
+        index = {}
+        for pid, proj in self.projects.items():
+            index.setdefault(proj.name.lower(), pid)
+        self._name_index = index
+    
+    def _project_dicts(self) -> Dict[str, Dict[str, Any]]:
+        """Return asdict() of every project, reusing results for unchanged projects.
+        
+        The returned dicts are shared with the cache and must be treated as
+        read-only; callers that keep or mutate them should use asdict().
+        """
+        cache = self._proj_serialized
+        fresh = {}
+        result = {}
+        for pid, proj in self.projects.items():
+            entry = cache.get(pid)
+            if entry is None or entry[0] is not proj or entry[1] != proj._rev:
+                entry = (proj, proj._rev, asdict(proj))
+            fresh[pid] = entry
+            result[pid] = entry[2]
+        self._proj_serialized = fresh
+        return result
+    
+    def _find_project(self, target: str) -> Optional[str]:
+        """Resolve a project id or (case-insensitive) name to its id."""
+        if target in self.projects:
+            return target
+        return self._name_index.get(target.lower())
+    
     def log_message(self, content: str, msg_type: str = "info", save: bool = True, auto_persist: bool = False) -> None:
         """Log a message with timestamp and optional persistence."""
         message = Message(
-            id=f"msg_{uuid.uuid4().hex[:8]}",
+            id=f"msg_{secrets.token_hex(4)}",
             content=content,
             timestamp=datetime.now().isoformat(),
             message_type=msg_type,
@@ -2584,11 +3053,8 @@ class RobustTerminalInterface:
         if save:
             self.message_history.append(message)
             
-            if len(self.message_history) > 1000:
-                self.message_history = self.message_history[-800:]
-            
-            if auto_persist or msg_type in ["ai_message", "user_to_ai", "error"]:
-                self.save_persistent_data()
+            if auto_persist or msg_type in _PERSISTED_MESSAGE_TYPES:
+                self._mark_dirty('messages')
     
     def format_text(self, text: str, color: str = None, bold: bool = False, italic: bool = False) -> str:
         """Format text with colors and styles."""
@@ -2604,9 +3070,68 @@ class RobustTerminalInterface:
         
         return f"{formatted}{Colors.RESET}"
     
+    def _emit(self, lines: List[str]) -> None:
+        """Write a block of rendered lines to stdout in a single call."""
+        sys.stdout.write("\n".join(lines) + "\n")
+    
+    def _scan_workspace(self, ttl: float = 1.0) -> Dict[str, Any]:
+        """Collect current-directory stats, reusing the last scan within ttl seconds."""
+        now = time.monotonic()
+        if self._workspace_stats is not None and now - self._workspace_scanned_at < ttl:
+            return self._workspace_stats
+        
+        try:
+            py_files = json_files = total_files = directories = 0
+            names = set()
+            with os.scandir('.') as it:
+                for entry in it:
+                    name = entry.name
+                    names.add(name)
+                    if entry.is_file():
+                        total_files += 1
+                    elif entry.is_dir():
+                        directories += 1
+                    if name.startswith('.'):
+                        continue
+                    if name.endswith('.py'):
+                        py_files += 1
+                    elif name.endswith('.json'):
+                        json_files += 1
+            
+            has_git = '.git' in names
+            has_venv = 'venv' in names or '.venv' in names
+            has_requirements = 'requirements.txt' in names
+            
+            session_files = 0
+            if '.terminal_data' in names:
+                try:
+                    with os.scandir(os.path.join('.terminal_data', 'sessions')) as it:
+                        session_files = sum(1 for entry in it if entry.name.endswith('.json'))
+                except FileNotFoundError:
+                    pass
+                
+        except Exception:
+            py_files = json_files = total_files = directories = session_files = 0
+            has_git = has_venv = has_requirements = False
+        
+        self._workspace_stats = {
+            'py_files': py_files,
+            'json_files': json_files,
+            'total_files': total_files,
+            'directories': directories,
+            'session_files': session_files,
+            'has_git': has_git,
+            'has_venv': has_venv,
+            'has_requirements': has_requirements,
+        }
+        self._workspace_scanned_at = now
+        return self._workspace_stats
+    
     def display_header(self) -> None:
         """Display enhanced main interface with improved branding and visual hierarchy."""
-        os.system('cls' if os.name == 'nt' else 'clear')
+        _clear_screen()
+        stats = self._scan_workspace()
+        out = []
         
         gradient_top = Colors.PRIMARY_GRADIENT_TOP
         gradient_mid = Colors.PRIMARY_GRADIENT_MID
@@ -2621,36 +3146,35 @@ class RobustTerminalInterface:
         dim = Colors.DIM
         yellow = Colors.YELLOW
         green = Colors.SUCCESS_GREEN
+        reset = Colors.RESET
+        bold = Colors.BOLD
         
-        print(f"\n{gradient_top}╔{'═'*100}╗{Colors.RESET}")
-        print(f"{gradient_top}║{Colors.RESET}{' '*100}")
+        out.append(f"\n{gradient_top}╔{_H100}╗{reset}")
+        out.append(f"{gradient_top}║{reset}{' '*100}")
         
         brand_title = "🚀 FZX DEVELOPMENT TERMINAL"
         brand_subtitle = "Advanced AI-Powered Workspace Management"
         
         brand_title_display_len = get_display_length(brand_title)
         brand_title_padding = (98 - brand_title_display_len) // 2
-        brand_title_spacing = 98 - brand_title_display_len - brand_title_padding
         
-        print(f"{gradient_top}║{Colors.RESET}{' '*brand_title_padding}{Colors.BOLD}{accent_gold}{brand_title}{Colors.RESET}")
+        out.append(f"{gradient_top}║{reset}{' '*brand_title_padding}{bold}{accent_gold}{brand_title}{reset}")
         
         brand_subtitle_display_len = get_display_length(brand_subtitle)
         brand_subtitle_padding = (98 - brand_subtitle_display_len) // 2
-        brand_subtitle_spacing = 98 - brand_subtitle_display_len - brand_subtitle_padding
         
-        print(f"{gradient_top}║{Colors.RESET}{' '*brand_subtitle_padding}{Colors.DIM}{accent_silver}{brand_subtitle}{Colors.RESET}")
-        print(f"{gradient_top}║{Colors.RESET}{' '*100}")
-        print(f"{gradient_top}╚{'═'*100}╝{Colors.RESET}")
+        out.append(f"{gradient_top}║{reset}{' '*brand_subtitle_padding}{dim}{accent_silver}{brand_subtitle}{reset}")
+        out.append(f"{gradient_top}║{reset}{' '*100}")
+        out.append(f"{gradient_top}╚{_H100}╝{reset}")
         
-        print(f"\n{gradient_mid}╔{'═'*100}╗{Colors.RESET}")
+        out.append(f"\n{gradient_mid}╔{_H100}╗{reset}")
         
         nav_header = "📋 MAIN NAVIGATION MENU"
         nav_header_display_len = get_display_length(nav_header)
         nav_header_padding = (98 - nav_header_display_len) // 2
-        nav_header_spacing = 98 - nav_header_display_len - nav_header_padding
         
-        print(f"{gradient_mid}║{Colors.RESET}{' '*nav_header_padding}{Colors.BOLD}{accent_gold}{nav_header}{Colors.RESET}")
-        print(f"{gradient_mid}╠{'═'*100}╣{Colors.RESET}")
+        out.append(f"{gradient_mid}║{reset}{' '*nav_header_padding}{bold}{accent_gold}{nav_header}{reset}")
+        out.append(f"{gradient_mid}╠{_H100}╣{reset}")
         
         nav_categories = [
             ("🚀", "PROJECTS", "project list | create | switch | info", accent_gold),
@@ -2662,131 +3186,108 @@ class RobustTerminalInterface:
         ]
         
         for icon, category, commands, color in nav_categories:
-            category_content = f" {icon} {Colors.BOLD}{color}{category}{Colors.RESET}"
+            category_content = f" {icon} {bold}{color}{category}{reset}"
             category_display_len = get_display_length(category_content)
             category_spacing = max(2, 15 - category_display_len)
             
-            commands_content = f"{Colors.DIM}{commands}{Colors.RESET}"
+            commands_content = f"{dim}{commands}{reset}"
             
-            full_content = f"{category_content}{' '*category_spacing}{commands_content}"
-            full_display_len = get_display_length(full_content)
-            end_spacing = max(1, 98 - full_display_len)
-            
-            print(f"{gradient_mid}║{Colors.RESET}{category_content}{' '*category_spacing}{commands_content}")
+            out.append(f"{gradient_mid}║{reset}{category_content}{' '*category_spacing}{commands_content}")
         
-        print(f"{gradient_mid}║{Colors.RESET}{' '*98}")
+        out.append(f"{gradient_mid}║{reset}{' '*98}")
         
-        tip_content = f" {Colors.DIM}{accent_silver}💡 Quick Access:{Colors.RESET} {Colors.DIM}Type any command above or use 'help' for detailed documentation{Colors.RESET}"
-        tip_display_len = get_display_length(tip_content)
-        tip_spacing = max(1, 98 - tip_display_len)
-        print(f"{gradient_mid}║{Colors.RESET}{tip_content}")
-        print(f"{gradient_mid}╚{'═'*100}╝{Colors.RESET}")
+        tip_content = f" {dim}{accent_silver}💡 Quick Access:{reset} {dim}Type any command above or use 'help' for detailed documentation{reset}"
+        out.append(f"{gradient_mid}║{reset}{tip_content}")
+        out.append(f"{gradient_mid}╚{_H100}╝{reset}")
         
-        print(f"\n{gradient_bot}╔{'═'*100}╗{Colors.RESET}")
+        out.append(f"\n{gradient_bot}╔{_H100}╗{reset}")
         
         dashboard_header = "📊 WORKSPACE DASHBOARD"
         dashboard_header_display_len = get_display_length(dashboard_header)
         dashboard_header_padding = (98 - dashboard_header_display_len) // 2
-        dashboard_header_spacing = 98 - dashboard_header_display_len - dashboard_header_padding
         
-        print(f"{gradient_bot}║{Colors.RESET}{' '*dashboard_header_padding}{Colors.BOLD}{accent_gold}{dashboard_header}{Colors.RESET}")
-        print(f"{gradient_bot}╠{'═'*100}╣{Colors.RESET}")
+        out.append(f"{gradient_bot}║{reset}{' '*dashboard_header_padding}{bold}{accent_gold}{dashboard_header}{reset}")
+        out.append(f"{gradient_bot}╠{_H100}╣{reset}")
         
         current_dir = os.getcwd()
         dir_name = os.path.basename(current_dir)
         
-        try:
-            import glob
-            py_files = len(glob.glob("*.py"))
-            json_files = len(glob.glob("*.json"))
-            total_files = len([f for f in os.listdir('.') if os.path.isfile(f)])
-            directories = len([d for d in os.listdir('.') if os.path.isdir(d)])
-            
-            has_git = "✅" if os.path.exists('.git') else "❌"
-            has_venv = "✅" if (os.path.exists('venv') or os.path.exists('.venv')) else "❌"
-            has_requirements = "✅" if os.path.exists('requirements.txt') else "❌"
-            
-        except Exception:
-            py_files = json_files = total_files = directories = 0
-            has_git = has_venv = has_requirements = "❌"
+        py_files = stats['py_files']
+        json_files = stats['json_files']
+        total_files = stats['total_files']
+        directories = stats['directories']
+        session_files = stats['session_files']
+        has_git = stats['has_git']
+        has_venv = stats['has_venv']
+        has_requirements = stats['has_requirements']
         
         dashboard_metrics = [
             ("📁", "Current Directory", [f"{dir_name}"], accent_gold),
             ("📊", "Project Stats", [f"{py_files} Python files", f"{json_files} JSON files", f"{total_files} Total files"], neon_cyan),
-            ("🔧", "Development Tools", [f"Git Repository: {has_git}", f"Virtual Environment: {has_venv}", f"Requirements File: {has_requirements}"], gradient_mid),
+            ("🔧", "Development Tools", [f"Git Repository: {'✅' if has_git else '❌'}", f"Virtual Environment: {'✅' if has_venv else '❌'}", f"Requirements File: {'✅' if has_requirements else '❌'}"], gradient_mid),
             ("💾", "Active Sessions", [f"{len(self.sessions)} sessions", f"{len(self.tasks)} tasks", f"{len(self.projects)} projects"], accent_silver)
         ]
         
         for icon, metric_name, metric_values, color in dashboard_metrics:
-            metric_header = f" {icon} {Colors.BOLD}{color}{metric_name}:{Colors.RESET}"
-            metric_header_display_len = get_display_length(metric_header)
-            metric_header_spacing = max(1, 98 - metric_header_display_len)
-            print(f"{gradient_bot}║{Colors.RESET}{metric_header}")
+            metric_header = f" {icon} {bold}{color}{metric_name}:{reset}"
+            out.append(f"{gradient_bot}║{reset}{metric_header}")
             
             for value in metric_values:
-                value_content = f"    {Colors.DIM}{value}{Colors.RESET}"
-                value_display_len = get_display_length(value_content)
+                value_content = f"    {dim}{value}{reset}"
+                # Plain-text values change every repaint; measure them directly
+                # so they do not churn get_display_length's cache of fixed labels
+                value_display_len = 4 + len(value)
                 
                 if value_display_len > 96:
                     max_chars = 93
                     truncated_value = value[:max_chars] + "..."
-                    value_content = f"    {Colors.DIM}{truncated_value}{Colors.RESET}"
-                    value_display_len = get_display_length(value_content)
+                    value_content = f"    {dim}{truncated_value}{reset}"
                 
-                value_spacing = max(1, 98 - value_display_len)
-                print(f"{gradient_bot}║{Colors.RESET}{value_content}")
+                out.append(f"{gradient_bot}║{reset}{value_content}")
             
-            print(f"{gradient_bot}║{Colors.RESET} {' '*98}")
+            out.append(f"{gradient_bot}║{reset} {' '*98}")
         
-        print(f"{gradient_bot}║{Colors.RESET}{' '*98}")
+        out.append(f"{gradient_bot}║{reset}{' '*98}")
         
-        status_content = f" {Colors.DIM}{green}🟢 System Status:{Colors.RESET} {Colors.DIM}All systems operational | Auto-save: {'ON' if self.auto_save else 'OFF'}{Colors.RESET}"
-        status_display_len = get_display_length(status_content)
-        status_spacing = max(1, 98 - status_display_len)
-        print(f"{gradient_bot}║{Colors.RESET}{status_content}")
-        print(f"{gradient_bot}╚{'═'*100}╝{Colors.RESET}")
+        status_content = f" {dim}{green}🟢 System Status:{reset} {dim}All systems operational | Auto-save: {'ON' if self.auto_save else 'OFF'}{reset}"
+        out.append(f"{gradient_bot}║{reset}{status_content}")
+        out.append(f"{gradient_bot}╚{_H100}╝{reset}")
         
-        print(f"\n{gradient_bot}╔{'═'*100}╗{Colors.RESET}")
+        out.append(f"\n{gradient_bot}╔{_H100}╗{reset}")
         
-        header_content = f" {accent_gold}▓{Colors.RESET} {Colors.BOLD}📋 SYSTEM OVERVIEW{Colors.RESET}"
+        header_content = f" {accent_gold}▓{reset} {bold}📋 SYSTEM OVERVIEW{reset}"
         header_display_len = get_display_length(header_content)
         header_spacing = max(1, 98 - header_display_len - 2)
-        print(f"{gradient_bot}║{Colors.RESET}{header_content}{' '*header_spacing} {accent_gold}▓{Colors.RESET}")
+        out.append(f"{gradient_bot}║{reset}{header_content}{' '*header_spacing} {accent_gold}▓{reset}")
         
-        print(f"{gradient_bot}╠{'═'*100}╣{Colors.RESET}")
+        out.append(f"{gradient_bot}╠{_H100}╣{reset}")
         
-        desc_content = f" {Colors.DIM}{neon_cyan}▶{Colors.RESET} {Colors.DIM}Comprehensive workflow management with integrated capabilities{Colors.RESET}"
-        desc_display_len = get_display_length(desc_content)
-        desc_spacing = max(1, 98 - desc_display_len)
-        print(f"{gradient_bot}║{Colors.RESET}{desc_content}")
+        desc_content = f" {dim}{neon_cyan}▶{reset} {dim}Comprehensive workflow management with integrated capabilities{reset}"
+        out.append(f"{gradient_bot}║{reset}{desc_content}")
         
-        print(f"{gradient_bot}║{Colors.RESET} {' '*98}")
+        out.append(f"{gradient_bot}║{reset} {' '*98}")
         
-        features_line = f" 🎯 {accent_gold}Project{Colors.RESET} {Colors.DIM}• ✅ Task Tracking • 🤖 AI Assistant • 💾 Session Persistence{Colors.RESET}"
-        print(f"{gradient_bot}║{Colors.RESET}{features_line}")
+        features_line = f" 🎯 {accent_gold}Project{reset} {dim}• ✅ Task Tracking • 🤖 AI Assistant • 💾 Session Persistence{reset}"
+        out.append(f"{gradient_bot}║{reset}{features_line}")
         
-        print(f"{gradient_bot}║{Colors.RESET} {' '*98}")
-        adv_features_content = f" {Colors.DIM}{accent_silver}◆ Advanced Features:{Colors.RESET} Auto-save, Context awareness, Cross-platform"
-        adv_features_display_len = get_display_length(adv_features_content)
-        adv_features_spacing = max(1, 98 - adv_features_display_len)
-        print(f"{gradient_bot}║{Colors.RESET}{adv_features_content}")
-        print(f"{gradient_bot}╚{'═'*100}╝{Colors.RESET}")
+        out.append(f"{gradient_bot}║{reset} {' '*98}")
+        adv_features_content = f" {dim}{accent_silver}◆ Advanced Features:{reset} Auto-save, Context awareness, Cross-platform"
+        out.append(f"{gradient_bot}║{reset}{adv_features_content}")
+        out.append(f"{gradient_bot}╚{_H100}╝{reset}")
         
-        print(f"\n{gradient_top}╔{'═'*100}╗{Colors.RESET}")
+        out.append(f"\n{gradient_top}╔{_H100}╗{reset}")
         
-        qs_header_content = f" {accent_gold}▓{Colors.RESET} {Colors.BOLD}⚡ QUICK START COMMANDS{Colors.RESET}"
+        qs_header_content = f" {accent_gold}▓{reset} {bold}⚡ QUICK START COMMANDS{reset}"
         qs_header_display_len = get_display_length(qs_header_content)
         qs_header_spacing = max(1, 98 - qs_header_display_len - 2)
-        print(f"{gradient_top}║{Colors.RESET}{qs_header_content}{' '*qs_header_spacing} {accent_gold}▓{Colors.RESET}")
+        out.append(f"{gradient_top}║{reset}{qs_header_content}{' '*qs_header_spacing} {accent_gold}▓{reset}")
         
-        print(f"{gradient_top}╠{'═'*100}╣{Colors.RESET}")
+        out.append(f"{gradient_top}╠{_H100}╣{reset}")
         
-        qs_desc_content = f" {Colors.DIM}{neon_cyan}▶{Colors.RESET} {Colors.DIM}Essential commands for your development workflow{Colors.RESET}"
-        qs_desc_display_len = get_display_length(qs_desc_content)
-        qs_desc_spacing = max(1, 98 - qs_desc_display_len)
-        print(f"{gradient_top}║{Colors.RESET}{qs_desc_content}")
+        qs_desc_content = f" {dim}{neon_cyan}▶{reset} {dim}Essential commands for your development workflow{reset}"
+        out.append(f"{gradient_top}║{reset}{qs_desc_content}")
         
-        print(f"{gradient_top}║{Colors.RESET} {' '*98}")
+        out.append(f"{gradient_top}║{reset} {' '*98}")
         
         quick_commands = [
             ("🚀", "project create <name>", "Initialize a new project workspace with intelligent setup"),
@@ -2798,255 +3299,116 @@ class RobustTerminalInterface:
         ]
         
         for icon, cmd, desc in quick_commands:
-            base_content = f" {icon} {accent_gold}{cmd}{Colors.RESET}"
+            base_content = f" {icon} {accent_gold}{cmd}{reset}"
             base_display_len = get_display_length(base_content)
             spacing = max(2, 28 - base_display_len)
             
-            desc_formatted = f"{Colors.DIM}{desc}{Colors.RESET}"
+            desc_formatted = f"{dim}{desc}{reset}"
             
-            full_content = f"{base_content}{' '*spacing}{desc_formatted}"
-            full_display_len = get_display_length(full_content)
-            end_spacing = max(1, 98 - full_display_len)
-            
-            print(f"{gradient_top}║{Colors.RESET}{base_content}{' '*spacing}{desc_formatted}")
-        
-        print(f"{gradient_top}║{Colors.RESET} {' '*98}")
-        pro_tip_content = f" {Colors.DIM}{accent_silver}💡 Pro Tip:{Colors.RESET} {Colors.DIM}Use tab completion for faster navigation{Colors.RESET}"
-        pro_tip_display_len = get_display_length(pro_tip_content)
-        pro_tip_spacing = max(1, 98 - pro_tip_display_len)
-        print(f"{gradient_top}║{Colors.RESET}{pro_tip_content}")
-        print(f"{gradient_top}╚{'═'*100}╝{Colors.RESET}")
-        
-        current_dir = os.getcwd()
-        dir_name = os.path.basename(current_dir)
+            out.append(f"{gradient_top}║{reset}{base_content}{' '*spacing}{desc_formatted}")
         
-        try:
-            import glob
-            py_files = len(glob.glob("*.py"))
-            json_files = len(glob.glob("*.json"))
-            total_files = len([f for f in os.listdir('.') if os.path.isfile(f)])
-            directories = len([d for d in os.listdir('.') if os.path.isdir(d)])
-            
-            has_git = os.path.exists('.git')
-            has_venv = os.path.exists('venv') or os.path.exists('.venv')
-            has_requirements = os.path.exists('requirements.txt')
-            
-            session_files = 0
-            if os.path.exists('.terminal_data/sessions'):
-                session_files = len([f for f in os.listdir('.terminal_data/sessions') if f.endswith('.json')])
-                
-        except Exception:
-            py_files = json_files = total_files = directories = session_files = 0
-            has_git = has_venv = has_requirements = False
+        out.append(f"{gradient_top}║{reset} {' '*98}")
+        pro_tip_content = f" {dim}{accent_silver}💡 Pro Tip:{reset} {dim}Use tab completion for faster navigation{reset}"
+        out.append(f"{gradient_top}║{reset}{pro_tip_content}")
+        out.append(f"{gradient_top}╚{_H100}╝{reset}")
         
-        print(f"\n{gradient_mid}╔{'═'*100}╗{Colors.RESET}")
+        out.append("\n" + _ROW_TOP)
         
-        ws_header_content = f" {accent_gold}▓{Colors.RESET} {Colors.BOLD}📊 WORKSPACE STATUS{Colors.RESET}"
+        ws_header_content = f" {accent_gold}▓{reset} {bold}📊 WORKSPACE STATUS{reset}"
         ws_header_display_len = get_display_length(ws_header_content)
         ws_header_spacing = max(1, 98 - ws_header_display_len - 2)
-        print(f"{gradient_mid}║{Colors.RESET}{ws_header_content}{' '*ws_header_spacing} {accent_gold}▓{Colors.RESET}")
+        out.append(f"{_ROW_PREFIX}{ws_header_content}{' '*ws_header_spacing} {accent_gold}▓{reset}")
         
-        print(f"{gradient_mid}╠{'═'*100}╣{Colors.RESET}")
+        out.append(_ROW_DIVIDER)
         
-        ws_desc_content = f" {Colors.DIM}{neon_cyan}▶{Colors.RESET} {Colors.DIM}Current workspace analysis and configuration overview{Colors.RESET}"
-        ws_desc_display_len = get_display_length(ws_desc_content)
-        ws_desc_spacing = max(1, 98 - ws_desc_display_len)
-        print(f"{gradient_mid}║{Colors.RESET}{ws_desc_content}")
+        ws_desc_content = f" {dim}{neon_cyan}▶{reset} {dim}Current workspace analysis and configuration overview{reset}"
+        out.append(_ROW_PREFIX + ws_desc_content)
         
-        print(f"{gradient_mid}║{Colors.RESET} {' '*98}")
+        out.append(_ROW_BLANK)
         
-        dir_info_content = f" {accent_silver}📁 Directory Info:{Colors.RESET}"
-        dir_info_display_len = get_display_length(dir_info_content)
-        dir_info_spacing = max(1, 98 - dir_info_display_len)
-        print(f"{gradient_mid}║{Colors.RESET}{dir_info_content}")
+        dir_info_content = f" {accent_silver}📁 Directory Info:{reset}"
+        out.append(_ROW_PREFIX + dir_info_content)
         
-        name_content = f"    {Colors.BOLD}Name:{Colors.RESET} {accent_gold}{dir_name}{Colors.RESET}"
-        name_display_len = get_display_length(name_content)
-        name_spacing = max(1, 98 - name_display_len)
-        print(f"{gradient_mid}║{Colors.RESET}{name_content}")
+        out.append("".join((_ROW_PREFIX, "    ", bold, "Name:", reset, " ", accent_gold, dir_name, reset)))
         
         path_display = current_dir if len(current_dir) <= 71 else f"...{current_dir[-68:]}"
-        path_content = f"    {Colors.BOLD}Path:{Colors.RESET} {Colors.DIM}{path_display}{Colors.RESET}"
-        path_display_len = get_display_length(path_content)
-        path_spacing = max(1, 98 - path_display_len)
-        print(f"{gradient_mid}║{Colors.RESET}{path_content}")
-        print(f"{gradient_mid}║{Colors.RESET} {' '*98}")
+        out.append("".join((_ROW_PREFIX, "    ", bold, "Path:", reset, " ", dim, path_display, reset)))
+        out.append(_ROW_BLANK)
         
-        stats_header_content = f" {accent_silver}📈 Project Statistics:{Colors.RESET}"
-        stats_header_display_len = get_display_length(stats_header_content)
-        stats_header_spacing = max(1, 98 - stats_header_display_len)
-        print(f"{gradient_mid}║{Colors.RESET}{stats_header_content}")
+        stats_header_content = f" {accent_silver}📈 Project Statistics:{reset}"
+        out.append(_ROW_PREFIX + stats_header_content)
         
-        stats_line = f"    🐍 {accent_gold}{py_files}{Colors.RESET} py  📄 {accent_gold}{json_files}{Colors.RESET} json  📂 {accent_gold}{directories}{Colors.RESET} dirs  📋 {accent_gold}{total_files}{Colors.RESET} files  💾 {accent_gold}{session_files}{Colors.RESET} sessions"
-        print(f"{gradient_mid}║{Colors.RESET}{stats_line}")
+        out.append("".join((
+            _ROW_PREFIX,
+            "    🐍 ", accent_gold, str(py_files), reset, " py  ",
+            "📄 ", accent_gold, str(json_files), reset, " json  ",
+            "📂 ", accent_gold, str(directories), reset, " dirs  ",
+            "📋 ", accent_gold, str(total_files), reset, " files  ",
+            "💾 ", accent_gold, str(session_files), reset, " sessions",
+        )))
         
-        print(f"{gradient_mid}║{Colors.RESET} {' '*98}")
+        out.append(_ROW_BLANK)
         
-        dev_env_content = f" {accent_silver}🔧 Development Environment:{Colors.RESET}"
-        dev_env_display_len = get_display_length(dev_env_content)
-        dev_env_spacing = max(1, 98 - dev_env_display_len)
-        print(f"{gradient_mid}║{Colors.RESET}{dev_env_content}")
+        dev_env_content = f" {accent_silver}🔧 Development Environment:{reset}"
+        out.append(_ROW_PREFIX + dev_env_content)
         
-        git_status = f"{Colors.GREEN}●{Colors.RESET} {accent_gold}Git{Colors.RESET}" if has_git else f"{Colors.RED}○{Colors.RESET} {Colors.DIM}Git{Colors.RESET}"
-        venv_status = f"{Colors.GREEN}●{Colors.RESET} {accent_gold}VEnv{Colors.RESET}" if has_venv else f"{Colors.RED}○{Colors.RESET} {Colors.DIM}VEnv{Colors.RESET}"
-        req_status = f"{Colors.GREEN}●{Colors.RESET} {accent_gold}Requirements{Colors.RESET}" if has_requirements else f"{Colors.RED}○{Colors.RESET} {Colors.DIM}Requirements{Colors.RESET}"
-        dev_features_line = f"    {git_status}  {venv_status}  {req_status}"
-        print(f"{gradient_mid}║{Colors.RESET}{dev_features_line}")
+        out.append("".join((_ROW_PREFIX, "    ", _GIT[has_git], "  ", _VENV[has_venv], "  ", _REQ[has_requirements])))
         
-        print(f"{gradient_mid}║{Colors.RESET} {' '*98}")
+        out.append(_ROW_BLANK)
         
         if not (has_git and has_venv):
-            tip_content = f" {Colors.DIM}{neon_cyan}💡 Recommendation: Initialize git and virtual environment{Colors.RESET}"
-            tip_display_len = get_display_length(tip_content)
-            tip_spacing = max(1, 98 - tip_display_len)
-            print(f"{gradient_mid}║{Colors.RESET}{tip_content}")
+            tip_content = f" {dim}{neon_cyan}💡 Recommendation: Initialize git and virtual environment{reset}"
+            out.append(_ROW_PREFIX + tip_content)
         else:
-            success_content = f" {Colors.BOLD}{green}✨ Excellent! Well-configured development environment detected{Colors.RESET}"
-            success_display_len = get_display_length(success_content)
-            success_spacing = max(1, 98 - success_display_len)
-            print(f"{gradient_mid}║{Colors.RESET}{success_content}")
+            success_content = f" {bold}{green}✨ Excellent! Well-configured development environment detected{reset}"
+            out.append(_ROW_PREFIX + success_content)
         
-        print(f"{gradient_mid}╚{'═'*100}╝{Colors.RESET}")
+        out.append(_ROW_BOTTOM)
+        self._emit(out)
     
     def display_help(self) -> None:
         """Display comprehensive help information with modern styling."""
+        if self._help_cache is None:
+            self._help_cache = self._render_help()
+        sys.stdout.write(self._help_cache)
+    
+    def _render_help(self) -> str:
+        """Build the full help screen; cached by display_help until the theme changes."""
         gradient_top = Colors.PRIMARY_GRADIENT_TOP
         gradient_mid = Colors.PRIMARY_GRADIENT_MID
         gradient_bot = Colors.PRIMARY_GRADIENT_BOT
+        reset = Colors.RESET
+        bold = Colors.BOLD
+        dim = Colors.DIM
+        cyan = Colors.CYAN
+        yellow = Colors.YELLOW
+        out = []
         
-        print(f"\n{gradient_top}╔{'═'*120}╗{Colors.RESET}")
-        
-        help_header_content = f" {Colors.BOLD}{gradient_mid}📚 COMPREHENSIVE COMMAND REFERENCE{Colors.RESET}"
-        help_header_display_len = get_display_length(help_header_content)
-        help_header_spacing = max(1, 118 - help_header_display_len)
-        print(f"{gradient_top}║{Colors.RESET}{help_header_content}")
-        print(f"{gradient_top}╚{'═'*120}╝{Colors.RESET}")
-        
-        help_sections = {
-            "🚀 Project Management": [
-                ("project list", "List all projects", "📋"),
-                ("project create <name>", "Create new project", "➕"),
-                ("project switch <id/name>", "Switch to project", "🔄"),
-                ("project info", "Show current project info", "ℹ️"),
-                ("project delete <id/name>", "Delete project", "🗑️"),
-                ("project rename <id/name> <new_name>", "Rename project", "✏️"),
-                ("project settings", "Show project settings", "⚙️"),
-                ("project export [format]", "Export projects (json/xml/txt/csv)", "📤"),
-                ("project clear exports", "Clear all exported files", "🧹")
-            ],
-            "🤖 AI Integration": [
-                ("ai config setup", "Interactive setup with latest models and real-time validation", "🔧"),
-                ("ai config show", "Show current AI configuration with masked key", "👁️"),
-                ("ai config test", "Test AI connection with current configuration", "🧪"),
-                ("ai config add-key", "Add or replace API key with validation", "🔑"),
-                ("ai config edit-key", "Edit current API key with validation", "✏️"),
-                ("ai config delete-key", "Remove API key and configuration completely", "🗑️"),
-                ("ai chat <message>", "Chat with AI using project context", "💬"),
-                ("ai status", "Show detailed AI service and integration status", "📊"),
-                ("ai help", "Show comprehensive AI commands help", "❓")
-            ],
-            "🧠 Chat & Memory": [
-                ("chat add <user|assistant|system> <text>", "Append a chat message to durable log", "➕"),
-                ("chat prompt", "Build token-aware prompt from recent turns", "🧪"),
-                ("chat export", "Export universal memory JSONL for AI editors", "📤"),
-                ("chat snapshot", "Append daily long-term memory snapshot", "🧷"),
-                ("chat clear", "Clear durable chat transcript (.terminal_data/messages/chat.jsonl)", "🧹"),
-                ("remember <text>", "Save instruction; also export to exports/remember_last.txt", "📌"),
-                ("remember", "Perform all saved remembered entries sequentially", "⚡"),
-                ("remember list", "List saved remembered entries with indexes", "📜"),
-                ("remember remove <n>", "Remove a remembered entry by index", "🗑️"),
-                ("remember purge executed", "Remove all executed remembered entries", "🧹"),
-                ("remember clear", "Clear all remembered entries", "🧹"),
-                ("perform", "Auto-execute last remembered entry or push to chat", "🚀"),
-                ("perform <n>", "Execute the nth remembered entry directly", "🎯"),
-                ("perform range <a> <b>", "Execute a range of remembered entries", "📐"),
-                ("perform clear", "Clear only the last remembered entry", "🧹")
-            ],
-            "✅ Task Management": [
-                ("task list", "List all tasks", "📝"),
-                ("task create <title>", "Create new task", "➕"),
-                ("task update <id> <status>", "Update task status", "🔄"),
-                ("task delete <id>", "Delete task", "❌"),
-                ("task priority <id> <1-5>", "Set task priority", "⭐"),
-                ("task clear", "Clear all tasks", "🧹")
-            ],
-            "💬 Messaging System": [
-                ("message send <content>", "Send message to AI editor", "📨"),
-                ("message history", "Show message history", "📜"),
-                ("message export <format>", "Export messages (json/xml/txt)", "📤"),
-                ("message clear", "Clear message history", "🧹")
-            ],
-            "🔄 Session Management": [
-                ("session save", "Save current session", "💾"),
-                ("session restore <id>", "Restore session", "🔄"),
-                ("session list", "List saved sessions", "📋"),
-                ("session export", "Export session data", "📤"),
-                ("session clear", "Clear all sessions", "🧹")
-            ],
-            "💻 Terminal Operations": [
-                ("run <command>", "Execute shell command", "⚡"),
-                ("cd <path>", "Change directory", "📁"),
-                ("ls / dir", "List directory contents", "📂"),
-                ("pwd", "Show current directory", "📍"),
-                ("clear", "Clear screen", "🧹"),
-                ("clear all", "Clear ALL data - comprehensive system reset", "🗥️")
-            ],
-            "📁 File Operations": [
-                ("@path/to/file", "Direct file access and preview", "📄"),
-                ("@./filename", "Access file in current directory", "📝"),
-                ("@/absolute/path", "Access file with absolute path", "🗂️"),
-                ("@directory/", "List directory contents", "📂")
-            ],
-            "⚙️ Interface & Settings": [
-                ("theme <name>", "Change color theme", "🎨"),
-                ("config show", "Show all configuration", "👁️"),
-                ("config set <key> <value>", "Set configuration value", "🔧"),
-                ("config set auto_perform_on_start <on|off>", "Run remembered entries on startup", "🚀"),
-                ("config set verbose <on|off>", "Enable verbose logging", "🗒️"),
-                ("config set assume_yes <on|off>", "Skip confirmations for batch actions", "✅"),
-                ("config set max_batch_perform <n>", "Limit batch size for perform operations", "📦"),
-                ("config set auto_save <on/off>", "Toggle auto-save feature", "💾"),
-                ("config reset [project]", "Reset to defaults", "🔄"),
-                ("config export [format]", "Export config (json/xml/txt/csv)", "📤"),
-                ("config import <file>", "Import configuration", "📥"),
-                ("config backup", "Create config backup", "💾"),
-                ("config restore <file>", "Restore from backup", "🔄"),
-                ("status", "Show system status", "📊"),
-                ("performance", "Show performance metrics", "⚡"),
-                ("backup create/restore/list/clear", "Backup operations", "🔙"),
-                ("back [number]", "Go back to previous state", "⬅️"),
-                ("back restore <number>", "Restore specific state", "🔄"),
-                ("back clear", "Clear state history", "🧹"),
-                ("memory status", "Show memory counters and last entry preview", "🧮"),
-                ("memory clear", "Wipe remembered entries, snapshots and context store", "🧹")
-            ]
-        }
+        out.append(f"\n{gradient_top}╔{_H120}╗{reset}")
+        
+        help_header_content = f" {bold}{gradient_mid}📚 COMPREHENSIVE COMMAND REFERENCE{reset}"
+        out.append(f"{gradient_top}║{reset}{help_header_content}")
+        out.append(f"{gradient_top}╚{_H120}╝{reset}")
         
-        for section_title, commands in help_sections.items():
-            print(f"\n{gradient_mid}┌─ {Colors.BOLD}{section_title}{Colors.RESET} {'─'*(91-len(section_title))}┐{Colors.RESET}")
+        for section_title, commands in _HELP_SECTIONS:
+            out.append(f"\n{gradient_mid}┌─ {bold}{section_title}{reset} {_HELP_SEP[section_title]}┐{reset}")
             
             for cmd, desc, icon in commands:
-                cmd_formatted = f"{Colors.CYAN}{cmd}{Colors.RESET}"
+                cmd_formatted = f"{cyan}{cmd}{reset}"
                 spacing = max(1, 30 - len(cmd))
-                desc_formatted = f"{Colors.DIM}{desc}{Colors.RESET}"
+                desc_formatted = f"{dim}{desc}{reset}"
                 
-                print(f"{gradient_mid}│{Colors.RESET} {icon} {cmd_formatted}{' '*spacing} {desc_formatted}")
+                out.append(f"{gradient_mid}│{reset} {icon} {cmd_formatted}{' '*spacing} {desc_formatted}")
             
-            print(f"{gradient_mid}└{'─'*100}┘{Colors.RESET}")
+            out.append(f"{gradient_mid}└{_HELP_RULE}┘{reset}")
         
-        print(f"\n{gradient_bot}┌─ 💡 TIPS & SHORTCUTS {'─'*76}┐{Colors.RESET}")
-        tips = [
-            ("⌨️", "Use Tab for command completion"),
-            ("⛔", "Press Ctrl+C to interrupt running commands"),
-            ("📁", "Use @path/to/file for instant file operations"),
-            ("🎯", "Interface now uses horizontal layouts for better space efficiency"),
-            ("🔍", "Type 'help <command>' for detailed command info")
-        ]
+        out.append(f"\n{gradient_bot}┌─ 💡 TIPS & SHORTCUTS {_HELP_TIPS_SEP}┐{reset}")
         
-        for icon, tip in tips:
-            print(f"{gradient_bot}│{Colors.RESET} {icon} {Colors.YELLOW}{tip}{Colors.RESET}")
+        for icon, tip in _HELP_TIPS:
+            out.append(f"{gradient_bot}│{reset} {icon} {yellow}{tip}{reset}")
         
-        print(f"{gradient_bot}└{'─'*100}┘{Colors.RESET}\n")
+        out.append(f"{gradient_bot}└{_HELP_RULE}┘{reset}\n")
+        return "\n".join(out) + "\n"
     
     def handle_project_command(self, args: List[str]) -> None:
         """Handle project management commands."""
@@ -3056,193 +3418,213 @@ class RobustTerminalInterface:
         
         subcommand = args[0].lower()
         
-        if subcommand == "list":
-            print(f"\n{Colors.BOLD}Projects:{Colors.RESET}")
-            if not self.projects:
-                print("  No projects found")
-                return
-            
-            for pid, proj in self.projects.items():
-                current = "*" if pid == self.current_project else " "
-                print(f"  {current} {Colors.GREEN}{proj.name}{Colors.RESET} ({pid})")
-                print(f"    Path: {proj.path}")
-                print(f"    Last accessed: {proj.last_accessed}")
+        handler = self._project_subcmds.get(subcommand)
+        if handler:
+            handler(args)
+        else:
+            print(f"{Colors.RED}Unknown project command: {subcommand}{Colors.RESET}")
+            print(f"Available commands: list, create, switch, info, delete, rename, settings, export, clear")
+    
+    def _project_list(self, args: List[str]) -> None:
+        """Handle 'project list'."""
+        print(f"\n{Colors.BOLD}Projects:{Colors.RESET}")
+        if not self.projects:
+            print("  No projects found")
+            return
         
-        elif subcommand in ["create", "add"] and len(args) > 1:
-            project_name = " ".join(args[1:])
-            project_id = f"proj_{uuid.uuid4().hex[:8]}"
-            
-            new_project = Project(
-                id=project_id,
-                name=project_name,
-                description=f"Project: {project_name}",
-                path=str(self.project_root),
-                created_at=datetime.now().isoformat(),
-                last_accessed=datetime.now().isoformat()
-            )
-            
-            self.projects[project_id] = new_project
-            self.current_project = project_id
-            
-            print(f"{Colors.GREEN}Created project: {Colors.BOLD}{project_name}{Colors.RESET} ({project_id}){Colors.RESET}")
-            self.log_message(f"Created project: {project_name}")
+        for pid, proj in self.projects.items():
+            current = "*" if pid == self.current_project else " "
+            print(f"  {current} {Colors.GREEN}{proj.name}{Colors.RESET} ({pid})")
+            print(f"    Path: {proj.path}")
+            print(f"    Last accessed: {proj.last_accessed}")
+    
+    def _project_create(self, args: List[str]) -> None:
+        """Handle 'project create'."""
+        if len(args) < 2:
+            print(f"{Colors.RED}Usage: project create <name>{Colors.RESET}")
+            return
         
-        elif subcommand == "switch" and len(args) > 1:
-            target = args[1]
-            
-            found_project = None
-            for pid, proj in self.projects.items():
-                if pid == target or proj.name.lower() == target.lower():
-                    found_project = pid
-                    break
-            
-            if found_project:
-                self.current_project = found_project
-                proj = self.projects[found_project]
-                proj.last_accessed = datetime.now().isoformat()
-                print(f"{Colors.GREEN}Switched to project: {Colors.BOLD}{proj.name}{Colors.RESET}")
-                self.log_message(f"Switched to project: {proj.name}")
-            else:
-                print(f"{Colors.RED}Project not found: {target}{Colors.RESET}")
+        project_name = " ".join(args[1:])
+        project_id = f"proj_{secrets.token_hex(4)}"
+        now_iso = datetime.now().isoformat()
         
-        elif subcommand == "info":
-            if self.current_project and self.current_project in self.projects:
-                proj = self.projects[self.current_project]
-                print(f"\n{Colors.BOLD}Current Project:{Colors.RESET}")
-                print(f"  Name: {Colors.GREEN}{proj.name}{Colors.RESET}")
-                print(f"  ID: {proj.id}")
-                print(f"  Path: {proj.path}")
-                print(f"  Created: {proj.created_at}")
-                print(f"  Last accessed: {proj.last_accessed}")
-                print(f"  Description: {proj.description}")
-            else:
-                print(f"{Colors.YELLOW}No current project{Colors.RESET}")
-        
-        elif subcommand == "delete" and len(args) > 1:
-            target = args[1]
-            found_project = None
-            for pid, proj in self.projects.items():
-                if pid == target or proj.name.lower() == target.lower():
-                    found_project = pid
-                    break
-            
-            if found_project:
-                proj_name = self.projects[found_project].name
-                del self.projects[found_project]
-                if self.current_project == found_project:
-                    self.current_project = None
-                print(f"{Colors.GREEN}Deleted project: {Colors.BOLD}{proj_name}{Colors.RESET}")
-                self.log_message(f"Deleted project: {proj_name}")
-            else:
-                print(f"{Colors.RED}Project not found: {target}{Colors.RESET}")
-        
-        elif subcommand == "rename" and len(args) > 2:
-            target = args[1]
-            new_name = " ".join(args[2:])
-            found_project = None
-            for pid, proj in self.projects.items():
-                if pid == target or proj.name.lower() == target.lower():
-                    found_project = pid
-                    break
-            
-            if found_project:
-                old_name = self.projects[found_project].name
-                self.projects[found_project].name = new_name
-                self.projects[found_project].last_accessed = datetime.now().isoformat()
-                print(f"{Colors.GREEN}Renamed project from '{old_name}' to '{new_name}'{Colors.RESET}")
-                self.log_message(f"Renamed project: {old_name} -> {new_name}")
-            else:
-                print(f"{Colors.RED}Project not found: {target}{Colors.RESET}")
+        new_project = Project(
+            id=project_id,
+            name=project_name,
+            description=f"Project: {project_name}",
+            path=str(self.project_root),
+            created_at=now_iso,
+            last_accessed=now_iso
+        )
         
-        elif subcommand == "settings":
-            if self.current_project and self.current_project in self.projects:
-                proj = self.projects[self.current_project]
-                print(f"\n{Colors.BOLD}Project Settings: {proj.name}{Colors.RESET}")
-                print(f"  Settings: {proj.settings}")
-                print(f"\n{Colors.YELLOW}Use 'config set project.<key> <value>' to modify project settings{Colors.RESET}")
-            else:
-                print(f"{Colors.YELLOW}No current project{Colors.RESET}")
+        self.projects[project_id] = new_project
+        self._name_index.setdefault(project_name.lower(), project_id)
+        self.current_project = project_id
         
-        elif subcommand == "export":
-            if not self.projects:
-                print(f"{Colors.YELLOW}No projects to export{Colors.RESET}")
-                return
-            
-            format_type = args[1].lower() if len(args) > 1 else "json"
-            
-            if format_type not in ["json", "xml", "txt", "csv"]:
-                print(f"{Colors.RED}Invalid format: {format_type}. Use: json, xml, txt, csv{Colors.RESET}")
-                return
-            
-            export_file = self.data_dir / "exports" / f"projects_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{format_type}"
-            export_file.parent.mkdir(exist_ok=True)
-            
-            try:
-                if format_type == "json":
-                    export_data = {pid: asdict(proj) for pid, proj in self.projects.items()}
-                    with open(export_file, 'w', encoding='utf-8') as f:
-                        json.dump(export_data, f, indent=2)
-                        
-                elif format_type == "xml":
-                    with open(export_file, 'w', encoding='utf-8') as f:
-                        f.write("<?xml version='1.0' encoding='UTF-8'?>\n<projects>\n")
-                        for pid, proj in self.projects.items():
-                            f.write(f"  <project id='{pid}'>\n")
-                            f.write(f"    <name>{proj.name}</name>\n")
-                            f.write(f"    <path>{proj.path}</path>\n")
-                            f.write(f"    <created_at>{proj.created_at}</created_at>\n")
-                            f.write(f"    <description>{proj.description}</description>\n")
-                            if proj.settings:
-                                f.write(f"    <settings>\n")
-                                for key, value in proj.settings.items():
-                                    f.write(f"      <{key}>{value}</{key}>\n")
-                                f.write(f"    </settings>\n")
-                            f.write(f"  </project>\n")
-                        f.write("</projects>\n")
-                        
-                elif format_type == "txt":
-                    with open(export_file, 'w', encoding='utf-8') as f:
-                        f.write("PROJECT EXPORT\n")
-                        f.write("=" * 50 + "\n\n")
-                        for pid, proj in self.projects.items():
-                            f.write(f"Project ID: {pid}\n")
-                            f.write(f"Name: {proj.name}\n")
-                            f.write(f"Path: {proj.path}\n")
-                            f.write(f"Created: {proj.created_at}\n")
-                            f.write(f"Description: {proj.description}\n")
-                            if proj.settings:
-                                f.write(f"Settings: {proj.settings}\n")
-                            f.write("-" * 30 + "\n\n")
-                            
-                elif format_type == "csv":
-                    with open(export_file, 'w', encoding='utf-8') as f:
-                        f.write("ID,Name,Path,Created,Description,Settings\n")
-                        for pid, proj in self.projects.items():
-                            settings_str = str(proj.settings) if proj.settings else ""
-                            f.write(f'"{pid}","{proj.name}","{proj.path}","{proj.created_at}","{proj.description}","{settings_str}"\n')
-                
-                print(f"{Colors.GREEN}Projects exported to: {export_file}{Colors.RESET}")
-                self.log_message(f"Projects exported to {export_file}")
-            except Exception as e:
-                print(f"{Colors.RED}Export failed: {e}{Colors.RESET}")
+        print(f"{Colors.GREEN}Created project: {Colors.BOLD}{project_name}{Colors.RESET} ({project_id}){Colors.RESET}")
+        self.log_message(f"Created project: {project_name}")
+    
+    def _project_switch(self, args: List[str]) -> None:
+        """Handle 'project switch'."""
+        if len(args) < 2:
+            print(f"{Colors.RED}Usage: project switch <id/name>{Colors.RESET}")
+            return
         
-        elif subcommand == "clear":
-            if len(args) > 1 and args[1] == "exports":
-                export_dir = self.data_dir / "exports"
-                if export_dir.exists():
-                    import shutil
-                    shutil.rmtree(export_dir)
-                    export_dir.mkdir(exist_ok=True)
-                    print(f"{Colors.GREEN}All exported files cleared{Colors.RESET}")
-                    self.log_message("Cleared all exported files")
-                else:
-                    print(f"{Colors.YELLOW}No exports directory found{Colors.RESET}")
-            else:
-                print(f"{Colors.RED}Usage: project clear exports{Colors.RESET}")
+        target = args[1]
+        
+        found_project = self._find_project(target)
         
+        if found_project:
+            self.current_project = found_project
+            proj = self.projects[found_project]
+            proj.last_accessed = datetime.now().isoformat()
+            print(f"{Colors.GREEN}Switched to project: {Colors.BOLD}{proj.name}{Colors.RESET}")
+            self.log_message(f"Switched to project: {proj.name}")
         else:
-            print(f"{Colors.RED}Unknown project command: {subcommand}{Colors.RESET}")
-            print(f"Available commands: list, create, switch, info, delete, rename, settings, export, clear")
+            print(f"{Colors.RED}Project not found: {target}{Colors.RESET}")
+    
+    def _project_info(self, args: List[str]) -> None:
+        """Handle 'project info'."""
+        if self.current_project and self.current_project in self.projects:
+            proj = self.projects[self.current_project]
+            print(f"\n{Colors.BOLD}Current Project:{Colors.RESET}")
+            print(f"  Name: {Colors.GREEN}{proj.name}{Colors.RESET}")
+            print(f"  ID: {proj.id}")
+            print(f"  Path: {proj.path}")
+            print(f"  Created: {proj.created_at}")
+            print(f"  Last accessed: {proj.last_accessed}")
+            print(f"  Description: {proj.description}")
+        else:
+            print(f"{Colors.YELLOW}No current project{Colors.RESET}")
+    
+    def _project_delete(self, args: List[str]) -> None:
+        """Handle 'project delete'."""
+        if len(args) < 2:
+            print(f"{Colors.RED}Usage: project delete <id/name>{Colors.RESET}")
+            return
+        
+        target = args[1]
+        found_project = self._find_project(target)
+        
+        if found_project:
+            proj_name = self.projects[found_project].name
+            del self.projects[found_project]
+            self._reindex_projects()
+            if self.current_project == found_project:
+                self.current_project = None
+            print(f"{Colors.GREEN}Deleted project: {Colors.BOLD}{proj_name}{Colors.RESET}")
+            self.log_message(f"Deleted project: {proj_name}")
+        else:
+            print(f"{Colors.RED}Project not found: {target}{Colors.RESET}")
+    
+    def _project_rename(self, args: List[str]) -> None:
+        """Handle 'project rename'."""
+        if len(args) < 3:
+            print(f"{Colors.RED}Usage: project rename <id/name> <new_name>{Colors.RESET}")
+            return
+        
+        target = args[1]
+        new_name = " ".join(args[2:])
+        found_project = self._find_project(target)
+        
+        if found_project:
+            old_name = self.projects[found_project].name
+            self.projects[found_project].name = new_name
+            self._reindex_projects()
+            self.projects[found_project].last_accessed = datetime.now().isoformat()
+            print(f"{Colors.GREEN}Renamed project from '{old_name}' to '{new_name}'{Colors.RESET}")
+            self.log_message(f"Renamed project: {old_name} -> {new_name}")
+        else:
+            print(f"{Colors.RED}Project not found: {target}{Colors.RESET}")
+    
+    def _project_settings(self, args: List[str]) -> None:
+        """Handle 'project settings'."""
+        if self.current_project and self.current_project in self.projects:
+            proj = self.projects[self.current_project]
+            print(f"\n{Colors.BOLD}Project Settings: {proj.name}{Colors.RESET}")
+            print(f"  Settings: {proj.settings}")
+            print(f"\n{Colors.YELLOW}Use 'config set project.<key> <value>' to modify project settings{Colors.RESET}")
+        else:
+            print(f"{Colors.YELLOW}No current project{Colors.RESET}")
+    
+    def _project_export(self, args: List[str]) -> None:
+        """Handle 'project export'."""
+        if not self.projects:
+            print(f"{Colors.YELLOW}No projects to export{Colors.RESET}")
+            return
+        
+        format_type = args[1].lower() if len(args) > 1 else "json"
+        
+        if format_type not in _EXPORT_FORMATS:
+            print(f"{Colors.RED}Invalid format: {format_type}. Use: json, xml, txt, csv{Colors.RESET}")
+            return
+        
+        export_file = self.data_dir / "exports" / f"projects_export_{_ts_filename(int(time.time()))}.{format_type}"
+        export_file.parent.mkdir(exist_ok=True)
+        
+        try:
+            if format_type == "json":
+                export_data = self._project_dicts()
+                with open(export_file, 'w', encoding='utf-8', buffering=1 << 20) as f:
+                    f.write(_JSON_PRETTY.encode(export_data))
+                    
+            elif format_type == "xml":
+                root = ET.Element('projects')
+                for pid, proj in self.projects.items():
+                    node = ET.SubElement(root, 'project', id=pid)
+                    ET.SubElement(node, 'name').text = proj.name
+                    ET.SubElement(node, 'path').text = proj.path
+                    ET.SubElement(node, 'created_at').text = proj.created_at
+                    ET.SubElement(node, 'description').text = proj.description
+                    if proj.settings:
+                        settings_node = ET.SubElement(node, 'settings')
+                        for key, value in proj.settings.items():
+                            ET.SubElement(settings_node, str(key)).text = str(value)
+                ET.ElementTree(root).write(export_file, encoding='utf-8', xml_declaration=True)
+                    
+            elif format_type == "txt":
+                parts = ["PROJECT EXPORT\n", "=" * 50 + "\n\n"]
+                for pid, proj in self.projects.items():
+                    parts.append(f"Project ID: {pid}\n")
+                    parts.append(f"Name: {proj.name}\n")
+                    parts.append(f"Path: {proj.path}\n")
+                    parts.append(f"Created: {proj.created_at}\n")
+                    parts.append(f"Description: {proj.description}\n")
+                    if proj.settings:
+                        parts.append(f"Settings: {proj.settings}\n")
+                    parts.append("-" * 30 + "\n\n")
+                with open(export_file, 'w', encoding='utf-8') as f:
+                    f.write("".join(parts))
+                        
+            elif format_type == "csv":
+                with open(export_file, 'w', encoding='utf-8', newline='', buffering=1 << 16) as f:
+                    writer = csv.writer(f, quoting=csv.QUOTE_ALL, lineterminator='\n')
+                    f.write("ID,Name,Path,Created,Description,Settings\n")
+                    writer.writerows(
+                        (pid, proj.name, proj.path, proj.created_at, proj.description, str(proj.settings) if proj.settings else "")
+                        for pid, proj in self.projects.items()
+                    )
+            
+            print(f"{Colors.GREEN}Projects exported to: {export_file}{Colors.RESET}")
+            self.log_message(f"Projects exported to {export_file}")
+        except Exception as e:
+            print(f"{Colors.RED}Export failed: {e}{Colors.RESET}")
+    
+    def _project_clear(self, args: List[str]) -> None:
+        """Handle 'project clear'."""
+        if len(args) > 1 and args[1] == "exports":
+            export_dir = self.data_dir / "exports"
+            if export_dir.exists():
+                # Drop the cached append handle first, or later events go to the unlinked file
+                self._close_editor_events()
+                shutil.rmtree(export_dir)
+                export_dir.mkdir(exist_ok=True)
+                print(f"{Colors.GREEN}All exported files cleared{Colors.RESET}")
+                self.log_message("Cleared all exported files")
+            else:
+                print(f"{Colors.YELLOW}No exports directory found{Colors.RESET}")
+        else:
+            print(f"{Colors.RED}Usage: project clear exports{Colors.RESET}")
     
     def handle_task_command(self, args: List[str]) -> None:
         """Handle task management commands."""
@@ -3252,85 +3634,92 @@ class RobustTerminalInterface:
         
         subcommand = args[0].lower()
         
-        if subcommand == "list":
-            print(f"\n{Colors.BOLD}Tasks:{Colors.RESET}")
-            if not self.tasks:
-                print("  No tasks found")
-                return
-            
-            by_status = {}
-            for task in self.tasks.values():
-                status = task.status.value
-                if status not in by_status:
-                    by_status[status] = []
-                by_status[status].append(task)
-            
-            for status, tasks in by_status.items():
-                status_color = {
-                    "pending": Colors.YELLOW,
-                    "in_progress": Colors.BLUE,
-                    "completed": Colors.GREEN,
-                    "blocked": Colors.RED
-                }.get(status, Colors.WHITE)
-                
-                print(f"\n  {status_color}{status.upper()}{Colors.RESET}:")
-                for task in sorted(tasks, key=lambda t: t.priority, reverse=True):
-                    priority_indicator = "HIGH" if task.priority >= 4 else "MED" if task.priority >= 3 else "LOW"
-                    print(f"    {priority_indicator} {task.title} ({task.id})")
-                    if task.description:
-                        print(f"      {Colors.ITALIC}{task.description}{Colors.RESET}")
-        
-        elif subcommand in ["create", "add"] and len(args) > 1:
-            title = " ".join(args[1:])
-            task_id = f"task_{uuid.uuid4().hex[:8]}"
-            
-            new_task = Task(
-                id=task_id,
-                title=title,
-                description="",
-                status=TaskStatus.PENDING,
-                priority=3,
-                created_at=datetime.now().isoformat(),
-                updated_at=datetime.now().isoformat(),
-                project_id=self.current_project
-            )
-            
-            self.tasks[task_id] = new_task
-            print(f"{Colors.GREEN}Created task: {Colors.BOLD}{title}{Colors.RESET} ({task_id})")
-            self.log_message(f"Created task: {title}")
+        handler = self._task_subcmds.get(subcommand)
+        if handler:
+            handler(args)
+        else:
+            print(f"{Colors.RED}Unknown task command: {subcommand}{Colors.RESET}")
+    
+    def _task_list(self, args: List[str]) -> None:
+        """Handle 'task list'."""
+        print(f"\n{Colors.BOLD}Tasks:{Colors.RESET}")
+        if not self.tasks:
+            print("  No tasks found")
+            return
+        
+        by_status = defaultdict(list)
+        for task in self.tasks.values():
+            by_status[task.status.value].append(task)
         
-        elif subcommand == "update" and len(args) >= 3:
-            task_id = args[1]
-            new_status = args[2].lower()
+        for status, tasks in by_status.items():
+            status_color = _STATUS_COLORS.get(status, Colors.WHITE)
             
-            if task_id in self.tasks:
-                try:
-                    status_enum = TaskStatus(new_status)
-                    self.tasks[task_id].status = status_enum
-                    self.tasks[task_id].updated_at = datetime.now().isoformat()
-                    
-                    print(f"{Colors.GREEN}Updated task {task_id} status to: {Colors.BOLD}{new_status}{Colors.RESET}")
-                    self.log_message(f"Updated task {task_id} status to {new_status}")
-                except ValueError:
-                    print(f"{Colors.RED}Invalid status: {new_status}{Colors.RESET}")
-                    print(f"Valid statuses: {', '.join([s.value for s in TaskStatus])}")
-            else:
-                print(f"{Colors.RED}Task not found: {task_id}{Colors.RESET}")
+            print(f"\n  {status_color}{status.upper()}{Colors.RESET}:")
+            for task in sorted(tasks, key=attrgetter('priority'), reverse=True):
+                priority_indicator = "HIGH" if task.priority >= 4 else "MED" if task.priority >= 3 else "LOW"
+                print(f"    {priority_indicator} {task.title} ({task.id})")
+                if task.description:
+                    print(f"      {Colors.ITALIC}{task.description}{Colors.RESET}")
+    
+    def _task_create(self, args: List[str]) -> None:
+        """Handle 'task create'."""
+        if len(args) < 2:
+            print(f"{Colors.RED}Usage: task create <title>{Colors.RESET}")
+            return
         
-        elif subcommand == "clear":
-            self.tasks.clear()
-            try:
-                tasks_file = self.data_dir / "tasks.json"
-                if tasks_file.exists():
-                    with open(tasks_file, 'w', encoding='utf-8') as f:
-                        json.dump({}, f)
-                print(f"{Colors.GREEN}All tasks cleared (memory and storage){Colors.RESET}")
-                self.log_message("All tasks cleared")
-            except Exception as e:
-                print(f"{Colors.YELLOW}Memory cleared, but storage clear failed: {e}{Colors.RESET}")
+        title = " ".join(args[1:])
+        task_id = f"task_{secrets.token_hex(4)}"
+        now_iso = datetime.now().isoformat()
+        
+        new_task = Task(
+            id=task_id,
+            title=title,
+            description="",
+            status=TaskStatus.PENDING,
+            priority=3,
+            created_at=now_iso,
+            updated_at=now_iso,
+            project_id=self.current_project
+        )
         
+        self.tasks[task_id] = new_task
+        print(f"{Colors.GREEN}Created task: {Colors.BOLD}{title}{Colors.RESET} ({task_id})")
+        self.log_message(f"Created task: {title}")
+    
+    def _task_update(self, args: List[str]) -> None:
+        """Handle 'task update'."""
+        if len(args) < 3:
+            print(f"{Colors.RED}Usage: task update <id> <status>{Colors.RESET}")
+            return
+        
+        task_id = args[1]
+        new_status = args[2].lower()
+        
+        if task_id in self.tasks:
+            try:
+                status_enum = TaskStatus(new_status)
+                self.tasks[task_id].status = status_enum
+                self.tasks[task_id].updated_at = datetime.now().isoformat()
+                
+                print(f"{Colors.GREEN}Updated task {task_id} status to: {Colors.BOLD}{new_status}{Colors.RESET}")
+                self.log_message(f"Updated task {task_id} status to {new_status}")
+            except ValueError:
+                print(f"{Colors.RED}Invalid status: {new_status}{Colors.RESET}")
+                print(f"Valid statuses: {', '.join([s.value for s in TaskStatus])}")
         else:
-            print(f"{Colors.RED}Unknown task command: {subcommand}{Colors.RESET}")
+            print(f"{Colors.RED}Task not found: {task_id}{Colors.RESET}")
+    
+    def _task_clear(self, args: List[str]) -> None:
+        """Handle 'task clear'."""
+        self.tasks.clear()
+        try:
+            tasks_file = self.data_dir / "tasks.json"
+            if tasks_file.exists():
+                tasks_file.write_bytes(b"{}")
+            print(f"{Colors.GREEN}All tasks cleared (memory and storage){Colors.RESET}")
+            self.log_message("All tasks cleared")
+        except Exception as e:
+            print(f"{Colors.YELLOW}Memory cleared, but storage clear failed: {e}{Colors.RESET}")
     
     def handle_message_command(self, args: List[str]) -> None:
         """Handle messaging system commands."""
@@ -3340,95 +3729,100 @@ class RobustTerminalInterface:
         
         subcommand = args[0].lower()
         
-        if subcommand == "send" and len(args) > 1:
-            content = " ".join(args[1:])
-            
-            message = Message(
-                id=f"msg_{uuid.uuid4().hex[:8]}",
-                content=content,
-                timestamp=datetime.now().isoformat(),
-                message_type="user_to_ai",
-                project_id=self.current_project,
-                session_id=self.current_session_id
-            )
-            
-            self.message_history.append(message)
-            
-            print(f"{Colors.GREEN}Message sent to AI editor: {Colors.ITALIC}{content}{Colors.RESET}")
-            print(f"  Message ID: {message.id}")
-            print(f"  Tokens used: ~{len(content.split())}")
-            
-            self.log_message(f"Sent message to AI: {content[:50]}...", "ai_message")
-            
-            self.save_persistent_data()
+        handler = self._message_subcmds.get(subcommand)
+        if handler:
+            handler(args)
+        else:
+            print(f"{Colors.RED}Unknown message command: {subcommand}{Colors.RESET}")
+    
+    def _message_send(self, args: List[str]) -> None:
+        """Handle 'message send'."""
+        if len(args) < 2:
+            print(f"{Colors.RED}Usage: message send <content>{Colors.RESET}")
+            return
         
-        elif subcommand == "history":
-            print(f"\n{Colors.BOLD}Message History:{Colors.RESET}")
-            
-            if not self.message_history:
-                print("  No messages found")
-                return
+        content = " ".join(args[1:])
+        
+        message = Message(
+            id=f"msg_{secrets.token_hex(4)}",
+            content=content,
+            timestamp=datetime.now().isoformat(),
+            message_type="user_to_ai",
+            project_id=self.current_project,
+            session_id=self.current_session_id
+        )
+        
+        self.message_history.append(message)
+        
+        print(f"{Colors.GREEN}Message sent to AI editor: {Colors.ITALIC}{content}{Colors.RESET}")
+        print(f"  Message ID: {message.id}")
+        print(f"  Tokens used: ~{len(content.split())}")
+        
+        self.log_message(f"Sent message to AI: {content[:50]}...", "ai_message")
+        
+        self._mark_dirty('messages')
+    
+    def _message_show_history(self, args: List[str]) -> None:
+        """Handle 'message history'."""
+        print(f"\n{Colors.BOLD}Message History:{Colors.RESET}")
+        
+        if not self.message_history:
+            print("  No messages found")
+            return
+        
+        recent_messages = islice(self.message_history, max(0, len(self.message_history) - 10), None)
+        for msg in recent_messages:
+            timestamp = datetime.fromisoformat(msg.timestamp).strftime("%H:%M:%S")
+            type_icon = _MESSAGE_TYPE_ICONS.get(msg.message_type, "*")
             
-            recent_messages = self.message_history[-10:]
-            for msg in recent_messages:
-                timestamp = datetime.fromisoformat(msg.timestamp).strftime("%H:%M:%S")
-                type_icon = {
-                    "user_to_ai": ">",
-                    "ai_response": "<",
-                    "info": "i",
-                    "warning": "!",
-                    "error": "X"
-                }.get(msg.message_type, "*")
-                
-                print(f"  {type_icon} [{timestamp}] {msg.content[:80]}...")
+            print(f"  {type_icon} [{timestamp}] {msg.content[:80]}...")
+    
+    def _message_clear(self, args: List[str]) -> None:
+        """Handle 'message clear'."""
+        self.message_history.clear()
+        try:
+            history_file = self.data_dir / "messages" / "history.json"
+            if history_file.exists():
+                history_file.write_bytes(b"[]")
+            print(f"{Colors.GREEN}Message history cleared (memory and storage){Colors.RESET}")
+            self.log_message("Message history cleared")
+        except Exception as e:
+            print(f"{Colors.YELLOW}Memory cleared, but storage clear failed: {e}{Colors.RESET}")
+    
+    def _message_export(self, args: List[str]) -> None:
+        """Handle 'message export'."""
+        if len(args) < 2:
+            print(f"{Colors.RED}Usage: message export <json|xml|txt>{Colors.RESET}")
+            return
         
-        elif subcommand == "clear":
-            self.message_history.clear()
-            try:
-                history_file = self.data_dir / "messages" / "history.json"
-                if history_file.exists():
-                    with open(history_file, 'w', encoding='utf-8') as f:
-                        json.dump([], f)
-                print(f"{Colors.GREEN}Message history cleared (memory and storage){Colors.RESET}")
-                self.log_message("Message history cleared")
-            except Exception as e:
-                print(f"{Colors.YELLOW}Memory cleared, but storage clear failed: {e}{Colors.RESET}")
+        format_type = args[1].lower()
         
-        elif subcommand == "export" and len(args) > 1:
-            format_type = args[1].lower()
+        if format_type in _MESSAGE_EXPORT_FORMATS:
+            export_file = self.data_dir / f"message_export_{int(time.time())}.{format_type}"
             
-            if format_type in ["json", "xml", "txt"]:
-                export_file = self.data_dir / f"message_export_{int(time.time())}.{format_type}"
+            try:
+                if format_type == "json":
+                    with open(export_file, 'w', encoding='utf-8', buffering=1 << 20) as f:
+                        f.write(_JSON_PRETTY.encode(list(self.message_history)))
                 
-                try:
-                    if format_type == "json":
-                        with open(export_file, 'w', encoding='utf-8') as f:
-                            json.dump([asdict(msg) for msg in self.message_history], f, indent=2)
-                    
-                    elif format_type == "xml":
-                        with open(export_file, 'w', encoding='utf-8') as f:
-                            f.write("<?xml version='1.0' encoding='UTF-8'?>\n<messages>\n")
-                            for msg in self.message_history:
-                                f.write(f"  <message id='{msg.id}' timestamp='{msg.timestamp}' type='{msg.message_type}'>\n")
-                                f.write(f"    <content>{msg.content}</content>\n")
-                                f.write(f"  </message>\n")
-                            f.write("</messages>\n")
-                    
-                    elif format_type == "txt":
-                        with open(export_file, 'w', encoding='utf-8') as f:
-                            for msg in self.message_history:
-                                f.write(f"[{msg.timestamp}] {msg.message_type}: {msg.content}\n")
-                    
-                    print(f"{Colors.GREEN}Messages exported to: {export_file}{Colors.RESET}")
-                    
-                except Exception as e:
-                    print(f"{Colors.RED}Export failed: {e}{Colors.RESET}")
-            else:
-                print(f"{Colors.RED}Invalid format: {format_type}. Use: json, xml, txt{Colors.RESET}")
-        
+                elif format_type == "xml":
+                    root = ET.Element('messages')
+                    for msg in self.message_history:
+                        node = ET.SubElement(root, 'message', id=msg.id, timestamp=msg.timestamp, type=msg.message_type)
+                        ET.SubElement(node, 'content').text = msg.content
+                    ET.ElementTree(root).write(export_file, encoding='utf-8', xml_declaration=True)
+                
+                elif format_type == "txt":
+                    with open(export_file, 'w', encoding='utf-8') as f:
+                        f.write("".join(f"[{msg.timestamp}] {msg.message_type}: {msg.content}\n" for msg in self.message_history))
+                
+                print(f"{Colors.GREEN}Messages exported to: {export_file}{Colors.RESET}")
+                
+            except Exception as e:
+                print(f"{Colors.RED}Export failed: {e}{Colors.RESET}")
         else:
-            print(f"{Colors.RED}Unknown message command: {subcommand}{Colors.RESET}")
-
+            print(f"{Colors.RED}Invalid format: {format_type}. Use: json, xml, txt{Colors.RESET}")
+    
     def handle_chat_command(self, args: List[str]) -> None:
         """Handle chat operations: add, prompt, export, snapshot."""
         if not hasattr(self, 'chat'):
@@ -3469,10 +3863,10 @@ class RobustTerminalInterface:
         elif sub == 'clear':
             # Clear chat.jsonl by truncation
             try:
-                chat_path = self.chat.chat_file
-                if chat_path.exists():
-                    with open(chat_path, 'w', encoding='utf-8') as f:
-                        f.write("")
+                try:
+                    os.truncate(self.chat.chat_file, 0)
+                except FileNotFoundError:
+                    pass
                 print(f"{Colors.GREEN}Chat history cleared{Colors.RESET}")
             except Exception as e:
                 print(f"{Colors.RED}Failed to clear chat: {e}{Colors.RESET}")
@@ -3487,72 +3881,96 @@ class RobustTerminalInterface:
         
         subcommand = args[0].lower()
         
-        if subcommand == "save":
-            self.save_session()
-            print(f"{Colors.GREEN}Session saved: {self.current_session_id}{Colors.RESET}")
+        handler = self._session_subcmds.get(subcommand)
+        if handler:
+            handler(args)
+        else:
+            print(_STYLED.FAIL.format(f"Unknown session command: {subcommand}"))
+    
+    def _session_save(self, args: List[str]) -> None:
+        """Handle 'session save [--force]'."""
+        self.flush_pending_saves()
+        self.save_session(force='--force' in args[1:])
+        print(_STYLED.OK.format(f"Session saved: {self.current_session_id}"))
+    
+    def _session_list(self, args: List[str]) -> None:
+        """Handle 'session list'."""
+        session_index = self._get_session_index()
+        if session_index is None:
+            print("  No sessions directory found")
+        elif session_index:
+            print(f"\n{Colors.BOLD}Saved Sessions:{Colors.RESET}")
+            for session_name, mtime_ns in sorted(session_index.items(), key=itemgetter(1), reverse=True):
+                modified = datetime.fromtimestamp(mtime_ns / 1e9)
+                print(f"  {session_name} - {modified.strftime('%Y-%m-%d %H:%M:%S')}")
+        else:
+            print("  No saved sessions found")
+    
+    def _session_restore(self, args: List[str]) -> None:
+        """Handle 'session restore'."""
+        if len(args) < 2:
+            print(_STYLED.FAIL.format("Usage: session restore <session_id>"))
+            return
         
-        elif subcommand == "list":
-            sessions_dir = self.data_dir / "sessions"
-            if sessions_dir.exists():
-                session_files = list(sessions_dir.glob("*.json"))
-                if session_files:
-                    print(f"\n{Colors.BOLD}Saved Sessions:{Colors.RESET}")
-                    for session_file in sorted(session_files, key=lambda f: f.stat().st_mtime, reverse=True):
-                        session_name = session_file.stem
-                        modified = datetime.fromtimestamp(session_file.stat().st_mtime)
-                        print(f"  {session_name} - {modified.strftime('%Y-%m-%d %H:%M:%S')}")
-                else:
-                    print("  No saved sessions found")
-            else:
-                print("  No sessions directory found")
+        session_id = args[1]
+        session_file = self.data_dir / "sessions" / f"{session_id}.json"
         
-        elif subcommand == "restore" and len(args) > 1:
-            session_id = args[1]
-            session_file = self.data_dir / "sessions" / f"{session_id}.json"
-            
-            if session_file.exists():
-                try:
-                    with open(session_file, 'r', encoding='utf-8') as f:
-                        session_data = json.load(f)
-                    
-                    self.command_history = session_data.get('command_history', [])
-                    self.current_project = session_data.get('current_project')
-                    
-                    print(f"{Colors.GREEN}Session restored: {session_id}{Colors.RESET}")
-                    self.log_message(f"Restored session: {session_id}")
-                    
-                except Exception as e:
-                    print(f"{Colors.RED}Failed to restore session: {e}{Colors.RESET}")
-            else:
-                print(f"{Colors.RED}Session not found: {session_id}{Colors.RESET}")
-        
-        elif subcommand == "clear":
-            self.command_history.clear()
-            self.session_cleared = True
+        if session_file.exists():
             try:
-                sessions_dir = self.data_dir / "sessions"
-                if sessions_dir.exists():
-                    for session_file in sessions_dir.glob("*.json"):
-                        session_file.unlink()
-                print(f"{Colors.GREEN}All sessions cleared (memory and storage){Colors.RESET}")
-                self.log_message("All sessions cleared")
+                session_data = _load_json_file(session_file)
+                
+                self.command_history = deque(session_data.get('command_history', []), maxlen=self.max_command_history)
+                self.current_project = session_data.get('current_project')
+                
+                print(_STYLED.OK.format(f"Session restored: {session_id}"))
+                self.log_message(f"Restored session: {session_id}")
+                
             except Exception as e:
-                print(f"{Colors.YELLOW}Memory cleared, but storage clear failed: {e}{Colors.RESET}")
-        
+                print(_STYLED.FAIL.format(f"Failed to restore session: {e}"))
         else:
-            print(f"{Colors.RED}Unknown session command: {subcommand}{Colors.RESET}")
+            print(_STYLED.FAIL.format(f"Session not found: {session_id}"))
+    
+    def _session_clear(self, args: List[str]) -> None:
+        """Handle 'session clear'."""
+        self.command_history.clear()
+        self.session_cleared = True
+        try:
+            self._wipe_sessions_dir()
+            print(_STYLED.OK.format("All sessions cleared (memory and storage)"))
+            self.log_message("All sessions cleared")
+        except Exception as e:
+            print(_STYLED.WARN.format(f"Memory cleared, but storage clear failed: {e}"))
     
-    def save_session(self) -> None:
-        """Save current session state."""
+    
+    def _session_signature(self) -> Tuple:
+        """Cheap fingerprint of everything save_session writes, except the timestamp."""
+        history = self.command_history
+        return (
+            self.current_session_id,
+            self.current_project,
+            len(history),
+            history[-1] if history else None,
+            self.project_root,
+            self.theme,
+            self.show_timestamps,
+            self.auto_save
+        )
+    
+    def save_session(self, force: bool = False) -> None:
+        """Save current session state, skipping the write when nothing changed since the last one."""
         if self.session_cleared:
             return
+        
+        signature = self._session_signature()
+        if not force and signature == self._session_saved_sig:
+            return
             
         try:
             session_data = {
                 'session_id': self.current_session_id,
                 'timestamp': datetime.now().isoformat(),
                 'current_project': self.current_project,
-                'command_history': self.command_history[-100:],
+                'command_history': list(self.command_history),
                 'working_directory': str(self.project_root),
                 'settings': {
                     'theme': self.theme,
@@ -3562,12 +3980,45 @@ class RobustTerminalInterface:
             }
             
             session_file = self.data_dir / "sessions" / f"{self.current_session_id}.json"
-            with open(session_file, 'w', encoding='utf-8') as f:
-                json.dump(session_data, f, indent=2)
+            self._write_json_atomic(session_file, session_data, pretty=False)
+            self._session_saved_sig = signature
+            if self._session_index is not None:
+                # The file's own mtime, so the index agrees with a fresh directory scan
+                self._session_index[self.current_session_id] = session_file.stat().st_mtime_ns
                 
         except Exception as e:
             self.log_message(f"Session save error: {e}", "error")
     
+    def _wipe_sessions_dir(self) -> None:
+        """Delete every saved session file, keeping any unrelated files in place."""
+        sessions_dir = self.data_dir / "sessions"
+        if sessions_dir.exists():
+            with os.scandir(sessions_dir) as it:
+                entries = list(it)
+            if any(not (entry.name.endswith('.json') and entry.is_file()) for entry in entries):
+                for entry in entries:
+                    if entry.name.endswith('.json') and entry.is_file():
+                        os.unlink(entry.path)
+            else:
+                shutil.rmtree(sessions_dir, ignore_errors=True)
+                sessions_dir.mkdir(parents=True, exist_ok=True)
+        self._session_index = None
+        self._session_saved_sig = None
+    
+    def _get_session_index(self) -> Optional[Dict[str, int]]:
+        """Return saved session names mapped to mtime (ns), scanning the directory once."""
+        if self._session_index is None:
+            sessions_dir = self.data_dir / "sessions"
+            if not sessions_dir.exists():
+                return None
+            index = {}
+            with os.scandir(sessions_dir) as it:
+                for entry in it:
+                    if entry.name.endswith('.json') and entry.is_file():
+                        index[entry.name[:-5]] = entry.stat().st_mtime_ns
+            self._session_index = index
+        return self._session_index
+    
     def run_command(self, command: str) -> None:
         """Execute shell commands (alias for handle_run_command)."""
         self.handle_run_command(command)
@@ -3587,445 +4038,513 @@ class RobustTerminalInterface:
         print(f"\n{Colors.BLUE}Executing:{Colors.RESET} {Colors.BOLD}{command}{Colors.RESET}")
         
         try:
-            if command.startswith('cd '):
-                path = command[3:].strip()
-                try:
-                    if path == '..':
-                        new_path = self.project_root.parent
-                    elif path.startswith('/'):
-                        new_path = Path(path)
-                    else:
-                        new_path = self.project_root / path
-                    
-                    if new_path.exists() and new_path.is_dir():
-                        os.chdir(new_path)
-                        self.project_root = Path(os.getcwd())
-                        print(f"{Colors.GREEN}Changed directory to: {self.project_root}{Colors.RESET}")
-                    else:
-                        print(f"{Colors.RED}Directory not found: {path}{Colors.RESET}")
-                except Exception as e:
-                    print(f"{Colors.RED}Failed to change directory: {e}{Colors.RESET}")
+            # cd needs an argument; ls/dir/pwd/clear only count as builtins when bare
+            verb, _, rest = command.partition(' ')
+            builtin = self._run_builtins.get(verb)
+            if builtin is not None and (verb == 'cd') == bool(rest):
+                builtin(rest.strip())
                 return
             
-            elif command in ['ls', 'dir']:
-                print(f"\n{Colors.BOLD}Directory Contents:{Colors.RESET}")
-                try:
-                    for item in sorted(self.project_root.iterdir()):
-                        if item.is_dir():
-                            print(f"  [DIR] {Colors.BLUE}{item.name}/{Colors.RESET}")
-                        else:
-                            print(f"  [FILE] {item.name}")
-                except Exception as e:
-                    print(f"{Colors.RED}Failed to list directory: {e}{Colors.RESET}")
-                return
-            
-            elif command == 'pwd':
-                print(f"{Colors.GREEN}Current directory: {Colors.BOLD}{self.project_root}{Colors.RESET}")
-                return
-            
-            elif command == 'clear':
-                os.system('cls' if os.name == 'nt' else 'clear')
-                return
+            returncode, stdout_head, stderr_head = self._stream_command(command, timeout=30)
             
-            result = subprocess.run(
-                command,
-                shell=True,
-                capture_output=True,
-                text=True,
-                cwd=self.project_root,
-                timeout=30
-            )
-            
-            if result.stdout:
-                print(f"\n{Colors.GREEN}Output:{Colors.RESET}")
-                print(result.stdout)
-            
-            if result.stderr:
-                print(f"\n{Colors.RED}Errors:{Colors.RESET}")
-                print(result.stderr)
-            
-            if result.returncode == 0:
+            if returncode == 0:
                 print(f"\n{Colors.GREEN}Command completed successfully{Colors.RESET}")
-                self.log_message(f"System command executed successfully: {command} (exit: {result.returncode})", "system_command", auto_persist=True)
+                self.log_message(_RUN_LOG.OK.format(command, returncode), "system_command", auto_persist=True)
             else:
-                print(f"\n{Colors.RED}Command failed (exit code: {result.returncode}){Colors.RESET}")
-                self.log_message(f"System command failed: {command} (exit: {result.returncode})", "system_error", auto_persist=True)
+                print(f"\n{Colors.RED}Command failed (exit code: {returncode}){Colors.RESET}")
+                self.log_message(_RUN_LOG.FAIL.format(command, returncode), "system_error", auto_persist=True)
             
-            if result.stdout:
-                self.log_message(f"Command output: {result.stdout[:500]}...", "command_output", auto_persist=True)
-            if result.stderr:
-                self.log_message(f"Command error: {result.stderr[:500]}...", "command_error", auto_persist=True)
+            if stdout_head:
+                self.log_message(_RUN_LOG.OUTPUT.format(stdout_head.decode('utf-8', 'replace')), "command_output", auto_persist=True)
+            if stderr_head:
+                self.log_message(_RUN_LOG.ERROR.format(stderr_head.decode('utf-8', 'replace')), "command_error", auto_persist=True)
             
         except subprocess.TimeoutExpired:
             print(f"{Colors.RED}Command timed out after 30 seconds{Colors.RESET}")
-            self.log_message(f"System command timeout: {command}", "system_error", auto_persist=True)
+            self.log_message(_RUN_LOG.TIMEOUT.format(command), "system_error", auto_persist=True)
         except Exception as e:
             print(f"{Colors.RED}Command execution failed: {e}{Colors.RESET}")
-            self.log_message(f"System command exception: {command} - {e}", "system_error", auto_persist=True)
+            self.log_message(_RUN_LOG.EXCEPTION.format(command, e), "system_error", auto_persist=True)
+    
+    def _builtin_cd(self, path: str) -> None:
+        """Change the working directory in-process."""
+        try:
+            if path == '..':
+                new_path = self.project_root.parent
+            elif path.startswith('/'):
+                new_path = Path(path)
+            else:
+                new_path = self.project_root / path
+            
+            if new_path.exists() and new_path.is_dir():
+                os.chdir(new_path)
+                self.project_root = Path(os.getcwd())
+                print(f"{Colors.GREEN}Changed directory to: {self.project_root}{Colors.RESET}")
+            else:
+                print(f"{Colors.RED}Directory not found: {path}{Colors.RESET}")
+        except Exception as e:
+            print(f"{Colors.RED}Failed to change directory: {e}{Colors.RESET}")
+    
+    def _builtin_ls(self, _: str) -> None:
+        """List the working directory."""
+        print(f"\n{Colors.BOLD}Directory Contents:{Colors.RESET}")
+        try:
+            with os.scandir(self.project_root) as it:
+                entries = sorted(it, key=attrgetter('name'))
+            if entries:
+                self._emit([
+                    f"  [DIR] {Colors.BLUE}{entry.name}/{Colors.RESET}" if entry.is_dir() else f"  [FILE] {entry.name}"
+                    for entry in entries
+                ])
+        except Exception as e:
+            print(f"{Colors.RED}Failed to list directory: {e}{Colors.RESET}")
+    
+    def _builtin_pwd(self, _: str) -> None:
+        """Print the working directory."""
+        print(f"{Colors.GREEN}Current directory: {Colors.BOLD}{self.project_root}{Colors.RESET}")
+    
+    def _builtin_clear(self, _: str) -> None:
+        """Clear the screen."""
+        _clear_screen()
+    
+    def _stream_command(self, command: str, timeout: float = 30) -> Tuple[int, bytes, bytes]:
+        """Run a shell command, echoing its raw output live and keeping the first 500 bytes of each stream."""
+        proc = subprocess.Popen(
+            command,
+            shell=True,
+            stdin=subprocess.DEVNULL if self._stdin_detached else None,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            cwd=self.project_root,
+            bufsize=0,
+            # Own process group, so a timeout also reaches grandchildren holding the pipes
+            start_new_session=os.name != 'nt'
+        )
+        heads = {'stdout': bytearray(), 'stderr': bytearray()}
+        headers = {
+            'stdout': f"\n{Colors.GREEN}Output:{Colors.RESET}",
+            'stderr': f"\n{Colors.RED}Errors:{Colors.RESET}"
+        }
+        seen = set()
+        raw_out = getattr(sys.stdout, 'buffer', None)
+        live = sys.stdout.isatty()
+        
+        def emit(name: str, chunk: bytes) -> None:
+            if name not in seen:
+                seen.add(name)
+                print(headers[name])
+                sys.stdout.flush()
+            head = heads[name]
+            if len(head) < 500:
+                head += chunk[:500 - len(head)]
+            if raw_out is not None:
+                raw_out.write(chunk)
+                if live:
+                    raw_out.flush()
+            else:
+                sys.stdout.write(chunk.decode('utf-8', 'replace'))
+        
+        def kill() -> None:
+            if os.name == 'nt':
+                proc.kill()
+                return
+            try:
+                os.killpg(proc.pid, signal.SIGKILL)
+            except OSError:
+                pass
+        
+        timed_out = False
+        try:
+            if os.name == 'nt':
+                # select() only handles sockets on Windows
+                try:
+                    out, err = proc.communicate(timeout=timeout)
+                except subprocess.TimeoutExpired:
+                    timed_out = True
+                    kill()
+                    out, err = proc.communicate()
+                for name, data in (('stdout', out), ('stderr', err)):
+                    if data:
+                        emit(name, data)
+            else:
+                deadline = time.monotonic() + timeout
+                with selectors.DefaultSelector() as sel:
+                    sel.register(proc.stdout, selectors.EVENT_READ, 'stdout')
+                    sel.register(proc.stderr, selectors.EVENT_READ, 'stderr')
+                    open_streams = 2
+                    while open_streams:
+                        remaining = deadline - time.monotonic()
+                        events = sel.select(remaining) if remaining > 0 else []
+                        if not events:
+                            timed_out = True
+                            break
+                        for key, _ in events:
+                            chunk = os.read(key.fd, 1 << 16)
+                            if chunk:
+                                emit(key.data, chunk)
+                            else:
+                                sel.unregister(key.fileobj)
+                                open_streams -= 1
+                if not timed_out:
+                    try:
+                        proc.wait(max(0.0, deadline - time.monotonic()))
+                    except subprocess.TimeoutExpired:
+                        timed_out = True
+        finally:
+            # Timeout or Ctrl-C: take down the whole group, then drop the pipes
+            if timed_out or proc.poll() is None:
+                kill()
+            returncode = proc.wait()
+            proc.stdout.close()
+            proc.stderr.close()
+        
+        sys.stdout.flush()
+        if timed_out:
+            raise subprocess.TimeoutExpired(command, timeout)
+        return returncode, bytes(heads['stdout']), bytes(heads['stderr'])
     
     def handle_status_command(self) -> None:
         """Display comprehensive system status."""
-        print(f"\n{Colors.BOLD}System Status:{Colors.RESET}")
-        
-        print(f"\n{Colors.BLUE}Session:{Colors.RESET}")
-        print(f"  ID: {self.current_session_id}")
-        print(f"  Directory: {self.project_root}")
-        print(f"  Commands executed: {len(self.command_history)}")
+        out = [
+            f"\n{Colors.BOLD}System Status:{Colors.RESET}",
+            f"\n{Colors.BLUE}Session:{Colors.RESET}",
+            f"  ID: {self.current_session_id}",
+            f"  Directory: {self.project_root}",
+            f"  Commands executed: {len(self.command_history)}"
+        ]
         
         if self.current_project and self.current_project in self.projects:
             proj = self.projects[self.current_project]
-            print(f"\n{Colors.GREEN}Current Project:{Colors.RESET}")
-            print(f"  Name: {proj.name}")
-            print(f"  ID: {proj.id}")
-            print(f"  Tasks: {len([t for t in self.tasks.values() if t.project_id == self.current_project])}")
+            out.append(f"\n{Colors.GREEN}Current Project:{Colors.RESET}")
+            out.append(f"  Name: {proj.name}")
+            out.append(f"  ID: {proj.id}")
+            out.append(f"  Tasks: {sum(1 for t in self.tasks.values() if t.project_id == self.current_project)}")
         
-        print(f"\n{Colors.YELLOW}Statistics:{Colors.RESET}")
-        print(f"  Total projects: {len(self.projects)}")
-        print(f"  Total tasks: {len(self.tasks)}")
-        print(f"  Messages: {len(self.message_history)}")
+        out.append(f"\n{Colors.YELLOW}Statistics:{Colors.RESET}")
+        out.append(f"  Total projects: {len(self.projects)}")
+        out.append(f"  Total tasks: {len(self.tasks)}")
+        out.append(f"  Messages: {len(self.message_history)}")
         
         if self.tasks:
-            status_counts = {}
-            for task in self.tasks.values():
-                status = task.status.value
-                status_counts[status] = status_counts.get(status, 0) + 1
-            
-            print(f"\n{Colors.MAGENTA}Task Status:{Colors.RESET}")
-            for status, count in status_counts.items():
-                print(f"  {status}: {count}")
-        
-        print(f"\n{Colors.CYAN}System Health:{Colors.RESET}")
-        print(f"  Data directory: {'OK' if self.data_dir.exists() else 'FAIL'}")
-        print(f"  Auto-save: {'ON' if self.auto_save else 'OFF'}")
-        print(f"  Theme: {self.theme}")
+            status_counts = Counter(task.status.value for task in self.tasks.values())
+            out.append(f"\n{Colors.MAGENTA}Task Status:{Colors.RESET}")
+            out.extend(f"  {status}: {count}" for status, count in status_counts.items())
+        
+        out.append(f"\n{Colors.CYAN}System Health:{Colors.RESET}")
+        out.append(f"  Data directory: {'OK' if self.data_dir.exists() else 'FAIL'}")
+        out.append(f"  Auto-save: {'ON' if self.auto_save else 'OFF'}")
+        out.append(f"  Theme: {self.theme}")
+        self._emit(out)
     
     def handle_config_command(self, args: List[str]) -> None:
         """Handle configuration commands."""
         if not args:
-            print(f"{Colors.RED}Usage: config <show|set|reset|export|import|backup|restore> [key] [value]{Colors.RESET}")
+            print(_STYLED.FAIL.format("Usage: config <show|set|reset|export|import|backup|restore> [key] [value]"))
             return
             
         subcommand = args[0].lower()
         
-        if subcommand == 'show':
-            print(f"\n{Colors.CYAN}System Configuration{Colors.RESET}")
-            config_items = {
-                'theme': self.theme,
-                'show_timestamps': self.show_timestamps,
-                'auto_save': self.auto_save,
-                'token_limit': self.token_limit,
-                'auto_perform_on_start': self.auto_perform_on_start,
-                'verbose': self.verbose,
-                'assume_yes': self.assume_yes,
-                'max_batch_perform': self.max_batch_perform,
-                'data_directory': str(self.data_dir),
-                'current_project': self.current_project,
-                'session_cleared': self.session_cleared,
-                'running': self.running
-            }
-            for key, value in config_items.items():
-                status_color = Colors.GREEN if value else Colors.RED if isinstance(value, bool) else Colors.WHITE
-                print(f"   {key}: {status_color}{value}{Colors.RESET}")
-            print()
-            
-            if self.current_project and self.current_project in self.projects:
-                proj = self.projects[self.current_project]
-                if proj.settings:
-                    print(f"{Colors.CYAN}Project Settings ({proj.name}){Colors.RESET}")
-                    for key, value in proj.settings.items():
-                        print(f"   project.{key}: {value}")
-                    print()
-        elif subcommand == 'set' and len(args) >= 3:
-            key, value = args[1], args[2]
-            
-            if key.startswith('project.'):
-                if not self.current_project or self.current_project not in self.projects:
-                    print(f"{Colors.RED}No current project selected{Colors.RESET}")
-                    return
-                
-                proj_key = key[8:]
-                proj = self.projects[self.current_project]
-                if proj.settings is None:
-                    proj.settings = {}
-                proj.settings[proj_key] = value
-                print(f"{Colors.GREEN}Project setting '{proj_key}' set to: {value}{Colors.RESET}")
-                self.log_message(f"Project setting updated: {proj_key} = {value}")
+        handler = self._config_subcmds.get(subcommand)
+        if handler:
+            handler(args)
+        else:
+            self._config_usage()
+    
+    def _config_show(self, args: List[str]) -> None:
+        """Handle 'config show'."""
+        out = [f"\n{Colors.CYAN}System Configuration{Colors.RESET}"]
+        config_items = {
+            'theme': self.theme,
+            'show_timestamps': self.show_timestamps,
+            'auto_save': self.auto_save,
+            'token_limit': self.token_limit,
+            'auto_perform_on_start': self.auto_perform_on_start,
+            'verbose': self.verbose,
+            'assume_yes': self.assume_yes,
+            'max_batch_perform': self.max_batch_perform,
+            'data_directory': str(self.data_dir),
+            'current_project': self.current_project,
+            'session_cleared': self.session_cleared,
+            'running': self.running
+        }
+        for key, value in config_items.items():
+            status_color = Colors.GREEN if value else Colors.RED if isinstance(value, bool) else Colors.WHITE
+            out.append(f"   {key}: {status_color}{value}{Colors.RESET}")
+        out.append("")
+        
+        if self.current_project and self.current_project in self.projects:
+            proj = self.projects[self.current_project]
+            if proj.settings:
+                out.append(f"{Colors.CYAN}Project Settings ({proj.name}){Colors.RESET}")
+                out.extend(f"   project.{key}: {value}" for key, value in proj.settings.items())
+                out.append("")
+        self._emit(out)
+    
+    def _config_set(self, args: List[str]) -> None:
+        """Handle 'config set'."""
+        if len(args) < 3:
+            print(_STYLED.FAIL.format("Usage: config set <key> <value>"))
+            return
+        
+        key, value = args[1], args[2]
+        
+        if key.startswith('project.'):
+            if not self.current_project or self.current_project not in self.projects:
+                print(_STYLED.FAIL.format("No current project selected"))
                 return
             
-            if key == 'theme':
-                available_themes = ['dark', 'light', 'blue', 'green', 'matrix', 'ocean', 'default']
-                if value in available_themes:
-                    self.theme = value
-                    self.apply_theme(value)
-                    print(f"{Colors.GREEN}Theme set to: {value}{Colors.RESET}")
-                else:
-                    print(f"{Colors.RED}Invalid theme. Available: {', '.join(available_themes)}{Colors.RESET}")
-                    return
-            elif key == 'show_timestamps':
-                if value.lower() in ['true', '1', 'yes', 'on']:
-                    self.show_timestamps = True
-                    print(f"{Colors.GREEN}Timestamps enabled{Colors.RESET}")
-                elif value.lower() in ['false', '0', 'no', 'off']:
-                    self.show_timestamps = False
-                    print(f"{Colors.GREEN}Timestamps disabled{Colors.RESET}")
-                else:
-                    print(f"{Colors.RED}Invalid value. Use: true/false{Colors.RESET}")
-                    return
-            elif key == 'auto_save':
-                if value.lower() in ['true', '1', 'yes', 'on']:
-                    self.auto_save = True
-                    print(f"{Colors.GREEN}Auto-save enabled{Colors.RESET}")
-                elif value.lower() in ['false', '0', 'no', 'off']:
-                    self.auto_save = False
-                    print(f"{Colors.GREEN}Auto-save disabled{Colors.RESET}")
-                else:
-                    print(f"{Colors.RED}Invalid value. Use: true/false{Colors.RESET}")
-                    return
-            elif key == 'token_limit':
-                try:
-                    limit = int(value)
-                    if 1000 <= limit <= 10000:
-                        self.token_limit = limit
-                        print(f"{Colors.GREEN}Token limit set to: {limit}{Colors.RESET}")
-                    else:
-                        print(f"{Colors.RED}Token limit must be between 1000 and 10000{Colors.RESET}")
-                        return
-                except ValueError:
-                    print(f"{Colors.RED}Invalid number: {value}{Colors.RESET}")
-                    return
-            elif key == 'auto_perform_on_start':
-                if value.lower() in ['true', '1', 'yes', 'on']:
-                    self.auto_perform_on_start = True
-                    print(f"{Colors.GREEN}Auto-perform on start enabled{Colors.RESET}")
-                elif value.lower() in ['false', '0', 'no', 'off']:
-                    self.auto_perform_on_start = False
-                    print(f"{Colors.GREEN}Auto-perform on start disabled{Colors.RESET}")
-                else:
-                    print(f"{Colors.RED}Invalid value. Use: true/false{Colors.RESET}")
-                    return
-            elif key == 'verbose':
-                if value.lower() in ['true', '1', 'yes', 'on']:
-                    self.verbose = True
-                    print(f"{Colors.GREEN}Verbose logging enabled{Colors.RESET}")
-                elif value.lower() in ['false', '0', 'no', 'off']:
-                    self.verbose = False
-                    print(f"{Colors.GREEN}Verbose logging disabled{Colors.RESET}")
-                else:
-                    print(f"{Colors.RED}Invalid value. Use: true/false{Colors.RESET}")
-                    return
-            elif key == 'assume_yes':
-                if value.lower() in ['true', '1', 'yes', 'on']:
-                    self.assume_yes = True
-                    print(f"{Colors.GREEN}Assume-yes enabled{Colors.RESET}")
-                elif value.lower() in ['false', '0', 'no', 'off']:
-                    self.assume_yes = False
-                    print(f"{Colors.GREEN}Assume-yes disabled{Colors.RESET}")
-                else:
-                    print(f"{Colors.RED}Invalid value. Use: true/false{Colors.RESET}")
-                    return
-            elif key == 'max_batch_perform':
-                try:
-                    limit = int(value)
-                    if limit < 1:
-                        print(f"{Colors.RED}max_batch_perform must be >= 1{Colors.RESET}")
-                        return
-                    self.max_batch_perform = limit
-                    print(f"{Colors.GREEN}max_batch_perform set to: {limit}{Colors.RESET}")
-                except ValueError:
-                    print(f"{Colors.RED}Invalid number: {value}{Colors.RESET}")
-                    return
+            proj_key = key[8:]
+            proj = self.projects[self.current_project]
+            if proj.settings is None:
+                proj.settings = {}
+            proj.settings[proj_key] = value
+            proj._rev += 1
+            print(_STYLED.OK.format(f"Project setting '{proj_key}' set to: {value}"))
+            self.log_message(f"Project setting updated: {proj_key} = {value}")
+            return
+        
+        if key == 'theme':
+            if value in _THEMES:
+                self.theme = value
+                self.apply_theme(value)
+                print(_STYLED.OK.format(f"Theme set to: {value}"))
             else:
-                print(f"{Colors.RED}Unknown configuration key: {key}{Colors.RESET}")
-                print("Available keys: theme, show_timestamps, auto_save, token_limit, auto_perform_on_start, verbose, assume_yes, max_batch_perform")
-                print("Project keys: project.<key> (requires active project)")
+                print(_STYLED.FAIL.format(f"Invalid theme. Available: {_THEMES_STR}"))
                 return
-                
-            self.log_message(f"Configuration updated: {key} = {value}")
-        elif subcommand == 'reset':
-            if len(args) > 1 and args[1] == 'project':
-                if self.current_project and self.current_project in self.projects:
-                    self.projects[self.current_project].settings = {}
-                    print(f"{Colors.GREEN}Project settings reset{Colors.RESET}")
-                    self.log_message("Project settings reset")
+        elif key in _BOOL_KEYS:
+            flag = _parse_bool(value)
+            if flag is None:
+                print(_STYLED.FAIL.format("Invalid value. Use: true/false"))
+                return
+            attr, label = _BOOL_KEYS[key]
+            setattr(self, attr, flag)
+            print(_STYLED.OK.format(f"{label} {'enabled' if flag else 'disabled'}"))
+        elif key == 'token_limit':
+            try:
+                limit = int(value)
+                if 1000 <= limit <= 10000:
+                    self.token_limit = limit
+                    print(_STYLED.OK.format(f"Token limit set to: {limit}"))
                 else:
-                    print(f"{Colors.RED}No current project selected{Colors.RESET}")
-            else:
-                self.theme = 'default'
-                self.show_timestamps = True
-                self.auto_save = True
-                self.token_limit = 4000
-                self.session_cleared = False
-                self.apply_theme('default')
-                print(f"{Colors.GREEN}System configuration reset to defaults{Colors.RESET}")
-                self.log_message("System configuration reset to defaults")
-        
-        elif subcommand == 'export':
-            format_type = args[1].lower() if len(args) > 1 else "json"
-            
-            if format_type not in ["json", "xml", "txt", "csv"]:
-                print(f"{Colors.RED}Invalid format: {format_type}. Use: json, xml, txt, csv{Colors.RESET}")
+                    print(_STYLED.FAIL.format("Token limit must be between 1000 and 10000"))
+                    return
+            except ValueError:
+                print(_STYLED.FAIL.format(f"Invalid number: {value}"))
                 return
-            
-            export_file = self.data_dir / "exports" / f"config_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{format_type}"
-            export_file.parent.mkdir(exist_ok=True)
-            
+        elif key == 'max_batch_perform':
             try:
-                config_data = {
-                    'system': {
-                        'theme': self.theme,
-                        'show_timestamps': self.show_timestamps,
-                        'auto_save': self.auto_save,
-                        'token_limit': self.token_limit
-                    },
-                    'projects': {pid: proj.settings for pid, proj in self.projects.items() if proj.settings}
-                }
-                
-                if format_type == "json":
-                    with open(export_file, 'w', encoding='utf-8') as f:
-                        json.dump(config_data, f, indent=2)
-                        
-                elif format_type == "xml":
-                    with open(export_file, 'w', encoding='utf-8') as f:
-                        f.write("<?xml version='1.0' encoding='UTF-8'?>\n<configuration>\n")
-                        f.write("  <system>\n")
-                        for key, value in config_data['system'].items():
-                            f.write(f"    <{key}>{value}</{key}>\n")
-                        f.write("  </system>\n")
-                        if config_data['projects']:
-                            f.write("  <projects>\n")
-                            for pid, settings in config_data['projects'].items():
-                                f.write(f"    <project id='{pid}'>\n")
-                                for key, value in settings.items():
-                                    f.write(f"      <{key}>{value}</{key}>\n")
-                                f.write(f"    </project>\n")
-                            f.write("  </projects>\n")
-                        f.write("</configuration>\n")
-                        
-                elif format_type == "txt":
-                    with open(export_file, 'w', encoding='utf-8') as f:
-                        f.write("CONFIGURATION EXPORT\n")
-                        f.write("=" * 50 + "\n\n")
-                        f.write("SYSTEM SETTINGS:\n")
-                        f.write("-" * 20 + "\n")
-                        for key, value in config_data['system'].items():
-                            f.write(f"{key}: {value}\n")
-                        f.write("\n")
-                        if config_data['projects']:
-                            f.write("PROJECT SETTINGS:\n")
-                            f.write("-" * 20 + "\n")
-                            for pid, settings in config_data['projects'].items():
-                                f.write(f"Project {pid}:\n")
-                                for key, value in settings.items():
-                                    f.write(f"  {key}: {value}\n")
-                                f.write("\n")
-                                
-                elif format_type == "csv":
-                    with open(export_file, 'w', encoding='utf-8') as f:
-                        f.write("Type,Key,Value,Project\n")
-                        for key, value in config_data['system'].items():
-                            f.write(f"system,{key},{value},\n")
-                        for pid, settings in config_data['projects'].items():
-                            for key, value in settings.items():
-                                f.write(f"project,{key},{value},{pid}\n")
-                
-                print(f"{Colors.GREEN}Configuration exported to: {export_file}{Colors.RESET}")
-                self.log_message(f"Configuration exported to {export_file}")
-            except Exception as e:
-                print(f"{Colors.RED}Export failed: {e}{Colors.RESET}")
-        
-        elif subcommand == 'import' and len(args) > 1:
-            import_file = Path(args[1])
-            if not import_file.exists():
-                print(f"{Colors.RED}Import file not found: {import_file}{Colors.RESET}")
+                limit = int(value)
+                if limit < 1:
+                    print(_STYLED.FAIL.format("max_batch_perform must be >= 1"))
+                    return
+                self.max_batch_perform = limit
+                print(_STYLED.OK.format(f"max_batch_perform set to: {limit}"))
+            except ValueError:
+                print(_STYLED.FAIL.format(f"Invalid number: {value}"))
                 return
+        else:
+            print(_STYLED.FAIL.format(f"Unknown configuration key: {key}"))
+            print("Available keys: theme, show_timestamps, auto_save, token_limit, auto_perform_on_start, verbose, assume_yes, max_batch_perform")
+            print("Project keys: project.<key> (requires active project)")
+            return
             
-            try:
-                with open(import_file, 'r', encoding='utf-8') as f:
-                    config_data = json.load(f)
-                
-                if 'system' in config_data:
-                    sys_config = config_data['system']
-                    self.theme = sys_config.get('theme', self.theme)
-                    self.show_timestamps = sys_config.get('show_timestamps', self.show_timestamps)
-                    self.auto_save = sys_config.get('auto_save', self.auto_save)
-                    self.token_limit = sys_config.get('token_limit', self.token_limit)
-                    self.apply_theme(self.theme)
-                
-                if 'projects' in config_data:
-                    for pid, settings in config_data['projects'].items():
-                        if pid in self.projects:
-                            self.projects[pid].settings = settings
-                
-                print(f"{Colors.GREEN}Configuration imported from: {import_file}{Colors.RESET}")
-                self.log_message(f"Configuration imported from {import_file}")
-            except Exception as e:
-                print(f"{Colors.RED}Import failed: {e}{Colors.RESET}")
+        self.log_message(f"Configuration updated: {key} = {value}")
+    
+    def _config_reset(self, args: List[str]) -> None:
+        """Handle 'config reset'."""
+        if len(args) > 1 and args[1] == 'project':
+            if self.current_project and self.current_project in self.projects:
+                self.projects[self.current_project].settings = {}
+                print(_STYLED.OK.format("Project settings reset"))
+                self.log_message("Project settings reset")
+            else:
+                print(_STYLED.FAIL.format("No current project selected"))
+        else:
+            self.theme = 'default'
+            self.show_timestamps = True
+            self.auto_save = True
+            self.token_limit = 4000
+            self.session_cleared = False
+            self.apply_theme('default')
+            print(_STYLED.OK.format("System configuration reset to defaults"))
+            self.log_message("System configuration reset to defaults")
+    
+    def _config_export(self, args: List[str]) -> None:
+        """Handle 'config export'."""
+        pretty = '--pretty' in args
+        args = [arg for arg in args if arg != '--pretty']
+        format_type = args[1].lower() if len(args) > 1 else "json"
+        
+        if format_type not in _EXPORT_FORMATS:
+            print(_STYLED.FAIL.format(f"Invalid format: {format_type}. Use: json, xml, txt, csv"))
+            return
+        
+        export_file = self.data_dir / "exports" / f"config_export_{_ts_filename(int(time.time()))}.{format_type}"
+        export_file.parent.mkdir(exist_ok=True)
         
-        elif subcommand == 'backup':
-            backup_file = self.data_dir / "backups" / f"config_backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-            backup_file.parent.mkdir(exist_ok=True)
+        try:
+            config_data = {
+                'system': {
+                    'theme': self.theme,
+                    'show_timestamps': self.show_timestamps,
+                    'auto_save': self.auto_save,
+                    'token_limit': self.token_limit
+                },
+                'projects': {pid: proj.settings for pid, proj in self.projects.items() if proj.settings}
+            }
             
-            try:
-                backup_data = {
-                    'timestamp': datetime.now().isoformat(),
-                    'system': {
-                        'theme': self.theme,
-                        'show_timestamps': self.show_timestamps,
-                        'auto_save': self.auto_save,
-                        'token_limit': self.token_limit
-                    },
-                    'projects': {pid: asdict(proj) for pid, proj in self.projects.items()}
-                }
-                
-                with open(backup_file, 'w', encoding='utf-8') as f:
-                    json.dump(backup_data, f, indent=2)
-                print(f"{Colors.GREEN}Configuration backed up to: {backup_file}{Colors.RESET}")
-                self.log_message(f"Configuration backed up to {backup_file}")
-            except Exception as e:
-                print(f"{Colors.RED}Backup failed: {e}{Colors.RESET}")
+            if format_type == "json":
+                with open(export_file, 'w', encoding='utf-8', buffering=1 << 17) as f:
+                    f.write((_JSON_PRETTY if pretty else _JSON_COMPACT).encode(config_data))
+                    
+            elif format_type == "xml":
+                root = ET.Element('configuration')
+                system_node = ET.SubElement(root, 'system')
+                for key, value in config_data['system'].items():
+                    ET.SubElement(system_node, key).text = str(value)
+                if config_data['projects']:
+                    projects_node = ET.SubElement(root, 'projects')
+                    for pid, settings in config_data['projects'].items():
+                        project_node = ET.SubElement(projects_node, 'project', id=pid)
+                        for key, value in settings.items():
+                            ET.SubElement(project_node, str(key)).text = str(value)
+                ET.ElementTree(root).write(export_file, encoding='utf-8', xml_declaration=True)
+                    
+            elif format_type == "txt":
+                parts = ["CONFIGURATION EXPORT\n", "=" * 50 + "\n\n", "SYSTEM SETTINGS:\n", "-" * 20 + "\n"]
+                for key, value in config_data['system'].items():
+                    parts.append(f"{key}: {value}\n")
+                parts.append("\n")
+                if config_data['projects']:
+                    parts.append("PROJECT SETTINGS:\n")
+                    parts.append("-" * 20 + "\n")
+                    for pid, settings in config_data['projects'].items():
+                        parts.append(f"Project {pid}:\n")
+                        for key, value in settings.items():
+                            parts.append(f"  {key}: {value}\n")
+                        parts.append("\n")
+                with open(export_file, 'w', encoding='utf-8') as f:
+                    f.write("".join(parts))
+                            
+            elif format_type == "csv":
+                rows = [("system", key, value, "") for key, value in config_data['system'].items()]
+                for pid, settings in config_data['projects'].items():
+                    rows.extend(("project", key, value, pid) for key, value in settings.items())
+                with open(export_file, 'w', encoding='utf-8', newline='') as f:
+                    writer = csv.writer(f, lineterminator='\n')
+                    writer.writerow(("Type", "Key", "Value", "Project"))
+                    writer.writerows(rows)
+            
+            print(_STYLED.OK.format(f"Configuration exported to: {export_file}"))
+            self.log_message(f"Configuration exported to {export_file}")
+        except Exception as e:
+            print(_STYLED.FAIL.format(f"Export failed: {e}"))
+    
+    def _config_import(self, args: List[str]) -> None:
+        """Handle 'config import'."""
+        if len(args) < 2:
+            print(_STYLED.FAIL.format("Usage: config import <file>"))
+            return
         
-        elif subcommand == 'restore' and len(args) > 1:
-            restore_file = Path(args[1])
-            if not restore_file.exists():
-                print(f"{Colors.RED}Restore file not found: {restore_file}{Colors.RESET}")
-                return
+        import_file = Path(args[1])
+        if not import_file.exists():
+            print(_STYLED.FAIL.format(f"Import file not found: {import_file}"))
+            return
+        
+        try:
+            config_data = _load_json_file(import_file)
+            
+            if 'system' in config_data:
+                sys_config = config_data['system']
+                self.theme = sys_config.get('theme', self.theme)
+                self.show_timestamps = sys_config.get('show_timestamps', self.show_timestamps)
+                self.auto_save = sys_config.get('auto_save', self.auto_save)
+                self.token_limit = sys_config.get('token_limit', self.token_limit)
+                self.apply_theme(self.theme)
+            
+            if 'projects' in config_data:
+                for pid, settings in config_data['projects'].items():
+                    if pid in self.projects:
+                        self.projects[pid].settings = settings
+            
+            print(_STYLED.OK.format(f"Configuration imported from: {import_file}"))
+            self.log_message(f"Configuration imported from {import_file}")
+        except Exception as e:
+            print(_STYLED.FAIL.format(f"Import failed: {e}"))
+    
+    def _config_backup(self, args: List[str]) -> None:
+        """Handle 'config backup'."""
+        pretty = '--pretty' in args
+        backup_file = self.data_dir / "backups" / f"config_backup_{_ts_filename(int(time.time()))}.json"
+        backup_file.parent.mkdir(exist_ok=True)
+        
+        try:
+            backup_data = {
+                'timestamp': datetime.now().isoformat(),
+                'system': {
+                    'theme': self.theme,
+                    'show_timestamps': self.show_timestamps,
+                    'auto_save': self.auto_save,
+                    'token_limit': self.token_limit
+                },
+                'projects': self._project_dicts()
+            }
             
-            try:
-                with open(restore_file, 'r', encoding='utf-8') as f:
-                    backup_data = json.load(f)
-                
-                if 'system' in backup_data:
-                    sys_config = backup_data['system']
-                    self.theme = sys_config.get('theme', 'default')
-                    self.show_timestamps = sys_config.get('show_timestamps', True)
-                    self.auto_save = sys_config.get('auto_save', True)
-                    self.token_limit = sys_config.get('token_limit', 4000)
-                    self.apply_theme(self.theme)
-                
-                if 'projects' in backup_data:
-                    for pid, proj_data in backup_data['projects'].items():
-                        self.projects[pid] = Project(**proj_data)
-                
-                print(f"{Colors.GREEN}Configuration restored from: {restore_file}{Colors.RESET}")
-                self.log_message(f"Configuration restored from {restore_file}")
-            except Exception as e:
-                print(f"{Colors.RED}Restore failed: {e}{Colors.RESET}")
+            with open(backup_file, 'w', encoding='utf-8', buffering=1 << 17) as f:
+                f.write((_JSON_PRETTY if pretty else _JSON_COMPACT).encode(backup_data))
+            print(_STYLED.OK.format(f"Configuration backed up to: {backup_file}"))
+            self.log_message(f"Configuration backed up to {backup_file}")
+        except Exception as e:
+            print(_STYLED.FAIL.format(f"Backup failed: {e}"))
+    
+    def _config_restore(self, args: List[str]) -> None:
+        """Handle 'config restore'."""
+        if len(args) < 2:
+            print(_STYLED.FAIL.format("Usage: config restore <file>"))
+            return
         
-        else:
-            print(f"{Colors.RED}Usage: config <show|set|reset|export|import|backup|restore> [key] [value]{Colors.RESET}")
-            print("Available actions:")
-            print("  show                    - Show current configuration")
-            print("  set <key> <value>       - Set configuration value")
-            print("  reset [project]         - Reset to defaults")
-            print("  export                  - Export configuration")
-            print("  import <file>           - Import configuration")
-            print("  backup                  - Create configuration backup")
-            print("  restore <file>          - Restore from backup")
+        restore_file = Path(args[1])
+        if not restore_file.exists():
+            print(_STYLED.FAIL.format(f"Restore file not found: {restore_file}"))
+            return
+        
+        try:
+            backup_data = _load_json_file(restore_file)
+            
+            if 'system' in backup_data:
+                sys_config = backup_data['system']
+                self.theme = sys_config.get('theme', 'default')
+                self.show_timestamps = sys_config.get('show_timestamps', True)
+                self.auto_save = sys_config.get('auto_save', True)
+                self.token_limit = sys_config.get('token_limit', 4000)
+                self.apply_theme(self.theme)
+            
+            if 'projects' in backup_data:
+                for pid, proj_data in backup_data['projects'].items():
+                    self.projects[pid] = _from_dict(Project, proj_data)
+                self._reindex_projects()
+            
+            print(_STYLED.OK.format(f"Configuration restored from: {restore_file}"))
+            self.log_message(f"Configuration restored from {restore_file}")
+        except Exception as e:
+            print(_STYLED.FAIL.format(f"Restore failed: {e}"))
+    
+    def _config_usage(self) -> None:
+        """Print the config subcommand summary."""
+        print(_STYLED.FAIL.format("Usage: config <show|set|reset|export|import|backup|restore> [key] [value]"))
+        print("Available actions:")
+        print("  show                    - Show current configuration")
+        print("  set <key> <value>       - Set configuration value")
+        print("  reset [project]         - Reset to defaults")
+        print("  export [format] [--pretty] - Export configuration")
+        print("  import <file>           - Import configuration")
+        print("  backup [--pretty]       - Create configuration backup")
+        print("  restore <file>          - Restore from backup")
     
     def handle_backup_command(self, args: List[str]) -> None:
         """Handle backup operations."""
         if not args:
-            print(f"{Colors.RED}Usage: backup <create|restore|list|clear> [name]{Colors.RESET}")
+            print(_STYLED.FAIL.format("Usage: backup <create|restore|list|clear> [name]"))
             return
             
         subcommand = args[0].lower()
@@ -4037,19 +4556,23 @@ class RobustTerminalInterface:
         elif subcommand == 'list':
             backup_dir = self.data_dir / 'backups'
             try:
-                backups = list(backup_dir.glob('*.json'))
+                try:
+                    with os.scandir(backup_dir) as it:
+                        backups = [(entry.name[:-5], entry.stat()) for entry in it if entry.name.endswith('.json')]
+                except FileNotFoundError:
+                    backups = []
                 if backups:
-                    print(f"\n{Colors.CYAN}Available Backups{Colors.RESET}")
-                    for backup in sorted(backups, key=lambda f: f.stat().st_mtime, reverse=True):
-                        backup_name = backup.stem
-                        modified = datetime.fromtimestamp(backup.stat().st_mtime)
-                        size = backup.stat().st_size
-                        print(f"   {backup_name} - {modified.strftime('%Y-%m-%d %H:%M:%S')} ({size} bytes)")
-                    print()
+                    backups.sort(key=lambda item: item[1].st_mtime, reverse=True)
+                    out = [f"\n{Colors.CYAN}Available Backups{Colors.RESET}"]
+                    for backup_name, st in backups:
+                        modified = datetime.fromtimestamp(st.st_mtime)
+                        out.append(f"   {backup_name} - {modified.strftime('%Y-%m-%d %H:%M:%S')} ({st.st_size} bytes)")
+                    out.append("")
+                    self._emit(out)
                 else:
-                    print(f"{Colors.YELLOW}No backups found{Colors.RESET}")
+                    print(_STYLED.WARN.format("No backups found"))
             except Exception as e:
-                print(f"{Colors.RED}Failed to list backups: {e}{Colors.RESET}")
+                print(_STYLED.FAIL.format(f"Failed to list backups: {e}"))
                 
         elif subcommand == 'restore' and len(args) > 1:
             backup_name = args[1]
@@ -4058,16 +4581,15 @@ class RobustTerminalInterface:
         elif subcommand == 'clear':
             backup_dir = self.data_dir / 'backups'
             if backup_dir.exists():
-                import shutil
                 shutil.rmtree(backup_dir)
                 backup_dir.mkdir(exist_ok=True)
-                print(f"{Colors.GREEN}All backups cleared{Colors.RESET}")
+                print(_STYLED.OK.format("All backups cleared"))
                 self.log_message("Cleared all backups")
             else:
-                print(f"{Colors.YELLOW}No backups directory found{Colors.RESET}")
+                print(_STYLED.WARN.format("No backups directory found"))
                 
         else:
-            print(f"{Colors.RED}Usage: backup <create|restore|list|clear> [name]{Colors.RESET}")
+            print(_STYLED.FAIL.format("Usage: backup <create|restore|list|clear> [name]"))
     
     def create_backup(self, backup_name: str) -> None:
         """Create a backup of current session data."""
@@ -4076,11 +4598,12 @@ class RobustTerminalInterface:
             backup_dir.mkdir(exist_ok=True)
             backup_path = backup_dir / f"{backup_name}.json"
             
+            # Dataclasses go to the encoder as-is; messages are streamed one at a time
             backup_data = {
                 'timestamp': datetime.now().isoformat(),
-                'projects': {pid: asdict(proj) for pid, proj in self.projects.items()},
-                'tasks': {tid: asdict(task) for tid, task in self.tasks.items()},
-                'messages': [asdict(msg) for msg in self.message_history],
+                'projects': self.projects,
+                'tasks': self.tasks,
+                'messages': iter(self.message_history),
                 'current_project': self.current_project,
                 'session_id': self.current_session_id,
                 'settings': {
@@ -4091,14 +4614,14 @@ class RobustTerminalInterface:
                 }
             }
             
-            with open(backup_path, 'w', encoding='utf-8') as f:
-                json.dump(backup_data, f, indent=2)
+            with open(backup_path, 'wb', buffering=1 << 17) as f:
+                _write_json_streamed(f, backup_data)
             
-            print(f"{Colors.GREEN}Backup '{backup_name}' created successfully{Colors.RESET}")
+            print(_STYLED.OK.format(f"Backup '{backup_name}' created successfully"))
             self.log_message(f"Backup created: {backup_name}")
             
         except Exception as e:
-            print(f"{Colors.RED}Error creating backup: {e}{Colors.RESET}")
+            print(_STYLED.FAIL.format(f"Error creating backup: {e}"))
     
     def restore_backup(self, backup_name: str) -> None:
         """Restore session data from a backup."""
@@ -4106,19 +4629,23 @@ class RobustTerminalInterface:
             backup_dir = self.data_dir / 'backups'
             backup_path = backup_dir / f"{backup_name}.json"
             
-            if not backup_path.exists():
-                print(f"{Colors.RED}Backup '{backup_name}' not found{Colors.RESET}")
+            try:
+                backup_data = _load_json_file(backup_path)
+            except FileNotFoundError:
+                print(_STYLED.FAIL.format(f"Backup '{backup_name}' not found"))
                 return
             
-            with open(backup_path, 'r', encoding='utf-8') as f:
-                backup_data = json.load(f)
-            
             if 'projects' in backup_data:
-                self.projects = {pid: Project(**pdata) for pid, pdata in backup_data['projects'].items()}
+                self.projects = {pid: _from_dict(Project, pdata) for pid, pdata in backup_data['projects'].items()}
+                self._reindex_projects()
             if 'tasks' in backup_data:
-                self.tasks = {tid: Task(**tdata) for tid, tdata in backup_data['tasks'].items()}
+                self.tasks = {}
+                for tid, tdata in backup_data['tasks'].items():
+                    if isinstance(tdata.get('status'), str):
+                        tdata['status'] = TaskStatus(tdata['status'])
+                    self.tasks[tid] = _from_dict(Task, tdata)
             if 'messages' in backup_data:
-                self.message_history = [Message(**mdata) for mdata in backup_data['messages']]
+                self.message_history = deque((_from_dict(Message, mdata) for mdata in backup_data['messages']), maxlen=self.max_message_history)
             if 'current_project' in backup_data:
                 self.current_project = backup_data['current_project']
             if 'settings' in backup_data:
@@ -4130,7 +4657,7 @@ class RobustTerminalInterface:
             
             self.apply_theme(self.theme)
             
-            print(f"{Colors.GREEN}Backup '{backup_name}' restored successfully{Colors.RESET}")
+            print(_STYLED.OK.format(f"Backup '{backup_name}' restored successfully"))
             print(f"  Restored {len(self.message_history)} messages")
             print(f"  Theme: {self.theme}")
             print(f"  Backup date: {backup_data.get('timestamp', 'Unknown')}")
@@ -4138,15 +4665,14 @@ class RobustTerminalInterface:
             self.log_message(f"Backup restored: {backup_name}")
             
         except Exception as e:
-            print(f"{Colors.RED}Error restoring backup: {e}{Colors.RESET}")
+            print(_STYLED.FAIL.format(f"Error restoring backup: {e}"))
     
     def handle_performance_command(self) -> None:
         """Display performance metrics."""
         print(f"\n{Colors.CYAN}Performance Metrics{Colors.RESET}")
         
-        try:
-            import psutil
-            cpu_percent = psutil.cpu_percent(interval=1)
+        if psutil is not None:
+            cpu_percent = psutil.cpu_percent(interval=None)
             memory = psutil.virtual_memory()
             disk = psutil.disk_usage('.')
             
@@ -4160,7 +4686,7 @@ class RobustTerminalInterface:
             except:
                 print("   Network: Information unavailable")
                 
-        except ImportError:
+        else:
             print(f"   System metrics not available (install psutil)")
         
         completed_tasks = len([t for t in self.tasks.values() if t.status == TaskStatus.COMPLETED])
@@ -4172,80 +4698,43 @@ class RobustTerminalInterface:
         print(f"   Total Messages: {len(self.message_history)}")
         print(f"   Command History: {len(self.command_history)}")
         
-        import sys
-        total_size = sys.getsizeof(self.projects) + sys.getsizeof(self.tasks) + sys.getsizeof(self.message_history)
+        total_size = (
+            len(self.projects) * _APPROX_PROJECT_BYTES
+            + len(self.tasks) * _APPROX_TASK_BYTES
+            + len(self.message_history) * _APPROX_MESSAGE_BYTES
+        )
         print(f"   Data Size: ~{total_size / 1024:.1f} KB")
         print()
     
     def handle_theme_command(self, args: List[str]) -> None:
         """Handle theme changes with real terminal color updates."""
         if not args:
-            print(f"{Colors.RED}Usage: theme <dark|light|blue|green|matrix|ocean>{Colors.RESET}")
+            print(_STYLED.FAIL.format(_THEMES_USAGE))
             return
             
         theme_name = args[0].lower()
-        available_themes = ['dark', 'light', 'blue', 'green', 'matrix', 'ocean', 'default']
         
-        if theme_name in available_themes:
+        if theme_name in _THEMES:
             self.theme = theme_name
             self.apply_theme(theme_name)
-            print(f"{Colors.GREEN}Theme changed to: {theme_name}{Colors.RESET}")
+            print(_STYLED.OK.format(f"Theme changed to: {theme_name}"))
             self.log_message(f"Theme changed to: {theme_name}")
         else:
-            print(f"{Colors.RED}Unknown theme: {theme_name}{Colors.RESET}")
-            print(f"   Available themes: {', '.join(available_themes)}")
+            print(_STYLED.FAIL.format(f"Unknown theme: {theme_name}"))
+            print(f"   Available themes: {_THEMES_STR}")
     
     def apply_theme(self, theme_name: str) -> None:
         """Apply theme colors to the actual terminal."""
-        import os
-        
-        theme_configs = {
-            'dark': {
-                'bg': '\033]11;#1e1e1e\007',
-                'fg': '\033]10;#d4d4d4\007',
-                'cursor': '\033]12;#ffffff\007'
-            },
-            'light': {
-                'bg': '\033]11;#ffffff\007',
-                'fg': '\033]10;#000000\007',
-                'cursor': '\033]12;#000000\007'
-            },
-            'blue': {
-                'bg': '\033]11;#0f1419\007',
-                'fg': '\033]10;#bfbdb6\007',
-                'cursor': '\033]12;#00d4ff\007'
-            },
-            'green': {
-                'bg': '\033]11;#0d1117\007',
-                'fg': '\033]10;#c9d1d9\007',
-                'cursor': '\033]12;#00ff00\007'
-            },
-            'matrix': {
-                'bg': '\033]11;#000000\007',
-                'fg': '\033]10;#00ff00\007',
-                'cursor': '\033]12;#00ff00\007'
-            },
-            'ocean': {
-                'bg': '\033]11;#001122\007',
-                'fg': '\033]10;#88ccff\007',
-                'cursor': '\033]12;#00aaff\007'
-            },
-            'default': {
-                'bg': '\033]11;#000000\007',
-                'fg': '\033]10;#ffffff\007',
-                'cursor': '\033]12;#ffffff\007'
-            }
-        }
-        
-        if theme_name in theme_configs:
-            config = theme_configs[theme_name]
+        osc = _THEME_OSC.get(theme_name)
+        if osc is not None:
+            self._help_cache = None
+            self._prompt_banner = None
             
             try:
-                print(config['bg'], end='', flush=True)
-                print(config['fg'], end='', flush=True)
-                print(config['cursor'], end='', flush=True)
+                sys.stdout.write(osc)
+                sys.stdout.flush()
                 
-                os.system('cls' if os.name == 'nt' else 'clear')
+                _clear_screen()
                 self.display_header()
                 
                 print(f"{Colors.CYAN}{theme_name.title()} theme applied to terminal{Colors.RESET}")
@@ -4258,8 +4747,8 @@ class RobustTerminalInterface:
         try:
             current_state = {
                 'current_project': self.current_project,
-                'projects': {pid: asdict(proj) for pid, proj in self.projects.items()},
-                'tasks': {tid: asdict(task) for tid, task in self.tasks.items()},
+                'projects': {pid: _clone_project(proj) for pid, proj in self.projects.items()},
+                'tasks': {tid: _clone_task(task) for tid, task in self.tasks.items()},
                 'theme': self.theme,
                 'show_timestamps': self.show_timestamps,
                 'auto_save': self.auto_save,
@@ -4268,22 +4757,19 @@ class RobustTerminalInterface:
             }
             
             self.state_history.append(current_state)
-            
-            if len(self.state_history) > self.max_history_size:
-                self.state_history.pop(0)
                 
         except Exception as e:
-            print(f"{Colors.YELLOW}Warning: Could not save state for back command: {e}{Colors.RESET}")
+            print(_STYLED.WARN.format(f"Warning: Could not save state for back command: {e}"))
     
     def handle_back_command(self, args: List[str]) -> None:
         """Handle back command to restore previous state."""
         if not args:
             if not self.state_history:
-                print(f"{Colors.YELLOW}No previous states available{Colors.RESET}")
+                print(_STYLED.WARN.format("No previous states available"))
                 return
             
             print(f"\n{Colors.BOLD}Available Previous States:{Colors.RESET}")
-            for i, state in enumerate(reversed(self.state_history[-5:]), 1):
+            for i, state in enumerate(islice(reversed(self.state_history), 5), 1):
                 timestamp = state.get('timestamp', 'Unknown')
                 project = state.get('current_project', 'None')
                 task_count = len(state.get('tasks', {}))
@@ -4304,13 +4790,11 @@ class RobustTerminalInterface:
                     
                     self.current_project = state.get('current_project')
                     
-                    self.projects = {}
-                    for pid, proj_data in state.get('projects', {}).items():
-                        self.projects[pid] = Project(**proj_data)
+                    # Hand out fresh copies so the snapshot survives later edits
+                    self.projects = {pid: _clone_project(proj) for pid, proj in state.get('projects', {}).items()}
+                    self._reindex_projects()
                     
-                    self.tasks = {}
-                    for tid, task_data in state.get('tasks', {}).items():
-                        self.tasks[tid] = Task(**task_data)
+                    self.tasks = {tid: _clone_task(task) for tid, task in state.get('tasks', {}).items()}
                     
                     self.theme = state.get('theme', 'default')
                     self.show_timestamps = state.get('show_timestamps', True)
@@ -4319,17 +4803,17 @@ class RobustTerminalInterface:
                     
                     self.apply_theme(self.theme)
                     
-                    print(f"{Colors.GREEN}State restored from {state.get('timestamp', 'unknown time')}{Colors.RESET}")
+                    print(_STYLED.OK.format(f"State restored from {state.get('timestamp', 'unknown time')}"))
                     self.log_message(f"State restored from backup {index + 1}")
                     
                 else:
-                    print(f"{Colors.RED}Invalid state number. Use 1-{len(self.state_history)}{Colors.RESET}")
+                    print(_STYLED.FAIL.format(f"Invalid state number. Use 1-{len(self.state_history)}"))
             except ValueError:
-                print(f"{Colors.RED}Invalid number format{Colors.RESET}")
+                print(_STYLED.FAIL.format("Invalid number format"))
         
         elif subcommand == "clear":
             self.state_history.clear()
-            print(f"{Colors.GREEN}State history cleared{Colors.RESET}")
+            print(_STYLED.OK.format("State history cleared"))
             
         elif subcommand.isdigit():
             try:
@@ -4337,12 +4821,12 @@ class RobustTerminalInterface:
                 if 0 <= index < len(self.state_history):
                     self.handle_back_command(['restore', str(index + 1)])
                 else:
-                    print(f"{Colors.RED}Invalid state number. Use 1-{len(self.state_history)}{Colors.RESET}")
+                    print(_STYLED.FAIL.format(f"Invalid state number. Use 1-{len(self.state_history)}"))
             except ValueError:
-                print(f"{Colors.RED}Invalid number format{Colors.RESET}")
+                print(_STYLED.FAIL.format("Invalid number format"))
         
         else:
-            print(f"{Colors.RED}Usage: back [list|restore <number>|clear|<number>]{Colors.RESET}")
+            print(_STYLED.FAIL.format("Usage: back [list|restore <number>|clear|<number>]"))
     
     def handle_file_operation(self, file_path: str) -> None:
         """Handle file operations using @path/to/file syntax."""
@@ -4350,68 +4834,77 @@ class RobustTerminalInterface:
             clean_path = file_path[1:].strip()
             
             if not clean_path:
-                print(f"{Colors.RED}Error: No file path provided{Colors.RESET}")
+                print(_STYLED.FAIL.format("Error: No file path provided"))
                 print(f"Usage: @path/to/file")
                 return
             
             if not os.path.isabs(clean_path):
                 clean_path = os.path.abspath(clean_path)
             
-            if os.path.exists(clean_path):
-                if os.path.isfile(clean_path):
-                    file_size = os.path.getsize(clean_path)
-                    file_modified = os.path.getmtime(clean_path)
+            try:
+                st = os.stat(clean_path)
+            except FileNotFoundError:
+                st = None
+            
+            if st is not None:
+                if stat.S_ISREG(st.st_mode):
+                    file_size = st.st_size
+                    file_modified = st.st_mtime
                     modified_time = datetime.fromtimestamp(file_modified).strftime('%Y-%m-%d %H:%M:%S')
                     
                     print(f"\n{Colors.BOLD}📁 File Operations: {Colors.CYAN}{clean_path}{Colors.RESET}")
                     print(f"   Size: {file_size} bytes | Modified: {modified_time}")
                     
                     try:
-                        with open(clean_path, 'r', encoding='utf-8') as f:
-                            lines = f.readlines()[:10]
+                        with open(clean_path, 'r', encoding='utf-8', buffering=1 << 13) as f:
+                            lines = list(islice(f, 10))
                             print(f"\n{Colors.DIM}Content preview (first 10 lines):{Colors.RESET}")
                             for i, line in enumerate(lines, 1):
                                 print(f"{Colors.DIM}{i:2}: {line.rstrip()}{Colors.RESET}")
                             if len(lines) == 10:
                                 print(f"{Colors.DIM}... (file continues){Colors.RESET}")
                     except UnicodeDecodeError:
-                        print(f"{Colors.YELLOW}Binary file - content preview not available{Colors.RESET}")
+                        print(_STYLED.WARN.format("Binary file - content preview not available"))
                     
                     print(f"\n{Colors.GREEN}✓ File accessible for operations{Colors.RESET}")
                     
-                elif os.path.isdir(clean_path):
+                elif stat.S_ISDIR(st.st_mode):
                     print(f"\n{Colors.BOLD}📂 Directory: {Colors.CYAN}{clean_path}{Colors.RESET}")
                     try:
-                        items = os.listdir(clean_path)
+                        with os.scandir(clean_path) as it:
+                            items = list(it)
                         if items:
                             print(f"Contents ({len(items)} items):")
-                            for item in sorted(items)[:20]:
-                                item_path = os.path.join(clean_path, item)
-                                if os.path.isdir(item_path):
-                                    print(f"  📂 {item}/")
+                            for item in heapq.nsmallest(20, items, key=attrgetter('name')):
+                                if item.is_dir():
+                                    print(f"  📂 {item.name}/")
                                 else:
-                                    print(f"  📄 {item}")
+                                    print(f"  📄 {item.name}")
                             if len(items) > 20:
                                 print(f"  {Colors.DIM}... and {len(items) - 20} more items{Colors.RESET}")
                         else:
                             print(f"{Colors.DIM}Directory is empty{Colors.RESET}")
                     except PermissionError:
-                        print(f"{Colors.RED}Permission denied accessing directory{Colors.RESET}")
+                        print(_STYLED.FAIL.format("Permission denied accessing directory"))
             else:
-                print(f"{Colors.YELLOW}File/directory does not exist: {clean_path}{Colors.RESET}")
+                print(_STYLED.WARN.format(f"File/directory does not exist: {clean_path}"))
                 print(f"You can create it using standard commands or your editor")
                 
         except Exception as e:
-            print(f"{Colors.RED}File operation error: {e}{Colors.RESET}")
+            print(_STYLED.FAIL.format(f"File operation error: {e}"))
     
     def _load_remembered(self) -> Dict[str, Any]:
-        """Load remembered instructions from disk."""
+        """Load remembered instructions from disk, reusing the last parse while the file is unchanged."""
         try:
-            if self.remember_file.exists():
-                with open(self.remember_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    if isinstance(data, dict):
-                        return data
+            st = os.stat(self.remember_file)
+            cached = self._remembered_cache
+            if cached is not None and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+                # Shared with the previous caller; every mutating caller saves it back
+                return cached[2]
+            data = _load_json_file(self.remember_file)
+            if isinstance(data, dict):
+                self._remembered_cache = (st.st_mtime_ns, st.st_size, data)
+                return data
         except Exception:
             pass
         return {"last": None, "history": []}
@@ -4420,14 +4913,18 @@ class RobustTerminalInterface:
         """Persist remembered instructions and export a plain-text copy for AI editors."""
         try:
             self.memory_dir.mkdir(parents=True, exist_ok=True)
-            with open(self.remember_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            self._remembered_cache = None
+            self._write_json_atomic(self.remember_file, data)
+            st = os.stat(self.remember_file)
+            self._remembered_cache = (st.st_mtime_ns, st.st_size, data)
             # Export a light-weight file any AI editor can pick up
             self.exports_dir.mkdir(parents=True, exist_ok=True)
             last_text = (data.get("last") or {}).get("text", "")
             export_txt = self.exports_dir / "remember_last.txt"
-            with open(export_txt, 'w', encoding='utf-8') as f:
-                f.write(last_text)
+            if last_text != self._remember_exported or not export_txt.exists():
+                with open(export_txt, 'w', encoding='utf-8') as f:
+                    f.write(last_text)
+                self._remember_exported = last_text
             # Emit editor signal
             self._emit_editor_signal('remember_updated', {"last_preview": last_text[:120]})
         except Exception as e:
@@ -4444,15 +4941,41 @@ class RobustTerminalInterface:
                 "timestamp": datetime.now().isoformat(),
                 "payload": payload or {}
             }
-            with open(signal_path, 'w', encoding='utf-8') as f:
-                json.dump(signal, f, indent=2, ensure_ascii=False)
+            if self._pending_signals is not None:
+                self._pending_signals.append(signal)
+                return
+            self._write_json_atomic(signal_path, signal)
             # Append to events stream
-            with open(self.editor_events_file, 'a', encoding='utf-8') as f:
-                f.write(json.dumps(signal, ensure_ascii=False) + "\n")
+            self._append_editor_event(_json_bytes(signal, pretty=False) + b"\n")
             self.vprint(f"Emitted editor signal: {event} v{self._editor_signal_version}")
         except Exception:
             pass
     
+    def _flush_editor_signals(self) -> None:
+        """Write signals buffered during a batch: one events append, one signal file replace."""
+        pending, self._pending_signals = self._pending_signals, None
+        if not pending:
+            return
+        try:
+            self._write_json_atomic(self.exports_dir / "editor_signal.json", pending[-1])
+            self._append_editor_event(b"".join(_json_bytes(sig, pretty=False) + b"\n" for sig in pending))
+            self.vprint(f"Emitted {len(pending)} editor signals up to v{pending[-1]['version']}")
+        except Exception:
+            pass
+    
+    def _append_editor_event(self, line: bytes) -> None:
+        """Append one line to the editor events log through a cached O_APPEND descriptor."""
+        if self._editor_events_fd is None:
+            flags = os.O_WRONLY | os.O_APPEND | os.O_CREAT | getattr(os, 'O_BINARY', 0)
+            self._editor_events_fd = os.open(self.editor_events_file, flags, 0o644)
+        os.write(self._editor_events_fd, line)
+    
+    def _close_editor_events(self) -> None:
+        """Drop the cached events descriptor so the next event reopens the file."""
+        if self._editor_events_fd is not None:
+            os.close(self._editor_events_fd)
+            self._editor_events_fd = None
+    
     def handle_remember_command(self, args: List[str]) -> None:
         """Store user intent/instructions for later automatic execution or sharing."""
         # Subcommands: clear | list | remove <n> | purge executed | (no args -> perform all) | text
@@ -4460,9 +4983,9 @@ class RobustTerminalInterface:
             try:
                 data = {"last": None, "history": []}
                 self._save_remembered(data)
-                print(f"{Colors.GREEN}Remembered instructions cleared{Colors.RESET}")
+                print(_STYLED.OK.format("Remembered instructions cleared"))
             except Exception as e:
-                print(f"{Colors.RED}Failed to clear remembered instructions: {e}{Colors.RESET}")
+                print(_STYLED.FAIL.format(f"Failed to clear remembered instructions: {e}"))
             return
         if args and args[0].lower() == 'list':
             data = self._load_remembered()
@@ -4490,9 +5013,9 @@ class RobustTerminalInterface:
                     data['last'] = history[-1] if history else None
                 data['history'] = history
                 self._save_remembered(data)
-                print(f"{Colors.GREEN}Removed entry {n}{Colors.RESET}")
+                print(_STYLED.OK.format(f"Removed entry {n}"))
             else:
-                print(f"{Colors.YELLOW}Index out of range. Use 1..{len(history)}{Colors.RESET}")
+                print(_STYLED.WARN.format(f"Index out of range. Use 1..{len(history)}"))
             return
         if args and args[0].lower() == 'purge' and len(args) > 1 and args[1].lower() == 'executed':
             data = self._load_remembered()
@@ -4502,7 +5025,7 @@ class RobustTerminalInterface:
             if data.get('last') and data['last'].get('executed'):
                 data['last'] = filtered[-1] if filtered else None
             self._save_remembered(data)
-            print(f"{Colors.GREEN}Purged executed entries{Colors.RESET}")
+            print(_STYLED.OK.format("Purged executed entries"))
             return
         
         if not args:
@@ -4510,51 +5033,21 @@ class RobustTerminalInterface:
             data = self._load_remembered()
             history = data.get("history", [])
             if not history:
-                print(f"{Colors.YELLOW}No remembered entries to perform.{Colors.RESET}")
+                print(_STYLED.WARN.format("No remembered entries to perform."))
                 return
             pending = [e for e in history if not e.get('executed')]
             batch_count = len(pending)
             if batch_count > self.max_batch_perform and not self.assume_yes:
-                print(f"{Colors.YELLOW}Batch of {batch_count} exceeds max_batch_perform={self.max_batch_perform}. Set `config set max_batch_perform <n>` or `config set assume_yes on` to proceed.{Colors.RESET}")
+                print(_STYLED.WARN.format(f"Batch of {batch_count} exceeds max_batch_perform={self.max_batch_perform}. Set `config set max_batch_perform <n>` or `config set assume_yes on` to proceed."))
                 return
             print(f"{Colors.BLUE}Performing {batch_count} pending remembered entries...{Colors.RESET}")
-            for entry in pending:
-                text = (entry.get("text") or "").strip()
-                if not text:
-                    continue
-                route = 'chat'
-                status = 'ok'
-                try:
-                    # Temporarily set last and call perform
-                    orig = data.get("last")
-                    data["last"] = entry
-                    self._save_remembered(data)
-                    # Determine if command or chat
-                    known_prefixes = [
-                        'project', 'task', 'message', 'session', 'chat', 'run', 'status', 'config',
-                        'backup', 'performance', 'theme', 'clear', 'back', 'ls', 'dir', 'pwd', 'cd', '@'
-                    ]
-                    if any(text.startswith(p) for p in known_prefixes):
-                        route = 'command'
-                    self.handle_perform_command()
-                    # restore last
-                    data["last"] = orig
-                    # mark executed
-                    entry['executed'] = True
-                    entry['executed_at'] = datetime.now().isoformat()
-                    entry['result'] = {'route': route, 'status': status}
-                    self._save_remembered(data)
-                except Exception as e:
-                    entry['executed'] = True
-                    entry['executed_at'] = datetime.now().isoformat()
-                    entry['result'] = {'route': route, 'status': f'error: {e}'}
-                    self._save_remembered(data)
-            print(f"{Colors.GREEN}Completed performing pending entries.{Colors.RESET}")
+            self._perform_entries(data, pending)
+            print(_STYLED.OK.format("Completed performing pending entries."))
             return
         
         text = ' '.join(args).strip()
         if not text:
-            print(f"{Colors.YELLOW}Please provide instruction text to remember{Colors.RESET}")
+            print(_STYLED.WARN.format("Please provide instruction text to remember"))
             return
         data = self._load_remembered()
         timestamp = datetime.now().isoformat()
@@ -4578,25 +5071,42 @@ class RobustTerminalInterface:
             pass
         print(f"{Colors.GREEN}Remembered instruction.{Colors.RESET} Exported to {self.exports_dir / 'remember_last.txt'}")
     
-    def handle_perform_command(self) -> None:
-        """Auto-execute the last remembered instruction if it is a command."""
+    def _perform_entries(self, data: Dict[str, Any], entries: List[Dict[str, Any]]) -> None:
+        """Perform remembered entries in order, saving flags and editor signals once at the end."""
+        self._pending_signals = []
+        try:
+            for entry in entries:
+                text = (entry.get("text") or "").strip()
+                if not text:
+                    continue
+                route = 'command' if text.startswith(_KNOWN_COMMAND_PREFIXES) else 'chat'
+                status = 'ok'
+                try:
+                    self.handle_perform_command(entry)
+                except Exception as e:
+                    status = f'error: {e}'
+                entry['executed'] = True
+                entry['executed_at'] = datetime.now().isoformat()
+                # A fresh dict per entry: results are persisted and must not alias each other
+                entry['result'] = {'route': route, 'status': status}
+        finally:
+            self._save_remembered(data)
+            self._flush_editor_signals()
+    
+    def handle_perform_command(self, entry: Optional[Dict[str, Any]] = None) -> None:
+        """Auto-execute a remembered instruction (the last one by default) if it is a command."""
         # Support 'perform clear' by checking previous parsed args? Implement separate router in process_command.
-        data = self._load_remembered()
-        last = data.get("last")
+        last = entry if entry is not None else self._load_remembered().get("last")
         if not last or not last.get("text"):
-            print(f"{Colors.YELLOW}No remembered instruction found. Use 'remember <text>' first.{Colors.RESET}")
+            print(_STYLED.WARN.format("No remembered instruction found. Use 'remember <text>' first."))
             return
         text = last["text"].strip()
         # Heuristic: if it starts with a known command keyword or '@', route to command processor
-        known_prefixes = [
-            'project', 'task', 'message', 'session', 'chat', 'run', 'status', 'config',
-            'backup', 'performance', 'theme', 'clear', 'back', 'ls', 'dir', 'pwd', 'cd', '@'
-        ]
-        if any(text.startswith(p) for p in known_prefixes):
+        if text.startswith(_KNOWN_COMMAND_PREFIXES):
             print(f"{Colors.BLUE}Performing remembered command:{Colors.RESET} {Colors.BOLD}{text}{Colors.RESET}")
             # Avoid infinite recursion if 'perform' itself was remembered
             if text.split()[0].lower() == 'perform':
-                print(f"{Colors.YELLOW}Refusing to recursively perform 'perform'. Update remembered text first.{Colors.RESET}")
+                print(_STYLED.WARN.format("Refusing to recursively perform 'perform'. Update remembered text first."))
                 return
             self.process_command(text)
             return
@@ -4605,9 +5115,9 @@ class RobustTerminalInterface:
             if hasattr(self, 'chat'):
                 self.chat.add_message("user", text, metadata={"auto_perform": True})
             self.log_message(f"Auto-performed remembered text to chat: {text}", "user_to_ai")
-            print(f"{Colors.GREEN}Pushed remembered text to chat/messages for AI editor.{Colors.RESET}")
+            print(_STYLED.OK.format("Pushed remembered text to chat/messages for AI editor."))
         except Exception as e:
-            print(f"{Colors.YELLOW}Performed storage only (chat push failed): {e}{Colors.RESET}")
+            print(_STYLED.WARN.format(f"Performed storage only (chat push failed): {e}"))
     
     def process_command(self, user_input: str) -> None:
         """Process and route user commands with guaranteed persistence."""
@@ -4620,106 +5130,33 @@ class RobustTerminalInterface:
         
         self.log_message(f"Command executed: {user_input}", "command", auto_persist=True)
         
-        # Try registry first
-        if self.command_registry.get(command):
-            try:
-                self.command_registry[command](args)
-                return
-            except Exception as e:
-                print(f"{Colors.RED}Command error: {e}{Colors.RESET}")
-                self.log_message(f"Command error: {command} - {e}", "error")
-                return
-        
+        handler = self.command_registry.get(command)
         try:
-            if command in ['exit', 'quit', 'q']:
-                print(f"\n{Colors.YELLOW}Saving session and exiting...{Colors.RESET}")
-                if self.auto_save:
-                    self.save_persistent_data()
-                self.running = False
-                
-            elif command == 'help':
-                self.display_help()
-                
-            elif command == 'project':
-                self.handle_project_command(args)
-                
-            elif command == 'task':
-                self.handle_task_command(args)
-                
-            elif command == 'message':
-                self.handle_message_command(args)
-                
-            elif command == 'session':
-                self.handle_session_command(args)
-
-            elif command == 'chat':
-                self.handle_chat_command(args)
-                
-            elif command == 'run':
-                cmd_to_run = ' '.join(args)
-                self.handle_run_command(cmd_to_run)
-                
-            elif command == 'ai':
-                self.handle_ai_command(args)
-                
-            elif command == 'status':
-                self.handle_status_command()
-                
-            elif command == 'config':
-                self.handle_config_command(args)
-                
-            elif command == 'backup':
-                self.handle_backup_command(args)
-                
-            elif command == 'performance':
-                self.handle_performance_command()
-                
-            elif command == 'theme':
-                self.handle_theme_command(args)
-                
-            elif command == 'remember':
-                self.handle_remember_command(args)
-                
-            elif command == 'perform':
-                # Support `perform clear` to wipe last only
-                if args and args[0].lower() == 'clear':
-                    try:
-                        data = self._load_remembered()
-                        data['last'] = None
-                        self._save_remembered(data)
-                        print(f"{Colors.GREEN}Cleared last remembered entry{Colors.RESET}")
-                    except Exception as e:
-                        print(f"{Colors.RED}Failed to clear last remembered: {e}{Colors.RESET}")
-                else:
-                    self.handle_perform_command()
-                
-            elif command == 'memory':
-                self.handle_memory_command(args)
-                
-            elif command == 'clear':
-                if args and args[0].lower() == 'all':
-                    self._handle_clear_all_command()
-                else:
-                    os.system('cls' if os.name == 'nt' else 'clear')
-                    self.display_header()
-                
-            elif command == 'back':
-                self.handle_back_command(args)
-                
-            elif command in ['ls', 'dir', 'pwd'] or command.startswith('cd'):
+            if command == 'run':
+                # Hand the rest of the line to the shell exactly as typed (quotes, spacing)
+                self.handle_run_command(user_input.strip()[len(parts[0]):].lstrip())
+            elif handler is not None:
+                handler(args)
+            elif command in _SHELL_PASSTHROUGH or command.startswith('cd'):
                 self.handle_run_command(user_input)
-                
             elif user_input.startswith('@'):
                 self.handle_file_operation(user_input)
-                
             else:
                 print(f"{Colors.RED}Unknown command: '{command}'{Colors.RESET}")
                 print(f"   Type '{Colors.BOLD}help{Colors.RESET}' for available commands")
-                
+        except _PromptDeclined:
+            raise
         except Exception as e:
             print(f"{Colors.RED}Command error: {e}{Colors.RESET}")
             self.log_message(f"Command error: {command} - {e}", "error")
     
+    def _handle_exit_command(self, args: List[str]) -> None:
+        """Handle 'exit' / 'quit' / 'q'."""
+        print(f"\n{Colors.YELLOW}Saving session and exiting...{Colors.RESET}")
+        if self.auto_save:
+            self.save_persistent_data()
+        self.running = False
+    
     def handle_memory_command(self, args: List[str]) -> None:
         """Handle memory-related operations like clear."""
         if not args or args[0].lower() not in ['clear', 'status']:
@@ -4735,13 +5172,7 @@ class RobustTerminalInterface:
                 errors.append(f"remembered: {e}")
             # Clear memory snapshots (.terminal_data/memory/*) but keep directory
             try:
-                if self.memory_dir.exists():
-                    for fp in self.memory_dir.glob('*'):
-                        if fp.is_file():
-                            try:
-                                fp.unlink()
-                            except Exception:
-                                pass
+                _unlink_files(self.memory_dir, ignore_errors=True)
             except Exception as e:
                 errors.append(f"snapshots: {e}")
             # Clear context manager persistent file if available
@@ -4759,7 +5190,7 @@ class RobustTerminalInterface:
             data = self._load_remembered()
             history = data.get('history', [])
             total = len(history)
-            executed = len([e for e in history if e.get('executed')])
+            executed = sum(1 for e in history if e.get('executed'))
             pending = total - executed
             last_text = (data.get('last') or {}).get('text')
             print(f"Remembered: total={total}, executed={executed}, pending={pending}")
@@ -4773,83 +5204,33 @@ class RobustTerminalInterface:
     
     def run(self) -> None:
         """Main interactive loop with enhanced error handling."""
+        _configure_stdout()
         try:
             self.display_header()
             # Auto-perform on start if enabled
             if self.auto_perform_on_start:
                 self.vprint("auto_perform_on_start is enabled; performing all remembered entries")
+                # Keystrokes typed meanwhile stay queued in the tty for the first prompt
+                self._stdin_detached = True
                 try:
                     self.handle_remember_command([])
                 except Exception as e:
                     self.vprint(f"Auto-perform failed: {e}")
+                finally:
+                    self._stdin_detached = False
             
             while self.running:
                 try:
-                    gradient_top = Colors.PRIMARY_GRADIENT_TOP
-                    gradient_mid = Colors.PRIMARY_GRADIENT_MID
-                    gradient_bot = Colors.PRIMARY_GRADIENT_BOT
-                    accent_gold = Colors.ACCENT_GOLD
-                    accent_silver = Colors.ACCENT_SILVER
-                    neon_cyan = Colors.NEON_CYAN
-                    deep_purple = Colors.DEEP_PURPLE
-                    
-                    print(f"\n\n{gradient_bot}╔{'═'*100}╗{Colors.RESET}")
-                    cmd_header_content = f" {accent_gold}▓{Colors.RESET} {Colors.BOLD}💬 COMMAND INTERFACE{Colors.RESET}"
-                    cmd_header_display_len = get_display_length(cmd_header_content)
-                    cmd_header_spacing = max(1, 98 - cmd_header_display_len - 2)
-                    print(f"{gradient_bot}║{Colors.RESET}{cmd_header_content}{' '*cmd_header_spacing} {accent_gold}▓{Colors.RESET}")
-                    print(f"{gradient_bot}╠{'═'*100}╣{Colors.RESET}")
-                    
-                    cmd_desc_content = f" {Colors.DIM}{neon_cyan}▶{Colors.RESET} {Colors.DIM}Enter your command, message, or file operation below{Colors.RESET}"
-                    cmd_desc_display_len = get_display_length(cmd_desc_content)
-                    cmd_desc_spacing = max(1, 98 - cmd_desc_display_len)
-                    print(f"{gradient_bot}║{Colors.RESET}{cmd_desc_content}")
-                    print(f"{gradient_bot}║{Colors.RESET} {' '*98}")
-                    
-                    core_commands = f" 🎯 {accent_silver}Core:{Colors.RESET} {Colors.DIM}project, task, ai config, ai chat, help, status{Colors.RESET}"
-                    print(f"{gradient_bot}║{Colors.RESET}{core_commands}")
-                    
-                    file_ops = f" 📁 {accent_silver}File ops:{Colors.RESET} {Colors.DIM}@path/to/file for direct file operations{Colors.RESET}"
-                    print(f"{gradient_bot}║{Colors.RESET}{file_ops}")
-                    
-                    navigation = f" 🧭 {accent_silver}Navigation:{Colors.RESET} {Colors.DIM}ls, cd, pwd for directory operations{Colors.RESET}"
-                    print(f"{gradient_bot}║{Colors.RESET}{navigation}")
-                    
-                    advanced = f" ⚙️ {accent_silver}Advanced:{Colors.RESET} {Colors.DIM}config, backup, performance, theme{Colors.RESET}"
-                    print(f"{gradient_bot}║{Colors.RESET}{advanced}")
-                    
-                    memory_line = f" 🧠 {accent_silver}Memory:{Colors.RESET} {Colors.DIM}remember, perform, chat clear, remember clear, memory clear{Colors.RESET}"
-                    print(f"{gradient_bot}║{Colors.RESET}{memory_line}")
-                    
-                    print(f"{gradient_bot}║{Colors.RESET} {' '*98}")
-                    
-                    print(f"{gradient_bot}║{Colors.RESET} {' '*98}")
-                    
-                    tip_content = f" {Colors.DIM}{accent_gold}💡 Tip:{Colors.RESET} {Colors.DIM}Use 'remember' (no args) to perform all saved entries{Colors.RESET}"
-                    tip_display_len = get_display_length(tip_content)
-                    tip_spacing = max(1, 98 - tip_display_len)
-                    print(f"{gradient_bot}║{Colors.RESET}{tip_content}")
-                    print(f"{gradient_bot}╚{'═'*100}╝{Colors.RESET}")
-                    
-                    print(f"\n{gradient_mid}╔{'═'*100}╗{Colors.RESET}")
-                    
-                    input_header_content = f" {accent_gold}▓{Colors.RESET} {Colors.BOLD}⚡ INPUT PROMPT{Colors.RESET}"
-                    input_header_display_len = get_display_length(input_header_content)
-                    input_header_spacing = max(1, 98 - input_header_display_len - 2)
-                    print(f"{gradient_mid}║{Colors.RESET}{input_header_content}{' '*input_header_spacing} {accent_gold}▓{Colors.RESET}")
-                    print(f"{gradient_mid}╠{'═'*100}╣{Colors.RESET}")
-                    
-                    input_desc_content = f" {Colors.DIM}Enter your command, message, or file operation below:{Colors.RESET}"
-                    input_desc_display_len = get_display_length(input_desc_content)
-                    input_desc_spacing = max(1, 98 - input_desc_display_len)
-                    print(f"{gradient_mid}║{Colors.RESET}{input_desc_content}")
-                    print(f"{gradient_mid}║{Colors.RESET} {' '*98}")
-                    print(f"{gradient_mid}║{Colors.RESET} {deep_purple}❯{Colors.RESET} ", end="")
+                    self.flush_pending_saves()
+                    if self._prompt_banner is None:
+                        self._prompt_banner = self._render_prompt_banner()
+                    banner, footer = self._prompt_banner
+                    sys.stdout.write(banner)
+                    sys.stdout.flush()
                     
                     user_input = input("").strip()
                     
-                    print(f"{gradient_mid}║{Colors.RESET} {' '*98}")
-                    print(f"{gradient_mid}╚{'═'*100}╝{Colors.RESET}")
+                    sys.stdout.write(footer)
                     
                     if user_input:
                         self.process_command(user_input)
@@ -4877,34 +5258,181 @@ class RobustTerminalInterface:
             except Exception as e:
                 print(f"\n{Colors.RED}Error saving data on exit: {e}{Colors.RESET}")
     
+    def _render_prompt_banner(self) -> Tuple[str, str]:
+        """Build the REPL prompt box once: text before input() and the closing lines after it."""
+        gradient_mid = Colors.PRIMARY_GRADIENT_MID
+        gradient_bot = Colors.PRIMARY_GRADIENT_BOT
+        accent_gold = Colors.ACCENT_GOLD
+        accent_silver = Colors.ACCENT_SILVER
+        neon_cyan = Colors.NEON_CYAN
+        deep_purple = Colors.DEEP_PURPLE
+        reset = Colors.RESET
+        bold = Colors.BOLD
+        dim = Colors.DIM
+        row = f"{gradient_bot}║{reset}"
+        blank = f"{row} {' '*98}"
+        
+        cmd_header_content = f" {accent_gold}▓{reset} {bold}💬 COMMAND INTERFACE{reset}"
+        cmd_header_spacing = max(1, 98 - get_display_length(cmd_header_content) - 2)
+        input_header_content = f" {accent_gold}▓{reset} {bold}⚡ INPUT PROMPT{reset}"
+        input_header_spacing = max(1, 98 - get_display_length(input_header_content) - 2)
+        
+        lines = [
+            f"\n\n{gradient_bot}╔{_H100}╗{reset}",
+            f"{row}{cmd_header_content}{' '*cmd_header_spacing} {accent_gold}▓{reset}",
+            f"{gradient_bot}╠{_H100}╣{reset}",
+            f"{row} {dim}{neon_cyan}▶{reset} {dim}Enter your command, message, or file operation below{reset}",
+            blank,
+            f"{row} 🎯 {accent_silver}Core:{reset} {dim}project, task, ai config, ai chat, help, status{reset}",
+            f"{row} 📁 {accent_silver}File ops:{reset} {dim}@path/to/file for direct file operations{reset}",
+            f"{row} 🧭 {accent_silver}Navigation:{reset} {dim}ls, cd, pwd for directory operations{reset}",
+            f"{row} ⚙️ {accent_silver}Advanced:{reset} {dim}config, backup, performance, theme{reset}",
+            f"{row} 🧠 {accent_silver}Memory:{reset} {dim}remember, perform, chat clear, remember clear, memory clear{reset}",
+            blank,
+            blank,
+            f"{row} {dim}{accent_gold}💡 Tip:{reset} {dim}Use 'remember' (no args) to perform all saved entries{reset}",
+            f"{gradient_bot}╚{_H100}╝{reset}",
+            f"\n{gradient_mid}╔{_H100}╗{reset}",
+            f"{gradient_mid}║{reset}{input_header_content}{' '*input_header_spacing} {accent_gold}▓{reset}",
+            f"{gradient_mid}╠{_H100}╣{reset}",
+            f"{gradient_mid}║{reset} {dim}Enter your command, message, or file operation below:{reset}",
+            f"{gradient_mid}║{reset} {' '*98}",
+            f"{gradient_mid}║{reset} {deep_purple}❯{reset} ",
+        ]
+        footer = f"{gradient_mid}║{reset} {' '*98}\n{gradient_mid}╚{_H100}╝{reset}\n"
+        return "\n".join(lines), footer
+    
+    def serve_daemon(self) -> None:
+        """Serve one-shot command lines from `--send` clients until an exit command arrives."""
+        from multiprocessing.connection import Listener
+        address = fzx_client.daemon_address()
+        self.data_dir.mkdir(parents=True, exist_ok=True)
+        if os.name != 'nt':
+            try:
+                os.unlink(address)
+            except FileNotFoundError:
+                pass
+        authkey = secrets.token_bytes(32)
+        key_flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0)
+        with os.fdopen(os.open(fzx_client.daemon_key_file(), key_flags, 0o600), 'wb') as f:
+            f.write(authkey)
+        listener = Listener(address, authkey=authkey)
+        try:
+            if os.name != 'nt':
+                os.chmod(address, 0o600)
+            print(_STYLED.OK.format(f"FZX daemon listening on {address}"))
+            while self.running:
+                try:
+                    conn = listener.accept()
+                except KeyboardInterrupt:
+                    break
+                except Exception as e:
+                    # Failed handshake (wrong key, client gone); keep serving
+                    self.vprint(f"Daemon connection rejected: {e}")
+                    continue
+                with conn:
+                    try:
+                        command = conn.recv_bytes().decode('utf-8')
+                    except (EOFError, OSError):
+                        continue
+                    conn.send_bytes(self._run_captured(command))
+        finally:
+            listener.close()
+            self.save_persistent_data()
+    
+    def _run_captured(self, command: str) -> bytes:
+        """Run one command line as the REPL would, returning everything it printed."""
+        buf = io.BytesIO()
+        out = io.TextIOWrapper(buf, encoding='utf-8', errors='replace', newline='')
+        # Nobody is at the daemon's terminal: confirmation prompts read EOF (i.e. "no")
+        # and shell commands get no stdin, so a command can never stall the accept loop
+        real_stdin, sys.stdin = sys.stdin, _NoStdin()
+        self._stdin_detached = True
+        try:
+            with redirect_stdout(_ThreadStdout(out, sys.stdout)):
+                try:
+                    self.process_command(command)
+                except _PromptDeclined as e:
+                    print(_STYLED.WARN.format(f"Command cancelled: {e}"))
+                if self.auto_save:
+                    self.save_persistent_data()
+                else:
+                    self.flush_pending_saves()
+        finally:
+            sys.stdin = real_stdin
+            self._stdin_detached = False
+            out.flush()
+        return buf.getvalue()
+    
+    def _run_async(self, coro: Any) -> Any:
+        """Run a coroutine on the interface's long-lived event loop (created on first use)."""
+        loop = self._async_loop
+        if loop is None:
+            loop = self._async_loop = _new_event_loop()
+            atexit.register(self._close_async_loop)
+        task = loop.create_task(coro)
+        try:
+            return loop.run_until_complete(task)
+        except KeyboardInterrupt:
+            # Do not leave a half-finished request pending on the shared loop
+            task.cancel()
+            with suppress(BaseException):
+                loop.run_until_complete(task)
+            raise
+    
+    def _close_async_loop(self) -> None:
+        """Close the AI HTTP session and async generators, then the shared event loop."""
+        loop, self._async_loop = self._async_loop, None
+        if loop is not None and not loop.is_closed():
+            if self._ai_manager is not None:
+                with suppress(Exception):
+                    loop.run_until_complete(self._ai_manager.close())
+            with suppress(Exception):
+                loop.run_until_complete(loop.shutdown_asyncgens())
+            loop.close()
+    
     def vprint(self, text: str) -> None:
         if self.verbose:
             print(f"{Colors.DIM}[verbose]{Colors.RESET} {text}")
 
+    @property
+    def ai_manager(self):
+        """AI service manager, built on first use so non-AI commands skip importing it."""
+        if not self._ai_manager_loaded:
+            self._ai_manager_loaded = True
+            module = _ai_service()
+            if module is not None:
+                try:
+                    self._ai_manager = module.get_ai_manager()
+                except Exception as e:
+                    self.log_message(f"Warning: AI service initialization failed: {e}", "warning")
+        return self._ai_manager
+    
     def _register_commands(self) -> None:
-        """Register core commands to a simple registry for future auto-routing/help."""
-        try:
-            self.command_registry = {
-                'project': self.handle_project_command,
-                'task': self.handle_task_command,
-                'message': self.handle_message_command,
-                'session': self.handle_session_command,
-                'chat': self.handle_chat_command,
-                'run': lambda args: self.handle_run_command(' '.join(args)),
-                'status': lambda args: self.handle_status_command(),
-                'config': self.handle_config_command,
-                'backup': self.handle_backup_command,
-                'performance': lambda args: self.handle_performance_command(),
-                'theme': self.handle_theme_command,
-                'remember': self.handle_remember_command,
-                'perform': lambda args: self._route_perform(args),
-                'memory': self.handle_memory_command,
-                'clear': lambda args: self._handle_clear_command(args),
-                'ai': self.handle_ai_command,
-            }
-        except Exception:
-            # Non-fatal; fallback to legacy routing
-            self.command_registry = {}
+        """Build the top-level command table that process_command dispatches through."""
+        self.command_registry = {
+            'project': self.handle_project_command,
+            'task': self.handle_task_command,
+            'message': self.handle_message_command,
+            'session': self.handle_session_command,
+            'chat': self.handle_chat_command,
+            'run': lambda args: self.handle_run_command(' '.join(args)),
+            'status': lambda args: self.handle_status_command(),
+            'config': self.handle_config_command,
+            'backup': self.handle_backup_command,
+            'performance': lambda args: self.handle_performance_command(),
+            'theme': self.handle_theme_command,
+            'remember': self.handle_remember_command,
+            'perform': self._route_perform,
+            'memory': self.handle_memory_command,
+            'clear': self._handle_clear_command,
+            'ai': self.handle_ai_command,
+            'help': lambda args: self.display_help(),
+            'back': self.handle_back_command,
+            'exit': self._handle_exit_command,
+            'quit': self._handle_exit_command,
+            'q': self._handle_exit_command,
+        }
 
     def _route_perform(self, args: List[str]) -> None:
         """Router for 'perform' supporting clear, index, and range operations."""
@@ -4931,18 +5459,7 @@ class RobustTerminalInterface:
                 if count > self.max_batch_perform and not self.assume_yes:
                     print(f"{Colors.YELLOW}Batch of {count} exceeds max_batch_perform={self.max_batch_perform}. Adjust config or enable assume_yes.{Colors.RESET}")
                     return
-                for n in range(a, b + 1):
-                    entry = history[n-1]
-                    orig = data.get('last')
-                    data['last'] = entry
-                    self._save_remembered(data)
-                    self.handle_perform_command()
-                    # mark executed
-                    entry['executed'] = True
-                    entry['executed_at'] = datetime.now().isoformat()
-                    entry['result'] = {'route': 'unknown', 'status': 'ok'}
-                    self._save_remembered(data)
-                    data['last'] = orig
+                self._perform_entries(data, history[a-1:b])
                 print(f"{Colors.GREEN}Performed range {a}-{b}{Colors.RESET}")
                 return
             if args[0].isdigit():
@@ -4950,17 +5467,7 @@ class RobustTerminalInterface:
                 data = self._load_remembered()
                 history = data.get('history', [])
                 if 1 <= n <= len(history):
-                    entry = history[n-1]
-                    orig = data.get('last')
-                    data['last'] = entry
-                    self._save_remembered(data)
-                    self.handle_perform_command()
-                    # mark executed
-                    entry['executed'] = True
-                    entry['executed_at'] = datetime.now().isoformat()
-                    entry['result'] = {'route': 'unknown', 'status': 'ok'}
-                    self._save_remembered(data)
-                    data['last'] = orig
+                    self._perform_entries(data, [history[n-1]])
                 else:
                     print(f"{Colors.YELLOW}Index out of range. Use 1..{len(history)}{Colors.RESET}")
                 return
@@ -5045,17 +5552,14 @@ class RobustTerminalInterface:
             
             # Get API key
             if selected_provider == 'openrouter':
+                # Start listing models now so the request overlaps with typing the key
+                import asyncio
+                models_future = _run_in_background(asyncio.run, self.ai_manager.fetch_openrouter_models())
                 api_key = input(f"{Colors.YELLOW}Enter your OpenRouter API key: {Colors.RESET}").strip()
                 print(f"\n{Colors.CYAN}Fetching available models from OpenRouter...{Colors.RESET}")
                 
-                # Fetch models in real-time
-                import asyncio
-                async def fetch_models():
-                    models = await self.ai_manager.fetch_openrouter_models()
-                    return models
-                
                 try:
-                    openrouter_models = asyncio.run(fetch_models())
+                    openrouter_models = models_future.result(timeout=30)
                     if openrouter_models and openrouter_models.get('all'):
                         all_models = openrouter_models.get('all', [])
                         free_models = openrouter_models.get('free', [])
@@ -5089,20 +5593,11 @@ class RobustTerminalInterface:
                             
                             print(f"\n{Colors.CYAN}{category_name} models (Page {page_num + 1}/{(len(models) - 1) // page_size + 1}):{Colors.RESET}")
                             for i, model in enumerate(page_models, start_idx + 1):
-                                model_id = model.get('id', 'unknown')
-                                description = model.get('description', model_id)
-                                pricing = model.get('pricing', {})
-                                try:
-                                    prompt_cost = float(pricing.get('prompt', 0)) if pricing.get('prompt') else 0
-                                    completion_cost = float(pricing.get('completion', 0)) if pricing.get('completion') else 0
-                                    if prompt_cost > 0 or completion_cost > 0:
-                                        price_info = f" (${pricing.get('prompt', '0')}/prompt, ${pricing.get('completion', '0')}/completion)"
-                                    else:
-                                        price_info = " (Free)"
-                                except (ValueError, TypeError):
-                                    # If we can't parse the pricing, consider it free
-                                    price_info = " (Free)"
-                                print(f"  {i}. {model_id}{price_info} - {description[:100]}{'...' if len(description) > 100 else ''}")
+                                line = model.get('_line')
+                                if line is None:
+                                    # Shared by the free/paid/all views and by paging back
+                                    line = model['_line'] = _format_model_line(model)
+                                print(f"  {i}. {line}")
                             
                             if len(models) > end_idx:
                                 print(f"\n{Colors.DIM}Enter model number or 'n' for next page, 'p' for previous page, or 'q' to quit browsing{Colors.RESET}")
@@ -5170,6 +5665,15 @@ class RobustTerminalInterface:
                 print(f"{Colors.RED}API key is required{Colors.RESET}")
                 return
             
+            # Validate the key in the background while the remaining settings are entered
+            import asyncio
+            AIProvider = _ai_service().AIProvider
+            provider_enum = AIProvider.OPENROUTER if selected_provider == 'openrouter' else AIProvider.GEMINI
+            validation = _run_in_background(
+                asyncio.run,
+                self.ai_manager.validate_api_key(api_key, selected_model, provider_enum, shared_session=False)
+            )
+            
             # Get additional settings
             max_tokens = input(f"{Colors.YELLOW}Max tokens [default: 4000]: {Colors.RESET}").strip()
             try:
@@ -5186,16 +5690,8 @@ class RobustTerminalInterface:
             # Validate API key before configuration
             print(f"\n{Colors.CYAN}Validating API key...{Colors.RESET}")
             
-            import asyncio
-            async def validate_key():
-                # Determine provider for validation
-                from ai_service import AIProvider
-                provider = AIProvider.OPENROUTER if selected_provider == 'openrouter' else AIProvider.GEMINI
-                is_valid, message = await self.ai_manager.validate_api_key(api_key, selected_model, provider)
-                return is_valid, message
-            
             try:
-                is_valid, validation_message = asyncio.run(validate_key())
+                is_valid, validation_message = validation.result()
                 if not is_valid:
                     print(f"{Colors.RED}❌ {validation_message}{Colors.RESET}")
                     print(f"{Colors.YELLOW}Please check your API key and try again.{Colors.RESET}")
@@ -5210,8 +5706,6 @@ class RobustTerminalInterface:
                     return
             
             # Configure the AI service with provider
-            from ai_service import AIProvider
-            provider_enum = AIProvider.OPENROUTER if selected_provider == 'openrouter' else AIProvider.GEMINI
             if self.ai_manager.configure(api_key, selected_model, max_tokens, temperature, provider_enum):
                 print(f"\n{Colors.GREEN}✅ AI service configured successfully!{Colors.RESET}")
                 self._show_api_key_status()
@@ -5246,7 +5740,6 @@ class RobustTerminalInterface:
             
             print(f"{Colors.CYAN}🚀 Testing AI connection...{Colors.RESET}")
             
-            import asyncio
             async def test_ai():
                 try:
                     response = await self.ai_manager.chat("Hello! Please respond with a brief greeting.", use_context=False)
@@ -5259,7 +5752,7 @@ class RobustTerminalInterface:
                 except Exception as e:
                     print(f"{Colors.RED}❌ AI test error: {e}{Colors.RESET}")
             
-            asyncio.run(test_ai())
+            self._run_async(test_ai())
         
         elif action == 'add-key':
             self._handle_add_api_key()
@@ -5319,7 +5812,6 @@ class RobustTerminalInterface:
         # Validate the API key
         print(f"\n{Colors.CYAN}Validating API key...{Colors.RESET}")
         
-        import asyncio
         async def validate_new_key():
             # Determine model to test
             if self.ai_manager.is_configured():
@@ -5327,14 +5819,14 @@ class RobustTerminalInterface:
                 provider = self.ai_manager.config.provider
             else:
                 model_to_test = "gemini-1.5-flash-latest" if selected_provider != 'openrouter' else "openrouter/auto"
-                from ai_service import AIProvider
+                AIProvider = _ai_service().AIProvider
                 provider = AIProvider.OPENROUTER if selected_provider == 'openrouter' else AIProvider.GEMINI
             
             is_valid, message = await self.ai_manager.validate_api_key(api_key, model_to_test, provider)
             return is_valid, message
         
         try:
-            is_valid, validation_message = asyncio.run(validate_new_key())
+            is_valid, validation_message = self._run_async(validate_new_key())
             if not is_valid:
                 print(f"{Colors.RED}❌ {validation_message}{Colors.RESET}")
                 confirm = input(f"{Colors.YELLOW}Save invalid key anyway? (y/N): {Colors.RESET}").strip().lower()
@@ -5362,7 +5854,7 @@ class RobustTerminalInterface:
             )
         else:
             # Create new config with latest defaults
-            from ai_service import AIProvider
+            AIProvider = _ai_service().AIProvider
             provider_enum = AIProvider.OPENROUTER if selected_provider == 'openrouter' else AIProvider.GEMINI
             default_model = "openrouter/auto" if selected_provider == 'openrouter' else "gemini-1.5-flash-latest"
             success = self.ai_manager.configure(
@@ -5403,13 +5895,12 @@ class RobustTerminalInterface:
         # Validate the new API key
         print(f"\n{Colors.CYAN}Validating new API key...{Colors.RESET}")
         
-        import asyncio
         async def validate_edit_key():
             is_valid, message = await self.ai_manager.validate_api_key(new_key, self.ai_manager.config.model.value, self.ai_manager.config.provider)
             return is_valid, message
         
         try:
-            is_valid, validation_message = asyncio.run(validate_edit_key())
+            is_valid, validation_message = self._run_async(validate_edit_key())
             if not is_valid:
                 print(f"{Colors.RED}❌ {validation_message}{Colors.RESET}")
                 confirm = input(f"{Colors.YELLOW}Save invalid key anyway? (y/N): {Colors.RESET}").strip().lower()
@@ -5493,33 +5984,11 @@ class RobustTerminalInterface:
     
     def _display_ai_response(self, response_content: str, model: str = "", response_time: float = 0.0, tokens: int = 0) -> None:
         """Display AI response with a cool design."""
-        # Create a fancy border
-        border = "═" * 77
-        print(f"\n{Colors.CYAN}╔{border}╗{Colors.RESET}")
-        print(f"{Colors.CYAN}║{Colors.RESET} {Colors.BOLD}{Colors.GREEN}🤖 AI RESPONSE{Colors.RESET} {Colors.DIM}{' ' * 61}║{Colors.RESET}")
-        print(f"{Colors.CYAN}╠{border}╣{Colors.RESET}")
-        
-        # Display the response content with word wrapping
-        lines = response_content.split('\n')
-        for line in lines:
-            if len(line) > 75:
-                # Wrap long lines
-                words = line.split()
-                current_line = ""
-                for word in words:
-                    if len(current_line + word) <= 75:
-                        current_line += word + " "
-                    else:
-                        print(f"{Colors.CYAN}║{Colors.RESET} {current_line:<75} {Colors.CYAN}║{Colors.RESET}")
-                        current_line = word + " "
-                if current_line:
-                    print(f"{Colors.CYAN}║{Colors.RESET} {current_line:<75} {Colors.CYAN}║{Colors.RESET}")
-            else:
-                print(f"{Colors.CYAN}║{Colors.RESET} {line:<75} {Colors.CYAN}║{Colors.RESET}")
+        out = ["\n" + _BOX.TOP, _BOX.TITLE.format("🤖 AI RESPONSE", ' ' * 61), _BOX.MID]
+        _box_rows(out, response_content)
         
         # Display metadata if available
         if model or response_time > 0 or tokens > 0:
-            print(f"{Colors.CYAN}╠{border}╣{Colors.RESET}")
             metadata_parts = []
             if model:
                 metadata_parts.append(f"Model: {model}")
@@ -5527,49 +5996,23 @@ class RobustTerminalInterface:
                 metadata_parts.append(f"Time: {response_time:.2f}s")
             if tokens > 0:
                 metadata_parts.append(f"Tokens: {tokens}")
-            
-            metadata_str = " | ".join(metadata_parts)
-            print(f"{Colors.CYAN}║{Colors.RESET} {Colors.DIM}{metadata_str:<75} {Colors.CYAN}║{Colors.RESET}")
+            out += (_BOX.MID, _BOX.META.format(" | ".join(metadata_parts)))
         
-        print(f"{Colors.CYAN}╚{border}╝{Colors.RESET}")
+        out.append(_BOX.BOT)
+        print('\n'.join(out))
     
     def _display_cool_response(self, title: str, response_content: str, metadata: Dict[str, Any] = None) -> None:
         """Display any response with a cool design."""
-        # Create a fancy border
-        border = "═" * 77
-        print(f"\n{Colors.CYAN}╔{border}╗{Colors.RESET}")
-        print(f"{Colors.CYAN}║{Colors.RESET} {Colors.BOLD}{Colors.GREEN}{title}{Colors.RESET} {Colors.DIM}{' ' * (77 - len(title) - 3)}║{Colors.RESET}")
-        print(f"{Colors.CYAN}╠{border}╣{Colors.RESET}")
-        
-        # Display the response content with word wrapping
-        lines = response_content.split('\n')
-        for line in lines:
-            if len(line) > 75:
-                # Wrap long lines
-                words = line.split()
-                current_line = ""
-                for word in words:
-                    if len(current_line + word) <= 75:
-                        current_line += word + " "
-                    else:
-                        print(f"{Colors.CYAN}║{Colors.RESET} {current_line:<75} {Colors.CYAN}║{Colors.RESET}")
-                        current_line = word + " "
-                if current_line:
-                    print(f"{Colors.CYAN}║{Colors.RESET} {current_line:<75} {Colors.CYAN}║{Colors.RESET}")
-            else:
-                print(f"{Colors.CYAN}║{Colors.RESET} {line:<75} {Colors.CYAN}║{Colors.RESET}")
+        out = ["\n" + _BOX.TOP, _BOX.TITLE.format(title, ' ' * (77 - len(title) - 3)), _BOX.MID]
+        _box_rows(out, response_content)
         
         # Display metadata if available
         if metadata:
-            print(f"{Colors.CYAN}╠{border}╣{Colors.RESET}")
-            metadata_parts = []
-            for key, value in metadata.items():
-                metadata_parts.append(f"{key}: {value}")
-            
-            metadata_str = " | ".join(metadata_parts)
-            print(f"{Colors.CYAN}║{Colors.RESET} {Colors.DIM}{metadata_str:<75} {Colors.CYAN}║{Colors.RESET}")
+            metadata_str = " | ".join(f"{key}: {value}" for key, value in metadata.items())
+            out += (_BOX.MID, _BOX.META.format(metadata_str))
         
-        print(f"{Colors.CYAN}╚{border}╝{Colors.RESET}")
+        out.append(_BOX.BOT)
+        print('\n'.join(out))
     
     def _handle_ai_chat(self, args: List[str]) -> None:
         """Handle AI chat commands with codebase understanding capability."""
@@ -5588,7 +6031,6 @@ class RobustTerminalInterface:
         message = ' '.join(args)
         print(f"\n{Colors.CYAN}🚀 Sending message to AI...{Colors.RESET}")
         
-        import asyncio
         async def chat_with_ai():
             try:
                 response = await self.ai_manager.chat(message, use_context=True)
@@ -5617,7 +6059,7 @@ class RobustTerminalInterface:
                 print(f"\n{Colors.RED}❌ Chat error: {e}{Colors.RESET}")
                 self.log_message(f"AI Chat Exception: {e}", "ai_error")
         
-        asyncio.run(chat_with_ai())
+        self._run_async(chat_with_ai())
     
     def _handle_ai_status(self) -> None:
         """Show AI service status."""
@@ -5916,8 +6358,7 @@ class RobustTerminalInterface:
                 print(f"Features: {', '.join(features)}")
             
             # Execute build
-            import asyncio
-            result = asyncio.run(self.building_agent.build_project(config))
+            result = self._run_async(self.building_agent.build_project(config))
             
             if result['success']:
                 print(f"\n{Colors.GREEN}✅ {result['message']}{Colors.RESET}")
@@ -5958,14 +6399,12 @@ class RobustTerminalInterface:
         print(f"\n{Colors.CYAN}🧠 Processing description:{Colors.RESET} '{description}'")
         
         try:
-            # Use asyncio to run the async method
-            import asyncio
-            
+            # Run the async method on the shared event loop
             async def generate_from_desc():
                 result = await self.advanced_building_agent.generate_from_description(description)
                 return result
             
-            result = asyncio.run(generate_from_desc())
+            result = self._run_async(generate_from_desc())
             
             if result.success:
                 self._display_cool_response("✅ PROJECT GENERATION", result.message)
@@ -6041,7 +6480,6 @@ class RobustTerminalInterface:
             print(f"\n{Colors.CYAN}🔍 Fetching latest models from OpenRouter...{Colors.RESET}")
             
             try:
-                import asyncio
                 
                 async def fetch_and_select_model():
                     print(f"{Colors.DIM}This may take a moment...{Colors.RESET}")
@@ -6075,7 +6513,7 @@ class RobustTerminalInterface:
                         
                     return selected_model
                 
-                selected_model = asyncio.run(fetch_and_select_model())
+                selected_model = self._run_async(fetch_and_select_model())
                 
             except Exception as e:
                 print(f"{Colors.YELLOW}Could not fetch real-time models: {e}. Using default.{Colors.RESET}")
@@ -6088,12 +6526,11 @@ class RobustTerminalInterface:
         print(f"  Model: {selected_model}")
         
         try:
-            import asyncio
             
             async def setup_provider():
                 return await self.advanced_building_agent.setup_ai_provider(provider, api_key, model_id=selected_model, interactive=True)
             
-            success = asyncio.run(setup_provider())
+            success = self._run_async(setup_provider())
             
             if success:
                 self._display_cool_response("🎉 PROVIDER CONFIGURED", f"Successfully configured {provider_name} provider!", {"Next Step": "You can now use 'build describe' for AI-powered project generation"})
@@ -6263,12 +6700,11 @@ class RobustTerminalInterface:
         print(f"\n{Colors.CYAN}🔄 Checking for updates...{Colors.RESET}")
         
         try:
-            import asyncio
             
             async def check_updates():
                 return await self.advanced_building_agent.check_for_updates()
             
-            results = asyncio.run(check_updates())
+            results = self._run_async(check_updates())
             
             print(f"\n{Colors.CYAN}Update Results:{Colors.RESET}")
             
@@ -6303,7 +6739,6 @@ class RobustTerminalInterface:
         print(f"\n{Colors.CYAN}🔍 Browsing Available AI Models...{Colors.RESET}")
         
         try:
-            import asyncio
             
             async def browse_models():
                 # Update models cache first
@@ -6362,7 +6797,7 @@ class RobustTerminalInterface:
                 else:
                     print(f"{Colors.YELLOW}No model selected{Colors.RESET}")
             
-            asyncio.run(browse_models())
+            self._run_async(browse_models())
             
         except Exception as e:
             self._display_cool_response("❌ MODEL BROWSING FAILED", f"Failed to browse models: {e}")
@@ -6383,7 +6818,7 @@ class RobustTerminalInterface:
         
         # 1. Clear screen first
         try:
-            os.system('cls' if os.name == 'nt' else 'clear')
+            _clear_screen()
             cleared_items.append("🖥️ Screen")
         except Exception as e:
             failed_items.append(f"Screen: {e}")
@@ -6391,6 +6826,7 @@ class RobustTerminalInterface:
         # 2. Clear all projects
         try:
             self.projects.clear()
+            self._name_index.clear()
             self.current_project = None
             cleared_items.append("🚀 Projects")
         except Exception as e:
@@ -6434,8 +6870,7 @@ class RobustTerminalInterface:
         try:
             memory_dir = self.memory_dir
             if memory_dir.exists():
-                for file in memory_dir.glob("*.jsonl"):
-                    file.unlink()
+                _unlink_files(memory_dir, suffix=".jsonl")
                 # Clear context memory
                 context_file = self.data_dir / "context_memory.json"
                 if context_file.exists():
@@ -6448,10 +6883,7 @@ class RobustTerminalInterface:
         try:
             self.sessions.clear()
             self.current_session_id = None
-            sessions_dir = self.data_dir / "sessions"
-            if sessions_dir.exists():
-                for file in sessions_dir.glob("*.json"):
-                    file.unlink()
+            self._wipe_sessions_dir()
             cleared_items.append("📏 Sessions")
         except Exception as e:
             failed_items.append(f"Sessions: {e}")
@@ -6459,10 +6891,8 @@ class RobustTerminalInterface:
         # 9. Clear exported files
         try:
             exports_dir = self.exports_dir
-            if exports_dir.exists():
-                for file in exports_dir.glob("*"):
-                    if file.is_file():
-                        file.unlink()
+            self._close_editor_events()
+            _unlink_files(exports_dir)
             cleared_items.append("📎 Exported files")
         except Exception as e:
             failed_items.append(f"Exported files: {e}")
@@ -6554,7 +6984,7 @@ class RobustTerminalInterface:
         if args and args[0].lower() == 'all':
             self._handle_clear_all_command()
         else:
-            os.system('cls' if os.name == 'nt' else 'clear')
+            _clear_screen()
             self.display_header()
     
     def _handle_build_clear_history(self) -> None:
@@ -6631,11 +7061,21 @@ class RobustTerminalInterface:
         
         print(f"{Colors.GREEN}✨ All building agent data cleared successfully!{Colors.RESET}")
 
-def main():
-    """Main entry point for the robust terminal interface."""
+def main(argv: Optional[List[str]] = None):
+    """Main entry point for the robust terminal interface.
+    
+    `--daemon` serves commands over a local socket instead of the REPL;
+    `--send <command...>` forwards one command to that daemon.
+    """
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] == '--send':
+        return fzx_client.send_command(fzx_client.join_argv(argv[1:]))
     try:
         interface = RobustTerminalInterface()
-        interface.run()
+        if argv and argv[0] == '--daemon':
+            interface.serve_daemon()
+        else:
+            interface.run()
         return 0
     except Exception as e:
         print(f"{Colors.RED}Failed to start terminal interface: {e}{Colors.RESET}")